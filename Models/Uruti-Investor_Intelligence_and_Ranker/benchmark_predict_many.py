@@ -0,0 +1,94 @@
+"""Benchmark UrutiPredictor.predict_many against per-profile prediction.
+
+Usage (from this folder):
+
+    python benchmark_predict_many.py
+    python benchmark_predict_many.py --csv "../../Notebooks/Data/startup data.csv" --repeat 5
+
+Builds one platform-style profile per row of the startup dataset, scores
+them with `predict_profile` in a loop and with the batched `predict_many`,
+and reports timings, speedup and the largest probability difference.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from uruti_inference import UrutiPredictor
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_CSV = HERE.parent.parent / "Notebooks" / "Data" / "startup data.csv"
+STAGES = ["pre-seed", "seed", "series a", "series b", ""]
+
+
+def load_profiles(csv_path):
+    df = pd.read_csv(csv_path)
+    rng = np.random.default_rng(0)
+    founded = pd.to_datetime(df["founded_at"], errors="coerce").dt.year
+    profiles = []
+    for idx, row in enumerate(df.itertuples(index=False)):
+        profile = {
+            "sector": row.category_code,
+            "stage": STAGES[idx % len(STAGES)],
+            "team_size": int(row.relationships),
+            "user_base": int(rng.integers(0, 20000)),
+            "monthly_growth_pct": float(rng.uniform(0, 30)),
+            "partnerships": int(row.milestones),
+            "funding": float(row.funding_total_usd),
+            "funding_rounds": int(row.funding_rounds),
+            "state_code": row.state_code,
+            "category_code": row.category_code,
+            "source": "startup_data_csv",
+        }
+        if not pd.isna(founded.iloc[idx]):
+            profile["founded_year"] = int(founded.iloc[idx])
+        if idx % 3 == 0:
+            profile["mlp_score"] = float(rng.uniform(20, 95))
+        if idx % 4 == 0:
+            profile["age"] = float(row.age_last_funding_year)
+        profiles.append(profile)
+    return profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark UrutiPredictor.predict_many")
+    parser.add_argument("--csv", default=str(DEFAULT_CSV))
+    parser.add_argument("--bundle", default=str(HERE / "uruti_bundle.joblib"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    predictor = UrutiPredictor(args.bundle)
+    profiles = load_profiles(args.csv)
+    print(f"{len(profiles)} profiles from {args.csv}")
+
+    loop_times, batch_times = [], []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        expected = [predictor.predict_profile(p) for p in profiles]
+        loop_times.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        actual = predictor.predict_many(profiles)
+        batch_times.append(time.perf_counter() - started)
+
+    max_diff = max(
+        abs(a["probabilities"][name] - e["probabilities"][name])
+        for a, e in zip(actual, expected)
+        for name in e["probabilities"]
+    )
+    mismatched = sum(
+        a["prediction"] != e["prediction"] or a["uruti_band"] != e["uruti_band"] or a["uruti_score_100"] != e["uruti_score_100"]
+        for a, e in zip(actual, expected)
+    )
+    loop, batch = min(loop_times), min(batch_times)
+    print(f"predict_profile loop: {loop:.3f}s ({len(profiles) / loop:.0f} profiles/s)")
+    print(f"predict_many batch:   {batch:.3f}s ({len(profiles) / batch:.0f} profiles/s)")
+    print(f"speedup: {loop / batch:.1f}x")
+    print(f"max probability difference: {max_diff:.2e}; rows with different prediction/band/score: {mismatched}")
+
+
+if __name__ == "__main__":
+    main()
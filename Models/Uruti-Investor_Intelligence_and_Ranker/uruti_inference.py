@@ -2,6 +2,31 @@ import joblib
 import numpy as np
 import pandas as pd
 
+_MISSING = object()
+_BOOSTED_SECTORS = ["fintech", "agtech", "agritech", "edtech", "healthtech", "ecommerce"]
+_SECTOR_ARPU = {"fintech": 50, "agtech": 30, "agritech": 30, "edtech": 40, "healthtech": 60, "ecommerce": 25}
+_BAND_KEYS = ["80_plus", "70_79", "60_69", "50_59", "below_50"]
+
+
+def _column(profiles, key):
+    """Raw values of `key` across profiles, _MISSING where the key is absent."""
+    return [p.get(key, _MISSING) for p in profiles]
+
+
+def _numbers(values, default, falsy_is_default=True):
+    """Float array from raw values; absent (or falsy, matching `x or d`) entries take `default`."""
+    default = np.broadcast_to(np.asarray(default, dtype=float), (len(values),))
+    use_default = np.array(
+        [v is _MISSING or (falsy_is_default and not v) for v in values], dtype=bool
+    )
+    given = np.array([0.0 if d else float(v) for v, d in zip(values, use_default)], dtype=float)
+    return np.where(use_default, default, given)
+
+
+def _contains(strings, needle):
+    return np.char.find(strings, needle) >= 0
+
+
 class UrutiPredictor:
     def __init__(self, bundle_path: str):
         self.bundle = joblib.load(bundle_path)
@@ -12,6 +37,19 @@ class UrutiPredictor:
         self.expected_cols = self.bundle["expected_feature_names"]
         self.cfg = self.bundle["uruti_config"]
 
+    def _predict_proba(self, df: pd.DataFrame) -> np.ndarray:
+        try:
+            return self.model.predict_proba(df)
+        except AttributeError as exc:
+            # Older xgboost estimators under newer sklearn fail Pipeline's tag
+            # checks; run the steps by hand instead.
+            if "__sklearn_tags__" not in str(exc) or not hasattr(self.model, "steps"):
+                raise
+            transformed = df
+            for _, step in self.model.steps[:-1]:
+                transformed = step.transform(transformed)
+            return self.model.steps[-1][1].predict_proba(transformed)
+
     def _score_band(self, score: float) -> str:
         for band in self.cfg["band_definitions"]:
             if score >= band["min"]:
@@ -42,7 +80,7 @@ class UrutiPredictor:
         target_market_size = float(profile.get("target_market_size", max(user_base * 3, 3000)) or max(user_base * 3, 3000))
         stage = str(profile.get("stage", "")).lower()
 
-        penetration = min(user_base / max(target_market_size, 1), 1.0)p
+        penetration = min(user_base / max(target_market_size, 1), 1.0)
         team_score = min(team_size / 8.0, 1.0) * 100
         traction_score = penetration * 100
         growth_score = min(growth / 20.0, 1.0) * 100
@@ -121,7 +159,7 @@ class UrutiPredictor:
         marketing_spend = total_spend * 0.30
 
         profit = float(profile.get("profit", revenue * 0.20))
-        founded_year = int(profile.get("founded_year", max(2015, 2026 - int(round(age)))))p
+        founded_year = int(profile.get("founded_year", max(2015, 2026 - int(round(age)))))
         funding_rounds = int(profile.get("funding_rounds", 1 if funding > 0 else 0))
         state_code = str(profile.get("state_code", "RW"))
         category_code = str(profile.get("category_code", sector if sector else "agritech"))
@@ -155,7 +193,7 @@ class UrutiPredictor:
     def predict_profile(self, profile: dict) -> dict:
         model_row = self._map_profile_to_model_features(profile)
         df = pd.DataFrame([model_row])
-        model_probs = self.model.predict_proba(df)[0]
+        model_probs = self._predict_proba(df)[0]
 
         uruti_score = self._compute_uruti_score(profile)
         prior_probs = self._score_to_prior_probs(uruti_score)
@@ -176,5 +214,152 @@ class UrutiPredictor:
             "uruti_band": self._score_band(uruti_score)
         }
 
+    def _compute_uruti_scores(self, profiles, sectors, stages):
+        """Vectorized `_compute_uruti_score` over a list of profiles."""
+        w = self.cfg["heuristic_weights"]
+        team_size = _numbers(_column(profiles, "team_size"), 0)
+        user_base = _numbers(_column(profiles, "user_base"), 0)
+        growth = _numbers(_column(profiles, "monthly_growth_pct"), 0)
+        partnerships = _numbers(_column(profiles, "partnerships"), 0)
+        target_market_size = _numbers(_column(profiles, "target_market_size"), np.maximum(user_base * 3, 3000))
+
+        penetration = np.minimum(user_base / np.maximum(target_market_size, 1), 1.0)
+        team_score = np.minimum(team_size / 8.0, 1.0) * 100
+        traction_score = penetration * 100
+        growth_score = np.minimum(growth / 20.0, 1.0) * 100
+        partner_score = np.minimum(partnerships / 5.0, 1.0) * 100
+
+        sector_keys = np.char.replace(np.char.replace(sectors, "-", ""), " ", "")
+        sector_boost = np.where(np.isin(sector_keys, _BOOSTED_SECTORS), 100, 70)
+        stage_score = np.select(
+            [_contains(stages, "series b"), _contains(stages, "series a"), _contains(stages, "seed"), stages != ""],
+            [95, 85, 75, 70],
+            default=72,
+        )
+
+        heuristic = (
+            w["team"] * team_score
+            + w["traction"] * traction_score
+            + w["growth"] * growth_score
+            + w["partnership"] * partner_score
+            + w["sector_boost"] * sector_boost
+            + w["stage"] * stage_score
+        )
+
+        mlp_raw = _column(profiles, "mlp_score")
+        has_mlp = np.array([v is not _MISSING and v is not None for v in mlp_raw], dtype=bool)
+        mlp = np.array([float(v) if keep else 0.0 for v, keep in zip(mlp_raw, has_mlp)], dtype=float)
+        final = np.where(has_mlp, 0.45 * heuristic + 0.55 * mlp, heuristic)
+        return np.clip(final, 0, 100), has_mlp
+
+    def _model_frame(self, profiles, sectors, stages):
+        """Vectorized `_map_profile_to_model_features`: one DataFrame for all profiles."""
+        n = len(profiles)
+        team_size = _numbers(_column(profiles, "team_size"), 5)
+        user_base = _numbers(_column(profiles, "user_base"), 0)
+        monthly_growth = _numbers(_column(profiles, "monthly_growth_pct"), 10)
+        partnerships = _numbers(_column(profiles, "partnerships"), 1)
+
+        stage_age = np.select(
+            [_contains(stages, "seed"), _contains(stages, "series a"), _contains(stages, "series b")],
+            [1.5, 3.0, 5.0],
+            default=2.0,
+        )
+        age_raw = [_MISSING if v is None else v for v in _column(profiles, "age")]
+        age = _numbers(age_raw, stage_age, falsy_is_default=False)
+
+        sector_keys = np.char.replace(np.char.replace(sectors, " ", ""), "-", "")
+        arpu = np.array([_SECTOR_ARPU.get(key, 30) for key in sector_keys.tolist()], dtype=float)
+        base_rev = np.where(user_base > 0, user_base * arpu, team_size * 10000 * age)
+        estimated_revenue = base_rev * (1 + (monthly_growth / 100.0)) * (1 + (np.minimum(partnerships, 10) * 0.03))
+        revenue_raw = [_MISSING if v is None else v for v in _column(profiles, "revenue")]
+        revenue = _numbers(revenue_raw, estimated_revenue, falsy_is_default=False)
+
+        funding = _numbers(_column(profiles, "funding"), revenue * 0.8)
+        total_spend = funding * 0.6
+        profit = _numbers(_column(profiles, "profit"), revenue * 0.20, falsy_is_default=False)
+        founded_default = np.maximum(2015, 2026 - np.round(age).astype(int))
+        founded_year = np.array(
+            [int(d) if v is _MISSING else int(v) for v, d in zip(_column(profiles, "founded_year"), founded_default)]
+        )
+        rounds_default = np.where(funding > 0, 1, 0)
+        funding_rounds = np.array(
+            [int(d) if v is _MISSING else int(v) for v, d in zip(_column(profiles, "funding_rounds"), rounds_default)]
+        )
+
+        canonical = {
+            "rd_spend": total_spend * 0.45,
+            "administration_spend": total_spend * 0.25,
+            "marketing_spend": total_spend * 0.30,
+            "funding_total_usd": funding,
+            "profit": profit,
+            "founded_year": founded_year,
+            "funding_rounds": funding_rounds,
+            "state_code": [str(p.get("state_code", "RW")) for p in profiles],
+            "category_code": [
+                str(p.get("category_code", sector if sector else "agritech")) for p, sector in zip(profiles, sectors.tolist())
+            ],
+            "source": [str(p.get("source", "platform_profile")) for p in profiles],
+        }
+
+        columns = {}
+        for col in self.expected_cols:
+            if col in canonical:
+                columns[col] = canonical[col]
+            else:
+                low = str(col).lower()
+                if any(k in low for k in ["spend", "revenue", "funding", "valuation", "profit", "age", "employees", "rounds", "year"]):
+                    columns[col] = np.zeros(n)
+                else:
+                    columns[col] = ["unknown"] * n
+        return pd.DataFrame(columns, columns=list(self.expected_cols))
+
     def predict_many(self, profiles):
-        return [self.predict_profile(p) for p in profiles]
+        """Batch `predict_profile`: one DataFrame and one predict_proba call
+        for all profiles; scores, bands and blending are computed with numpy."""
+        profiles = list(profiles)
+        if not profiles:
+            return []
+
+        sectors = np.array([str(p.get("sector", "unknown")).strip().lower() for p in profiles], dtype=str)
+        stages = np.array([str(p.get("stage", "")).lower() for p in profiles], dtype=str)
+
+        model_probs = np.asarray(self._predict_proba(self._model_frame(profiles, sectors, stages)), dtype=float)
+        uruti_scores, has_mlp = self._compute_uruti_scores(profiles, sectors, stages)
+
+        pp = self.cfg["prior_probs_by_band"]
+        priors = np.array([pp[key] for key in _BAND_KEYS], dtype=float)
+        priors = priors / priors.sum(axis=1, keepdims=True)
+        band_index = np.select(
+            [uruti_scores >= 80, uruti_scores >= 70, uruti_scores >= 60, uruti_scores >= 50], [0, 1, 2, 3], default=4
+        )
+        prior_probs = priors[band_index]
+
+        bands = self.cfg["band_definitions"]
+        band_labels = np.select(
+            [uruti_scores >= band["min"] for band in bands],
+            [band["label"] for band in bands],
+            default="Early Stage / Not Ready (<50)",
+        )
+
+        alpha = np.where(
+            has_mlp,
+            self.cfg["blend_alpha"]["with_platform_mlp_score"],
+            self.cfg["blend_alpha"]["without_platform_mlp_score"],
+        )[:, None]
+        blended = alpha * model_probs + (1 - alpha) * prior_probs
+        blended = blended / blended.sum(axis=1, keepdims=True)
+
+        pred_ids = np.argmax(blended, axis=1)
+        confidence = blended.max(axis=1)
+        class_count = len(self.class_names)
+        return [
+            {
+                "prediction": self.id_to_class[int(pred_ids[row])],
+                "confidence": float(confidence[row]),
+                "probabilities": {self.id_to_class[i]: float(blended[row, i]) for i in range(class_count)},
+                "uruti_score_100": float(uruti_scores[row]),
+                "uruti_band": str(band_labels[row]),
+            }
+            for row in range(len(profiles))
+        ]
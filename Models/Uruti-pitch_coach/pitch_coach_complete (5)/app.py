@@ -2,7 +2,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List
-from inference import load_models, compute_score, predict_action
+from inference import load_models, compute_score, compute_scores, predict_action, predict_actions
 
 app = FastAPI(title="Uruti Pitch Coach API")
 
@@ -28,9 +28,22 @@ ACTION_MAP = {
     5: "Smile / Stronger Hook (Engage your audience visually)"
 }
 
+# Upper bound on frames per batch request (~1h of video at 2 frames/s).
+MAX_BATCH_FRAMES = 10000
+
 class FeaturePayload(BaseModel):
     features: List[float]
 
+class FeatureBatchPayload(BaseModel):
+    features: List[List[float]]
+
+def _check_batch(payload: FeatureBatchPayload, width: int):
+    if len(payload.features) > MAX_BATCH_FRAMES:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_FRAMES} rows per request")
+    for idx, row in enumerate(payload.features):
+        if len(row) != width:
+            raise HTTPException(status_code=400, detail=f"Row {idx} must have exactly {width} features")
+
 @app.post("/score")
 def get_score(payload: FeaturePayload):
     if len(payload.features) != 9:
@@ -50,3 +63,21 @@ def get_coaching_action(payload: FeaturePayload):
         "action_code": action_code,
         "feedback": ACTION_MAP.get(action_code, "Keep going!")
     }
+
+@app.post("/score/batch")
+def get_scores(payload: FeatureBatchPayload):
+    # (N, 9) frames scored in one forward pass
+    _check_batch(payload, 9)
+    return {"scores": compute_scores(reward_model, payload.features)}
+
+@app.post("/coach/batch")
+def get_coaching_actions(payload: FeatureBatchPayload):
+    # (N, 12) state vectors, one action each
+    _check_batch(payload, 12)
+    actions = predict_actions(rl_agent, payload.features)
+    return {
+        "actions": [
+            {"action_code": code, "feedback": ACTION_MAP.get(code, "Keep going!")}
+            for code in actions
+        ]
+    }
@@ -1,12 +1,43 @@
 import torch
 import torch.nn as nn
 import numpy as np
+import collections
+import hashlib
 import os
+import sys
 import tempfile
+import time
 import zipfile
+import stable_baselines3
 from stable_baselines3 import DQN, PPO, A2C
 from sb3_contrib import TRPO
 
+# The numpy policy runtime lives next to this file; this module is also
+# loaded by path from the web backend, so make the sibling importable.
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
+from policy_runtime import (  # noqa: E402
+    REWARD_EXPORT_FILENAME,
+    PolicyRuntime,
+    RewardRuntime,
+    artifact_digest,
+    export_path,
+    load_exported,
+    load_exported_reward,
+)
+
+# Packed SB3 archives are cached here, keyed by the artifact's content hash.
+SB3_CACHE_DIR_ENV = "URUTI_PITCH_SB3_CACHE_DIR"
+# Intra-op threads for torch inference; fixed so batch latency is predictable
+# and several workers on one host do not oversubscribe the CPU.
+TORCH_THREADS_ENV = "URUTI_PITCH_TORCH_THREADS"
+# Largest accepted difference between the exported and torch reward scores.
+_REWARD_EXPORT_TOLERANCE = 1e-4
+
+# Timings and cache outcome of the last load_models() call.
+LAST_LOAD_INFO = {}
+
 class RewardMLP(nn.Module):
     def __init__(self, input_dim):
         super(RewardMLP, self).__init__()
@@ -18,13 +49,51 @@ class RewardMLP(nn.Module):
     def forward(self, x): return self.net(x)
 
 
-def _resolve_sb3_model_path(model_path):
+def _sb3_cache_path(source_digest):
+    """Cached archive for an unpacked SB3 model directory.
+
+    The key covers the directory contents and the installed SB3/torch
+    versions, since the cached archive is re-saved by this installation.
+    """
+    cache_dir = os.getenv(SB3_CACHE_DIR_ENV) or os.path.join(tempfile.gettempdir(), "uruti_pitch_sb3_cache")
+    key = hashlib.sha256(
+        f"{source_digest}|sb3={stable_baselines3.__version__}|torch={torch.__version__}".encode("utf-8")
+    ).hexdigest()[:24]
+    return os.path.join(cache_dir, f"best_model-{key}.zip")
+
+
+def _write_sb3_cache(rl_agent, cache_path):
+    """Save an inference-only copy of a loaded agent to cache_path.
+
+    Optimizer moments are dropped (SB3 still requires an optimizer entry, so
+    an empty state written by the installed torch is kept); later loads then
+    succeed on the first, standard attempt.
+    """
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp.zip"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        optimizer = getattr(rl_agent.policy, "optimizer", None)
+        if optimizer is not None:
+            optimizer.state = collections.defaultdict(dict)
+        rl_agent.save(tmp_path)
+        os.replace(tmp_path, cache_path)
+        return True
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+
+def _resolve_sb3_model_path(model_path, cache_path=None):
     if os.path.isfile(model_path):
         return model_path, None
 
     if not os.path.isdir(model_path):
         raise FileNotFoundError(f"SB3 model artifact not found: {model_path}")
 
+    if cache_path and os.path.isfile(cache_path):
+        return cache_path, None
+
     temp_dir = tempfile.TemporaryDirectory(prefix="uruti_pitch_sb3_")
     zip_path = os.path.join(temp_dir.name, "best_model.zip")
     with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
@@ -36,7 +105,7 @@ def _resolve_sb3_model_path(model_path):
     return zip_path, temp_dir
 
 
-def _load_sb3_for_inference(algo_class, zip_path, device="cpu"):
+def _load_sb3_for_inference(algo_class, zip_path, device="cpu", info=None):
     """Load an SB3 model for inference, tolerating optimizer state mismatches.
 
     Tries a standard load first.  If the optimizer state dict is incompatible
@@ -44,11 +113,15 @@ def _load_sb3_for_inference(algo_class, zip_path, device="cpu"):
     different torch release), patches torch.optim.Optimizer.load_state_dict to
     silently skip the failure — the optimizer is never needed for inference.
     """
+    info = {} if info is None else info
+    info["optimizer_fallback"] = False
+
     # Attempt 1: standard load (works when torch versions align).
     try:
         return algo_class.load(zip_path, device=device)
     except Exception:
         pass
+    info["optimizer_fallback"] = True
 
     # Attempt 2: make torch Optimizer.load_state_dict fault-tolerant.
     # This works with any SB3 version and is safe for inference since the
@@ -69,35 +142,203 @@ def _load_sb3_for_inference(algo_class, zip_path, device="cpu"):
         _optim.Optimizer.load_state_dict = _orig_lsd
 
 
+_POLICY_ACTIVATIONS = {nn.ReLU: "relu", nn.Tanh: "tanh", nn.Sigmoid: "sigmoid", nn.Identity: "identity"}
+
+
+def _policy_layers(rl_agent):
+    """The policy's action-selecting MLP as PolicyRuntime layers."""
+    policy = rl_agent.policy
+    if type(rl_agent.action_space).__name__ != "Discrete":
+        raise ValueError("only discrete action spaces can be exported")
+    if len(rl_agent.observation_space.shape) != 1:
+        raise ValueError("only flat Box observations can be exported")
+
+    if hasattr(policy, "q_net"):  # DQN: argmax over Q-values
+        extractor = policy.q_net.features_extractor
+        modules = list(policy.q_net.q_net)
+    elif hasattr(policy, "mlp_extractor") and hasattr(policy, "action_net"):  # PPO/A2C/TRPO
+        extractor = policy.pi_features_extractor
+        modules = list(policy.mlp_extractor.policy_net) + [policy.action_net]
+    else:
+        raise ValueError(f"unsupported policy class: {type(policy).__name__}")
+    if type(extractor).__name__ != "FlattenExtractor":
+        raise ValueError(f"unsupported features extractor: {type(extractor).__name__}")
+
+    return _mlp_layers(modules)
+
+
+def _mlp_layers(modules):
+    layers = []
+    for module in modules:
+        if isinstance(module, nn.Linear):
+            layers.append((
+                "linear",
+                module.weight.detach().cpu().numpy().astype(np.float32),
+                module.bias.detach().cpu().numpy().astype(np.float32),
+            ))
+        elif type(module) in _POLICY_ACTIVATIONS:
+            layers.append((_POLICY_ACTIVATIONS[type(module)], None, None))
+        elif isinstance(module, nn.ELU) and module.alpha == 1.0:
+            layers.append(("elu", None, None))
+        else:
+            raise ValueError(f"unsupported layer: {type(module).__name__}")
+    return layers
+
+
+def export_policy(rl_agent, model_path, source_digest=None, samples=4096):
+    """Export the agent's policy for the numpy PolicyRuntime.
+
+    The export is only saved if its actions match SB3's
+    predict(deterministic=True) on every sampled observation. Returns a
+    report dict (path, accepted, mismatches, ...).
+    """
+    started = time.perf_counter()
+    path = export_path(model_path)
+    report = {"path": path, "accepted": False}
+    try:
+        obs_shape = rl_agent.observation_space.shape
+        runtime = PolicyRuntime(_policy_layers(rl_agent), obs_shape, rl_agent.action_space.n)
+
+        rng = np.random.default_rng(0)
+        half = samples // 2
+        observations = np.concatenate([
+            rng.uniform(0.0, 1.0, size=(half,) + obs_shape),  # the coach's feature range
+            rng.normal(0.0, 2.0, size=(samples - half,) + obs_shape),
+            np.zeros((1,) + obs_shape),
+        ]).astype(np.float32)
+        expected, _ = rl_agent.predict(observations, deterministic=True)
+        actual, _ = runtime.predict(observations)
+        mismatches = int(np.count_nonzero(np.asarray(expected).reshape(-1) != actual))
+        report.update({"samples": int(observations.shape[0]), "mismatches": mismatches})
+        if mismatches:
+            report["error"] = "exported policy disagrees with SB3 predict"
+            return report
+
+        runtime.save(path, {
+            "source_digest": source_digest or artifact_digest(model_path),
+            "algorithm": type(rl_agent).__name__,
+            "parity": {"samples": report["samples"], "mismatches": 0},
+        })
+        report["accepted"] = True
+    except Exception as exc:
+        report["error"] = str(exc)
+    finally:
+        report["seconds"] = round(time.perf_counter() - started, 4)
+    return report
+
+
+def export_reward_model(reward_model, reward_path, samples=4096):
+    """Export the reward MLP for the numpy RewardRuntime if its scores stay
+    within _REWARD_EXPORT_TOLERANCE of torch on sampled frames."""
+    started = time.perf_counter()
+    path = export_path(reward_path, REWARD_EXPORT_FILENAME)
+    report = {"path": path, "accepted": False}
+    try:
+        input_dim = reward_model.net[0].in_features
+        runtime = RewardRuntime(_mlp_layers(list(reward_model.net)), (input_dim,), 1)
+        rng = np.random.default_rng(0)
+        features = rng.uniform(0.0, 1.0, size=(samples, input_dim)).astype(np.float32)
+        with torch.inference_mode():
+            expected = reward_model(torch.from_numpy(features)).numpy()[:, 0]
+        max_abs_diff = float(np.max(np.abs(expected - runtime.scores(features))))
+        report.update({"samples": samples, "max_abs_diff": max_abs_diff})
+        if max_abs_diff > _REWARD_EXPORT_TOLERANCE:
+            report["error"] = "exported reward model disagrees with torch"
+            return report
+        runtime.save(path, {
+            "source_digest": artifact_digest(reward_path),
+            "parity": {"samples": samples, "max_abs_diff": max_abs_diff},
+        })
+        report["accepted"] = True
+    except Exception as exc:
+        report["error"] = str(exc)
+    finally:
+        report["seconds"] = round(time.perf_counter() - started, 4)
+    return report
+
+
+def _configure_torch_threads():
+    threads = int(os.getenv(TORCH_THREADS_ENV, "1") or 1)
+    if threads > 0 and torch.get_num_threads() != threads:
+        torch.set_num_threads(threads)
+    return torch.get_num_threads()
+
+
 def load_models():
     base_path = os.path.dirname(os.path.abspath(__file__))
+    started = time.perf_counter()
+    info = {"torch_threads": _configure_torch_threads()}
 
     # 1. Load Reward Model
     reward_model = RewardMLP(input_dim=9)
     reward_path = os.path.join(base_path, "models", "reward_model.pt")
     reward_model.load_state_dict(torch.load(reward_path, map_location="cpu", weights_only=True))
     reward_model.eval()
+    info["reward_model_seconds"] = round(time.perf_counter() - started, 4)
+    if load_exported_reward(reward_path) is None:
+        info["reward_export"] = export_reward_model(reward_model, reward_path)
 
     # 2. Identify and Load Best RL Agent
     with open(os.path.join(base_path, "models", "best_model_name.txt"), "r") as f:
         algo_name = f.read().strip()
 
     model_path = os.path.join(base_path, "models", "best_model")
-    load_path, temp_dir = _resolve_sb3_model_path(model_path)
+    step = time.perf_counter()
+    source_digest = artifact_digest(model_path) if os.path.isdir(model_path) else None
+    cache_path = _sb3_cache_path(source_digest) if source_digest else None
+    load_path, temp_dir = _resolve_sb3_model_path(model_path, cache_path)
+    cache_hit = cache_path is not None and load_path == cache_path
+    info["sb3_cache"] = "hit" if cache_hit else ("miss" if cache_path else "not_applicable")
+    info["sb3_cache_path"] = cache_path
+    info["resolve_seconds"] = round(time.perf_counter() - step, 4)
 
+    step = time.perf_counter()
     algorithms = {"DQN": DQN, "PPO": PPO, "A2C": A2C, "TRPO": TRPO}
-    rl_agent = _load_sb3_for_inference(algorithms[algo_name], load_path, device="cpu")
+    rl_agent = _load_sb3_for_inference(algorithms[algo_name], load_path, device="cpu", info=info)
+    info["sb3_load_seconds"] = round(time.perf_counter() - step, 4)
+
+    if cache_path and not cache_hit:
+        step = time.perf_counter()
+        info["sb3_cache_written"] = _write_sb3_cache(rl_agent, cache_path)
+        info["sb3_cache_write_seconds"] = round(time.perf_counter() - step, 4)
     if temp_dir is not None:
         rl_agent._uruti_temp_dir = temp_dir
 
+    # Export the policy for the numpy runtime the first time this artifact
+    # loads; later startups can skip torch/SB3 for action prediction.
+    if source_digest and load_exported(model_path) is None:
+        info["policy_export"] = export_policy(rl_agent, model_path, source_digest)
+
+    info["algorithm"] = algo_name
+    info["total_seconds"] = round(time.perf_counter() - started, 4)
+    LAST_LOAD_INFO.clear()
+    LAST_LOAD_INFO.update(info)
     return reward_model, rl_agent
 
+def compute_scores(reward_model, features):
+    """Reward scores for an (N, 9) batch of frames in one forward pass."""
+    if len(features) == 0:
+        return []
+    batch = np.asarray(features, dtype=np.float32)
+    if batch.ndim != 2:
+        raise ValueError("features must be a 2-D (N, n_features) array")
+    with torch.inference_mode():
+        scores = reward_model(torch.from_numpy(batch)).numpy()[:, 0]
+    return [round(float(score), 2) for score in scores]
+
+def predict_actions(rl_agent, states):
+    """Deterministic actions for an (N, 12) batch of state vectors."""
+    if len(states) == 0:
+        return []
+    batch = np.asarray(states, dtype=np.float32)
+    if batch.ndim != 2:
+        raise ValueError("states must be a 2-D (N, state_dim) array")
+    with torch.inference_mode():
+        actions, _ = rl_agent.predict(batch, deterministic=True)
+    return [int(action) for action in np.asarray(actions).reshape(-1)]
+
 def compute_score(reward_model, features):
-    with torch.no_grad():
-        tensor_feat = torch.FloatTensor(features).unsqueeze(0)
-        score = reward_model(tensor_feat).item()
-    return round(score, 2)
+    return compute_scores(reward_model, [features])[0]
 
 def predict_action(rl_agent, state_vector):
-    action, _ = rl_agent.predict(np.array(state_vector, dtype=np.float32), deterministic=True)
-    return int(action)
+    return predict_actions(rl_agent, [state_vector])[0]
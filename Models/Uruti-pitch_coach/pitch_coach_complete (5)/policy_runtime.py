@@ -0,0 +1,165 @@
+"""Numpy-only runtime for the exported pitch coach models.
+
+`inference.export_policy` saves the RL agent's policy network (linear
+layers and activations) plus the observation shape to an `.npz` file after
+checking it against SB3's `predict(deterministic=True)`. This module loads
+that file and predicts actions without importing torch, stable-baselines3
+or sb3-contrib, and exposes the same `predict` signature as an SB3 model so
+it can stand in for one. `inference.export_reward_model` does the same for
+the reward MLP, so frame scoring needs no torch either.
+
+Supported: DQN (argmax of Q-values) and PPO/A2C/TRPO with a discrete
+action space (argmax of action logits), flat Box observations and MLP
+policies.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# 2: meta uses input_shape/output_dim (was obs_shape/n_actions).
+EXPORT_FORMAT_VERSION = 2
+EXPORT_FILENAME = "policy_runtime.npz"
+REWARD_EXPORT_FILENAME = "reward_runtime.npz"
+# Exports are written here (like the SB3 archive cache), not into the
+# models folder, so a read-only checkout still gets them.
+EXPORT_CACHE_DIR_ENV = "URUTI_PITCH_EXPORT_CACHE_DIR"
+
+_ACTIVATIONS = {
+    "identity": lambda x: x,
+    "relu": lambda x: np.maximum(x, np.float32(0)),
+    "tanh": np.tanh,
+    "sigmoid": lambda x: np.float32(1) / (np.float32(1) + np.exp(-x)),
+    "elu": lambda x: np.where(x > 0, x, np.expm1(x)),
+}
+
+
+def artifact_digest(model_path):
+    """SHA-256 over the relative paths and contents of a model file or directory."""
+    digest = hashlib.sha256()
+    if os.path.isfile(model_path):
+        with open(model_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    for root, dirs, files in os.walk(model_path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            digest.update(os.path.relpath(file_path, model_path).encode("utf-8") + b"\0")
+            with open(file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MLPRuntime:
+    def __init__(self, layers, input_shape, output_dim, meta=None):
+        # layers: ("linear", weight (out, in) float32, bias (out,) float32)
+        # or (activation name, None, None), applied in order.
+        self.layers = layers
+        self.input_shape = tuple(input_shape)
+        self.output_dim = int(output_dim)
+        self.meta = meta or {}
+
+    def forward(self, inputs):
+        """Network output for a batch of inputs, shape (N, output_dim)."""
+        x = np.asarray(inputs, dtype=np.float32).reshape(-1, int(np.prod(self.input_shape)))
+        for kind, weight, bias in self.layers:
+            if kind == "linear":
+                x = x @ weight.T + bias
+            else:
+                x = _ACTIVATIONS[kind](x).astype(np.float32, copy=False)
+        return x
+
+    def save(self, path, meta):
+        arrays = {}
+        layer_kinds = []
+        for idx, (kind, weight, bias) in enumerate(self.layers):
+            layer_kinds.append(kind)
+            if kind == "linear":
+                arrays[f"weight_{idx}"] = weight
+                arrays[f"bias_{idx}"] = bias
+        meta = {
+            **meta,
+            "format_version": EXPORT_FORMAT_VERSION,
+            "layers": layer_kinds,
+            "input_shape": list(self.input_shape),
+            "output_dim": self.output_dim,
+        }
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, meta=np.array(json.dumps(meta)), **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("format_version") != EXPORT_FORMAT_VERSION:
+                raise ValueError(f"unsupported export format: {meta.get('format_version')}")
+            layers = []
+            for idx, kind in enumerate(meta["layers"]):
+                if kind == "linear":
+                    layers.append(("linear", data[f"weight_{idx}"], data[f"bias_{idx}"]))
+                elif kind in _ACTIVATIONS:
+                    layers.append((kind, None, None))
+                else:
+                    raise ValueError(f"unsupported layer in export: {kind}")
+        return cls(layers, meta["input_shape"], meta["output_dim"], meta)
+
+
+class PolicyRuntime(MLPRuntime):
+    """Q-network or action-logit network; the action is the argmax."""
+
+    def predict(self, observation, state=None, episode_start=None, deterministic=True):
+        """Same contract as SB3's `predict`: returns (actions, None); a single
+        observation gives a 0-d action array, a batch gives shape (N,)."""
+        obs = np.asarray(observation, dtype=np.float32)
+        single = obs.shape == self.input_shape
+        actions = np.argmax(self.forward(obs), axis=1)
+        return (actions[0] if single else actions), None
+
+
+class RewardRuntime(MLPRuntime):
+    """The reward MLP: one score per 9-feature frame."""
+
+    def scores(self, features):
+        return self.forward(features)[:, 0]
+
+
+def export_path(model_dir, filename=EXPORT_FILENAME):
+    """Where the export for `model_dir` (the SB3 best_model directory or the
+    reward_model.pt file) lives: in the export cache directory, keyed by the
+    source's absolute path. Staleness is checked against its digest on load."""
+    cache_dir = os.getenv(EXPORT_CACHE_DIR_ENV) or os.path.join(tempfile.gettempdir(), "uruti_pitch_export_cache")
+    key = hashlib.sha256(os.path.abspath(model_dir).encode("utf-8")).hexdigest()[:24]
+    stem, ext = os.path.splitext(filename)
+    return os.path.join(cache_dir, f"{stem}-{key}{ext}")
+
+
+def _load_fresh(runtime_class, source_path, filename):
+    path = export_path(source_path, filename)
+    if not os.path.isfile(path) or not os.path.exists(source_path):
+        return None
+    try:
+        runtime = runtime_class.load(path)
+    except Exception:
+        return None
+    if runtime.meta.get("source_digest") != artifact_digest(source_path):
+        return None
+    return runtime
+
+
+def load_exported(model_dir):
+    """Load the exported policy if it was made from the current contents of
+    `model_dir`; None if it is missing, stale or unreadable."""
+    return _load_fresh(PolicyRuntime, model_dir, EXPORT_FILENAME)
+
+
+def load_exported_reward(reward_path):
+    """Load the exported reward model if it matches `reward_path`."""
+    return _load_fresh(RewardRuntime, reward_path, REWARD_EXPORT_FILENAME)
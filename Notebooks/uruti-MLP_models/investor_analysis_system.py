@@ -283,12 +283,16 @@ class RwandanStartupAnalyzer:
         
         return context
     
-    def batch_analyze(self, startups_df):
+    def batch_analyze(self, startups_df, include_insights=False, sort=True):
         """
         Analyze multiple startups at once.
         
         Args:
             startups_df: DataFrame with multiple startup records
+            include_insights: Also add the insights, recommendations, risk
+                assessment and Rwanda context columns (same content as
+                analyze_startup, computed column-wise)
+            sort: Sort by investment readiness (highest first)
         
         Returns:
             DataFrame with predictions and key metrics
@@ -301,11 +305,191 @@ class RwandanStartupAnalyzer:
         results['confidence'] = probabilities.max(axis=1)
         results['investment_ready_prob'] = probabilities[:, self.class_mapping['investment_ready']]
         
+        if include_insights:
+            columns = self._columnar_analysis(
+                startups_df, results['prediction'].to_numpy(dtype=object), probabilities
+            )
+            for name, values in columns.items():
+                results[name] = values
+        
         # Sort by investment readiness
-        results = results.sort_values('investment_ready_prob', ascending=False)
+        if sort:
+            results = results.sort_values('investment_ready_prob', ascending=False)
         
         return results
     
+    def iter_batch_analyze(self, csv_path, chunksize=10000, include_insights=True, **read_csv_kwargs):
+        """
+        Analyze a CSV that may not fit in memory, one chunk at a time.
+        
+        Args:
+            csv_path: Path to the startups CSV
+            chunksize: Rows per chunk
+            include_insights: See batch_analyze
+            **read_csv_kwargs: Passed through to pandas.read_csv
+        
+        Yields:
+            One analyzed DataFrame per chunk, in file order (not sorted)
+        """
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize, **read_csv_kwargs):
+            yield self.batch_analyze(chunk, include_insights=include_insights, sort=False)
+    
+    def _columnar_analysis(self, df, prediction, probabilities):
+        """
+        Vectorized insights, recommendations, risk assessment and Rwanda
+        context for every row of df.
+        
+        Every rule from the per-startup methods is evaluated once as a boolean
+        mask over the whole frame; the text lists are assembled per row at the
+        end. Output matches analyze_startup row for row.
+        """
+        n = len(df)
+        
+        def column(name, default):
+            if name not in df.columns:
+                return np.full(n, default, dtype=float)
+            return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=float)
+        
+        def assemble(rules):
+            # rules: (mask, text) in output order; text is a str or per-row array
+            rows = [[] for _ in range(n)]
+            for mask, text in rules:
+                per_row = not isinstance(text, str)
+                for i in np.flatnonzero(mask):
+                    rows[i].append(text[i] if per_row else text)
+            return rows
+        
+        everyone = np.ones(n, dtype=bool)
+        class_index = np.array([self.class_mapping[p] for p in prediction], dtype=int)
+        predicted_prob = probabilities[np.arange(n), class_index]
+        ready_index = self.class_mapping.get('investment_ready')
+        ready_prob = probabilities[:, ready_index] if ready_index is not None else np.zeros(n)
+        is_ready = prediction == 'investment_ready'
+        is_mentorship = prediction == 'mentorship_needed'
+        is_not_ready = ~is_ready & ~is_mentorship
+        
+        # Insights
+        headline = [
+            f"Investment Readiness: **{p.upper().replace('_', ' ')}** (Confidence: {c:.1%})"
+            for p, c in zip(prediction, predicted_prob)
+        ]
+        insight_rules = [(everyone, headline)]
+        if 'revenue' in df.columns and 'funding' in df.columns:
+            efficiency = column('revenue', 0) / np.maximum(column('funding', 0), 1)
+            insight_rules.append((everyone, [f"Revenue per funding dollar: ${v:.2f}" for v in efficiency]))
+        if 'employees' in df.columns:
+            team = np.select(
+                [column('employees', 0) < limit for limit in (5, 20, 50)], [0, 1, 2], default=3
+            )
+            for level, text in enumerate([
+                "⚠️ Very small team - may need talent acquisition support",
+                "✓ Lean team structure - good for early stage",
+                "✓ Growing team - shows traction",
+                "✓ Established team - mature operations",
+            ]):
+                insight_rules.append((team == level, text))
+        rd_spend = column('R&D Spend', 0)
+        marketing_spend = column('Marketing Spend', 0)
+        total_spend = rd_spend + column('Administration', 0) + marketing_spend
+        with np.errstate(divide='ignore', invalid='ignore'):
+            insight_rules.append(((total_spend > 0) & (rd_spend / total_spend > 0.4),
+                                  "✓ Strong R&D focus - good for tech innovation"))
+            insight_rules.append(((total_spend > 0) & (marketing_spend / total_spend > 0.4),
+                                  "⚠️ High marketing spend - ensure unit economics are viable"))
+        if 'age' in df.columns:
+            stage = np.select([column('age', 0) < limit for limit in (1, 3, 5)], [0, 1, 2], default=3)
+            for level, text in enumerate([
+                "Very early stage - high risk, high potential",
+                "Early stage - critical validation period",
+                "Growth stage - proven concept phase",
+                "Mature startup - scaling phase",
+            ]):
+                insight_rules.append((stage == level, text))
+        
+        # Recommendations
+        recommendation_rules = [(is_ready, text) for text in [
+            "🎯 RECOMMENDED FOR INVESTMENT",
+            "Next steps:",
+            "  • Conduct detailed due diligence",
+            "  • Evaluate team capabilities and market positioning",
+            "  • Review financial projections and unit economics",
+            "  • Consider co-investment with local VCs (Norrsken, 250 Startups)",
+            "  • Assess East African Community expansion potential",
+        ]]
+        recommendation_rules += [(is_mentorship, text) for text in [
+            "📚 REQUIRES MENTORSHIP BEFORE INVESTMENT",
+            "Recommended support:",
+            "  • Connect with kLab or Impact Hub Kigali programs",
+            "  • Business model refinement workshops",
+            "  • Financial management training",
+            "  • Market validation support",
+        ]]
+        recommendation_rules += [
+            (is_mentorship & (ready_prob > 0.3),
+             "  ⭐ Note: Shows potential - consider follow-on evaluation in 6 months"),
+            (is_mentorship & (column('employees', 0) < 5), "  • Team building support needed"),
+            (is_mentorship & (column('revenue', 0) < 10000), "  • Revenue generation strategies required"),
+            (is_not_ready, "❌ NOT RECOMMENDED FOR INVESTMENT"),
+            (is_not_ready, "Critical issues to address:"),
+            (is_not_ready & (column('revenue', 0) < 5000), "  • No viable revenue model demonstrated"),
+            (is_not_ready & (column('age', 5) < 1) & (column('revenue', 0) < 1000),
+             "  • Too early stage - needs product-market fit"),
+            (is_not_ready & (column('employees', 10) < 3), "  • Team not adequately formed"),
+        ]
+        recommendation_rules += [(is_not_ready, text) for text in [
+            "Alternative support:",
+            "  • Refer to early-stage incubators (Westerwelle Foundation)",
+            "  • Grant programs instead of equity investment",
+            "  • Re-evaluate after 12 months of development",
+        ]]
+        
+        # Risk assessment
+        risk_score = 1 - ready_prob
+        risk_level = np.select([risk_score < 0.3, risk_score < 0.6], ['LOW', 'MEDIUM'], default='HIGH')
+        factor_masks = [
+            (column('revenue', 1) < 10000, "Limited revenue - market validation risk"),
+            (column('age', 5) < 2, "Very young company - execution risk"),
+            (column('funding', 0) > column('revenue', 0) * 10, "High burn rate - runway risk"),
+            (column('employees', 0) < 5, "Small team - key person dependency risk"),
+            (column('revenue', 0) < 50000, "Limited local market penetration - scaling risk"),
+        ]
+        any_factor = np.logical_or.reduce([mask for mask, _ in factor_masks])
+        risk_factors = assemble(factor_masks + [(~any_factor, "Standard startup risks apply")])
+        
+        # Rwanda context
+        if 'sector' in df.columns:
+            sector = df['sector'].astype(str)
+            priority = df['sector'].map(lambda v: isinstance(v, str)).to_numpy(dtype=bool) & \
+                sector.str.lower().isin(self.rwanda_context['key_sectors']).to_numpy(dtype=bool)
+            sector_lines = [f"✓ {name.title()} is a priority sector in Rwanda's ICT strategy" for name in sector]
+        else:
+            priority = np.full(n, 'unknown' in self.rwanda_context['key_sectors'])
+            sector_lines = "✓ Unknown is a priority sector in Rwanda's ICT strategy"
+        context_rules = [(priority, sector_lines)] + [(everyone, text) for text in [
+            "\nRwandan Ecosystem Resources:",
+            "• Potential partners: " + ', '.join(self.rwanda_context['investor_ecosystem']),
+            "• Support available: " + ', '.join(self.rwanda_context['support_programs']),
+            "\nLocal Market Considerations:",
+            "• Rwanda offers strong ease of doing business (2nd in Africa)",
+            "• Access to EAC market (300M+ consumers)",
+            "• Government backing for tech innovation",
+            "• Challenge: Limited domestic market size - regional expansion critical",
+        ]] + [(is_ready, text) for text in [
+            "\nInvestment Climate:",
+            "• Rwanda has investor-friendly policies",
+            "• Tax incentives available for tech companies",
+            "• Strong IP protection framework",
+        ]]
+        
+        return {
+            'insights': assemble(insight_rules),
+            'recommendations': assemble(recommendation_rules),
+            'risk_level': risk_level,
+            'risk_score': risk_score,
+            'risk_factors': risk_factors,
+            'rwanda_specific': assemble(context_rules),
+        }
+    
     def print_analysis(self, analysis):
         """Pretty print analysis results."""
         print("=" * 80)
@@ -425,30 +425,92 @@ class ApiService {
   }
 
   Future<Map<String, dynamic>> uploadMessageAttachment(String filePath) async {
-    final tok = await token;
-    final request = http.MultipartRequest(
-      'POST',
-      Uri.parse('${AppConstants.apiV1}/messages/attachments/upload'),
+    return _uploadResumable('message_attachment', filePath);
+  }
+
+  /// Resumable upload: POST /uploads, PUT each chunk at its offset, then
+  /// POST /uploads/{id}/complete. After a dropped connection it asks the
+  /// server how much it already has and continues from there.
+  Future<Map<String, dynamic>> _uploadResumable(
+    String purpose,
+    String filePath, {
+    Map<String, dynamic> metadata = const {},
+  }) async {
+    final file = File(filePath);
+    final size = await file.length();
+    final init = await _handleResponse(
+      await http.post(
+        Uri.parse('${AppConstants.apiV1}/uploads'),
+        headers: await _headers(auth: true),
+        body: jsonEncode({
+          'purpose': purpose,
+          'file_name': filePath.split(Platform.pathSeparator).last,
+          'size': size,
+          'metadata': metadata,
+        }),
+      ),
     );
 
-    if (tok != null) {
-      request.headers['Authorization'] = 'Bearer $tok';
-    }
+    final uploadUrl = '${AppConstants.apiV1}/uploads/${init['upload_id']}';
+    final chunkSize = int.tryParse('${init['chunk_size']}') ?? 2 * 1024 * 1024;
+    var offset = int.tryParse('${init['offset']}') ?? 0;
+    var failures = 0;
 
-    request.files.add(await http.MultipartFile.fromPath('file', filePath));
+    final raf = await file.open();
+    try {
+      while (offset < size) {
+        await raf.setPosition(offset);
+        final chunk = await raf.read(chunkSize);
+        http.Response? res;
+        try {
+          final headers = await _headers(auth: true);
+          headers['Content-Type'] = 'application/octet-stream';
+          res = await http
+              .put(Uri.parse('$uploadUrl?offset=$offset'), headers: headers, body: chunk)
+              .timeout(const Duration(seconds: 60));
+        } on Exception {
+          res = null;
+        }
 
-    final streamed = await request.send();
-    final body = await streamed.stream.bytesToString();
-    final json = jsonDecode(body) as Map<String, dynamic>;
+        if (res != null && (res.statusCode < 300 || res.statusCode == 409)) {
+          final body = jsonDecode(utf8.decode(res.bodyBytes));
+          final next = body is Map ? int.tryParse('${body['offset']}') : null;
+          if (next != null) {
+            offset = next;
+            failures = 0;
+            continue;
+          }
+        }
+        if (res != null && res.statusCode < 500 && res.statusCode != 409) {
+          await _handleResponse(res);
+        }
 
-    if (streamed.statusCode < 200 || streamed.statusCode >= 300) {
-      throw ApiException(
-        statusCode: streamed.statusCode,
-        message: json['detail']?.toString() ?? 'Attachment upload failed',
-      );
+        // Network drop or server error: back off, then resume from the server's offset.
+        failures += 1;
+        if (failures > 6) {
+          throw ApiException(statusCode: 0, message: 'Upload interrupted. Please try again.');
+        }
+        await Future.delayed(Duration(seconds: failures > 4 ? 16 : 1 << (failures - 1)));
+        try {
+          final status = await _handleResponse(
+            await http.get(Uri.parse(uploadUrl), headers: await _headers(auth: true)),
+          );
+          offset = int.tryParse('${status['offset']}') ?? offset;
+        } on Exception {
+          // Still offline; retry the same offset.
+        }
+      }
+    } finally {
+      await raf.close();
     }
 
-    return json;
+    return _handleResponse(
+      await http.post(
+        Uri.parse('$uploadUrl/complete'),
+        headers: await _headers(auth: true),
+        body: jsonEncode({}),
+      ),
+    );
   }
 
   Future<int> markThreadAsRead(int otherUserId) async {
@@ -667,36 +729,17 @@ class ApiService {
     required int targetDurationSeconds,
     String? notes,
   }) async {
-    final tok = await token;
-    final request = http.MultipartRequest(
-      'POST',
-      Uri.parse('${AppConstants.apiV1}/ventures/$ventureId/pitch-video'),
+    return _uploadResumable(
+      'pitch_video',
+      filePath,
+      metadata: {
+        'venture_id': ventureId,
+        'pitch_type': pitchType,
+        'duration': durationSeconds,
+        'target_duration': targetDurationSeconds,
+        'notes': notes?.trim() ?? '',
+      },
     );
-
-    if (tok != null) {
-      request.headers['Authorization'] = 'Bearer $tok';
-    }
-
-    request.files.add(await http.MultipartFile.fromPath('file', filePath));
-    request.fields['pitch_type'] = pitchType;
-    request.fields['duration'] = durationSeconds.toString();
-    request.fields['target_duration'] = targetDurationSeconds.toString();
-    if (notes != null && notes.trim().isNotEmpty) {
-      request.fields['notes'] = notes.trim();
-    }
-
-    final streamed = await request.send();
-    final body = await streamed.stream.bytesToString();
-    final json = jsonDecode(body) as Map<String, dynamic>;
-
-    if (streamed.statusCode < 200 || streamed.statusCode >= 300) {
-      throw ApiException(
-        statusCode: streamed.statusCode,
-        message: json['detail']?.toString() ?? 'Pitch upload failed',
-      );
-    }
-
-    return json;
   }
 
   Future<Map<String, dynamic>> uploadVentureLogo(
@@ -0,0 +1 @@
+"""Host-side benchmark harnesses (run with `python -m app.bench.<name>`)."""
@@ -0,0 +1,247 @@
+"""Drive `/api/v1/ai/chat` on the real chatbot app with fake LLM backends.
+
+Usage (from the backend directory):
+
+    python -m app.bench.chat_load --sessions 20 --messages 3
+    python -m app.bench.chat_load --model gemini --gemini-failure-rate 0.1 --json
+
+The chatbot FastAPI app (`app.chatbot_main`) is served in-process over an ASGI
+transport against a throwaway SQLite database (override with --database-url).
+`FakeLlama` replaces the GGUF model and `FakeGemini` replaces the Gemini API,
+so the router's semaphore queueing, timeouts and fallbacks run for real while
+generation time follows the configured latency/token-rate distributions.
+
+Reports p50/p95/p99 request latency, backend mix, fallback rate and the
+latency of DB write statements issued while serving the load.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Any
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _summary(values: list[float]) -> dict[str, Any]:
+    def ms(value: float | None) -> float | None:
+        return None if value is None else round(value * 1000, 2)
+
+    return {
+        "count": len(values),
+        "p50_ms": ms(_percentile(values, 50)),
+        "p95_ms": ms(_percentile(values, 95)),
+        "p99_ms": ms(_percentile(values, 99)),
+        "max_ms": ms(max(values) if values else None),
+    }
+
+
+class _WriteTimer:
+    """Times INSERT/UPDATE/DELETE statements via SQLAlchemy cursor events."""
+
+    def __init__(self, engine: Any) -> None:
+        from sqlalchemy import event
+
+        self.samples: list[float] = []
+        self._lock = threading.Lock()
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("_chat_load_started", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info["_chat_load_started"].pop()
+        if statement.lstrip()[:6].upper() in {"INSERT", "UPDATE", "DELETE"}:
+            with self._lock:
+                self.samples.append(time.perf_counter() - started)
+
+
+def _create_users(count: int) -> list[str]:
+    from .. import models
+    from ..auth import create_access_token
+    from ..database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        stamp = int(time.time() * 1000)
+        users = [
+            models.User(
+                email=f"chat-load-{stamp}-{idx}@example.com",
+                hashed_password="!",
+                full_name=f"Load Test Founder {idx}",
+                role=models.UserRole.FOUNDER,
+            )
+            for idx in range(count)
+        ]
+        db.add_all(users)
+        db.commit()
+        return [create_access_token({"sub": user.id}) for user in users]
+    finally:
+        db.close()
+
+
+async def _run_session(
+    client: Any,
+    token: str,
+    model: str,
+    messages: int,
+    results: list[dict[str, Any]],
+) -> None:
+    headers = {"Authorization": f"Bearer {token}"}
+    session_id: str | None = None
+    for turn in range(messages):
+        body = {"message": f"How do I price my SaaS for Rwandan SMEs? (turn {turn + 1})", "model": model}
+        if session_id:
+            body["session_id"] = session_id
+        started = time.perf_counter()
+        response = await client.post("/api/v1/ai/chat", json=body, headers=headers)
+        elapsed = time.perf_counter() - started
+        row: dict[str, Any] = {"latency": elapsed, "status": response.status_code}
+        if response.status_code == 200:
+            payload = response.json()
+            session_id = payload.get("session_id")
+            row["fallback_used"] = bool(payload.get("fallback_used"))
+            row["backend"] = payload.get("inference_backend")
+        results.append(row)
+
+
+async def _run(args: argparse.Namespace) -> dict[str, Any]:
+    import httpx
+
+    from ..chatbot_main import app
+    from ..database import engine
+    from ..routers import chatbot as chatbot_router
+    from ..services.chatbot_engine import chatbot_engine
+    from ..services.fake_llm import FakeGemini, FakeLatencyProfile, FakeLlama
+
+    chatbot_engine.set_backend(
+        FakeLlama(
+            FakeLatencyProfile(
+                first_token_ms=args.llm_first_token_ms,
+                tokens_per_second=args.llm_tokens_per_second,
+                response_tokens=args.response_tokens,
+                jitter=args.jitter,
+                failure_rate=args.llm_failure_rate,
+            ),
+            seed=args.seed,
+        )
+    )
+    gemini = FakeGemini(
+        FakeLatencyProfile(
+            first_token_ms=args.gemini_first_token_ms,
+            tokens_per_second=args.gemini_tokens_per_second,
+            response_tokens=args.response_tokens,
+            jitter=args.jitter,
+            failure_rate=args.gemini_failure_rate,
+        ),
+        seed=None if args.seed is None else args.seed + 1,
+    )
+    chatbot_router.set_gemini_backend(gemini)
+
+    tokens = _create_users(args.sessions)
+    write_timer = _WriteTimer(engine)
+    results: list[dict[str, Any]] = []
+
+    # Unhandled app errors become 500 responses and are counted, not raised.
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://chat-load", timeout=None) as client:
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(_run_session(client, token, args.model, args.messages, results) for token in tokens)
+        )
+        wall = time.perf_counter() - started
+
+    ok = [row for row in results if row["status"] == 200]
+    fallbacks = [row for row in ok if row.get("fallback_used")]
+    return {
+        "config": {
+            "sessions": args.sessions,
+            "messages_per_session": args.messages,
+            "model": args.model,
+            "database_url": os.environ.get("DATABASE_URL"),
+        },
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "status_codes": dict(Counter(str(row["status"]) for row in results)),
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(results) / wall, 2) if wall > 0 else None,
+        "latency": _summary([row["latency"] for row in results]),
+        "fallback_rate": round(len(fallbacks) / len(ok), 4) if ok else None,
+        "backends": dict(Counter(str(row.get("backend")) for row in ok)),
+        "db_write_latency": _summary(write_timer.samples),
+        "fake_backend_calls": {
+            "llama": chatbot_engine._llm.calls,
+            "gemini": gemini.calls,
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent chat sessions")
+    parser.add_argument("--messages", type=int, default=3, help="messages sent sequentially per session")
+    parser.add_argument("--model", default="uruti-ai", choices=["uruti-ai", "gemini"])
+    parser.add_argument("--llm-first-token-ms", type=float, default=250.0)
+    parser.add_argument("--llm-tokens-per-second", type=float, default=12.0)
+    parser.add_argument("--llm-failure-rate", type=float, default=0.0)
+    parser.add_argument("--gemini-first-token-ms", type=float, default=500.0)
+    parser.add_argument("--gemini-tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--gemini-failure-rate", type=float, default=0.0)
+    parser.add_argument("--response-tokens", type=int, default=40)
+    parser.add_argument("--jitter", type=float, default=0.3, help="log-normal sigma for latency/token rate")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON only")
+    args = parser.parse_args(argv)
+
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        print("httpx is required for the load generator: pip install httpx", file=sys.stderr)
+        return 2
+
+    # The database engine is created at import time, so configure it first.
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='uruti-chat-load-')}/chat_load.db"
+
+    report = asyncio.run(_run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    latency = report["latency"]
+    writes = report["db_write_latency"]
+    print(
+        f"{report['requests']} requests from {args.sessions} sessions in {report['wall_seconds']}s "
+        f"({report['throughput_rps']} req/s), errors={report['errors']} {report['status_codes']}"
+    )
+    print(f"latency      p50={latency['p50_ms']}ms p95={latency['p95_ms']}ms p99={latency['p99_ms']}ms")
+    print(f"fallback     rate={report['fallback_rate']} backends={report['backends']}")
+    print(
+        f"db writes    n={writes['count']} p50={writes['p50_ms']}ms "
+        f"p95={writes['p95_ms']}ms p99={writes['p99_ms']}ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,205 @@
+"""Sweep llama-cpp `n_threads` / `n_batch` for the GGUF chatbot on this host.
+
+Usage (from the backend directory):
+
+    python -m app.bench.chatbot
+    python -m app.bench.chatbot --threads 2,4,8 --batch 128,256,512 --dry-run
+
+Each combination loads the model, evaluates a synthetic prompt (prefill) and
+then decodes single tokens, reporting tokens/s for both phases. The best
+combination is written as the "recommended" section of the tuning file that
+`ChatbotEngine` reads at startup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from ..services.chatbot_engine import chatbot_engine
+
+_PROMPT_SEED = (
+    "Uruti helps early-stage founders in Rwanda refine their market sizing, "
+    "go-to-market strategy, pricing and fundraising narrative. "
+)
+
+
+def _parse_int_list(raw: str) -> list[int]:
+    values = sorted({int(part) for part in raw.split(",") if part.strip()})
+    if not values or any(value <= 0 for value in values):
+        raise argparse.ArgumentTypeError(f"expected comma-separated positive integers, got {raw!r}")
+    return values
+
+
+def _default_threads() -> list[int]:
+    cpus = os.cpu_count() or 1
+    candidates = {1, 2, 4, 6, 8, 12, 16, cpus // 2, cpus}
+    return sorted(value for value in candidates if 0 < value <= cpus)
+
+
+def _prompt_tokens(llm: Any, count: int) -> list[int]:
+    tokens: list[int] = []
+    seed = _PROMPT_SEED.encode("utf-8")
+    while len(tokens) < count:
+        tokens.extend(llm.tokenize(seed, add_bos=not tokens))
+    return tokens[:count]
+
+
+def _measure(
+    model_path: str,
+    base_kwargs: dict[str, Any],
+    n_threads: int,
+    n_batch: int,
+    prompt_tokens: int,
+    gen_tokens: int,
+    repeats: int,
+) -> dict[str, Any]:
+    from llama_cpp import Llama  # type: ignore
+
+    kwargs = {
+        **base_kwargs,
+        "n_threads": n_threads,
+        "n_threads_batch": n_threads,
+        "n_batch": n_batch,
+        "n_ubatch": min(n_batch, int(base_kwargs.get("n_ubatch") or n_batch)),
+        "n_ctx": max(int(base_kwargs.get("n_ctx") or 0), prompt_tokens + gen_tokens + 8),
+        "verbose": False,
+    }
+    load_start = time.perf_counter()
+    llm = Llama(model_path=model_path, **kwargs)
+    load_seconds = time.perf_counter() - load_start
+
+    prompt = _prompt_tokens(llm, prompt_tokens)
+    prefill_tps: list[float] = []
+    decode_tps: list[float] = []
+    try:
+        for _ in range(repeats):
+            llm.reset()
+            start = time.perf_counter()
+            llm.eval(prompt)
+            prefill_tps.append(len(prompt) / max(time.perf_counter() - start, 1e-9))
+
+            # Feed a fixed token so the measurement is the forward pass only.
+            token = prompt[-1]
+            start = time.perf_counter()
+            for _ in range(gen_tokens):
+                llm.eval([token])
+            decode_tps.append(gen_tokens / max(time.perf_counter() - start, 1e-9))
+    finally:
+        del llm
+
+    return {
+        "n_threads": n_threads,
+        "n_batch": n_batch,
+        "load_seconds": round(load_seconds, 3),
+        "prefill_tokens_per_second": round(max(prefill_tps), 2),
+        "decode_tokens_per_second": round(max(decode_tps), 2),
+    }
+
+
+def recommend(results: list[dict[str, Any]]) -> dict[str, Any]:
+    """Pick decode threads and prefill threads/batch independently.
+
+    llama-cpp uses `n_threads` for single-token decode and `n_threads_batch`
+    for prompt evaluation, so each is tuned on its own phase.
+    """
+    if not results:
+        return {}
+    best_decode = max(results, key=lambda row: row["decode_tokens_per_second"])
+    best_prefill = max(results, key=lambda row: row["prefill_tokens_per_second"])
+    return {
+        "n_threads": best_decode["n_threads"],
+        "n_threads_batch": best_prefill["n_threads"],
+        "n_batch": best_prefill["n_batch"],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", help="GGUF file (defaults to the engine's discovered model)")
+    parser.add_argument("--threads", type=_parse_int_list, default=None, help="e.g. 2,4,8")
+    parser.add_argument("--batch", type=_parse_int_list, default=[64, 128, 256, 512], help="e.g. 128,512")
+    parser.add_argument("--prompt-tokens", type=int, default=256)
+    parser.add_argument("--gen-tokens", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=2)
+    parser.add_argument("--output", help="tuning file to write (defaults to the engine's tuning file)")
+    parser.add_argument("--dry-run", action="store_true", help="print results without writing the tuning file")
+    args = parser.parse_args(argv)
+
+    model_path = args.model or chatbot_engine._discover_local_model()
+    if not model_path or not os.path.exists(model_path):
+        print("No local GGUF model found; pass --model or set URUTI_CHATBOT_LOCAL_GGUF_PATH.", file=sys.stderr)
+        return 2
+
+    try:
+        import llama_cpp  # noqa: F401  # type: ignore
+    except Exception as exc:
+        print(f"llama-cpp not available: {exc}", file=sys.stderr)
+        return 2
+
+    # Sweep on top of the non-swept knobs (mmap, mlock, cache types) the engine would use.
+    base_kwargs = {
+        key: value
+        for key, value in chatbot_engine.llama_kwargs().items()
+        if key not in {"n_threads", "n_threads_batch", "n_batch"}
+    }
+    threads = args.threads or _default_threads()
+
+    results: list[dict[str, Any]] = []
+    for n_threads in threads:
+        for n_batch in args.batch:
+            row = _measure(
+                model_path,
+                base_kwargs,
+                n_threads,
+                n_batch,
+                max(1, args.prompt_tokens),
+                max(1, args.gen_tokens),
+                max(1, args.repeats),
+            )
+            results.append(row)
+            print(
+                f"threads={n_threads:<3} batch={n_batch:<5} "
+                f"prefill={row['prefill_tokens_per_second']:>9.2f} tok/s  "
+                f"decode={row['decode_tokens_per_second']:>7.2f} tok/s"
+            )
+
+    recommended = recommend(results)
+    print(f"recommended: {json.dumps(recommended)}")
+    if args.dry_run:
+        return 0
+
+    output = Path(args.output).expanduser() if args.output else chatbot_engine.tuning_file_path()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+                "host": {
+                    "platform": platform.platform(),
+                    "machine": platform.machine(),
+                    "cpu_count": os.cpu_count(),
+                },
+                "model_path": model_path,
+                "prompt_tokens": args.prompt_tokens,
+                "gen_tokens": args.gen_tokens,
+                "recommended": recommended,
+                "results": results,
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    print(f"wrote {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
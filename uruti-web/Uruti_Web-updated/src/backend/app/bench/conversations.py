@@ -0,0 +1,262 @@
+"""Measure building the conversation list for a user with many connections.
+
+Usage (from the backend directory):
+
+    python -m app.bench.conversations --connections 1000 --messages 10000
+    python -m app.bench.conversations --database-url postgresql://... --json
+
+Seeds a throwaway SQLite database (override with --database-url) with one
+user, --connections connected peers and --messages messages between them
+(plus some with users outside the user's connections), then builds the
+conversation list with:
+
+- summaries: `_conversation_rows`, a range scan of conversation_summaries
+  (filled first by the chunked rebuild, which is timed too);
+- windowed: computing the user's summaries from `messages` with window
+  functions (`compute_summaries`), as the rebuild does;
+- windowed_no_index: the same without the composite messages indexes;
+- legacy: the original implementation, a latest-message query and an
+  unread count per connection.
+
+Reports latency percentiles and SQL statements per build, and checks that
+all variants return the same conversations.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from .chat_load import _summary
+
+
+def _seed(db: Any, args: argparse.Namespace) -> int:
+    from sqlalchemy import insert
+
+    from ..models import Connection, Message, User, UserRole
+
+    rng = random.Random(args.seed)
+    users = [
+        {
+            "email": f"bench-{i}@example.com",
+            "hashed_password": "!",
+            "full_name": f"Bench User {i}",
+            "role": UserRole.FOUNDER,
+        }
+        for i in range(args.connections + args.strangers + 1)
+    ]
+    db.execute(insert(User), users)
+    ids = [row[0] for row in db.query(User.id).order_by(User.id).all()]
+    me, peers, strangers = ids[0], ids[1 : args.connections + 1], ids[args.connections + 1 :]
+    db.execute(
+        insert(Connection),
+        [{"user1_id": min(me, peer), "user2_id": max(me, peer)} for peer in peers],
+    )
+
+    # Most peers have a conversation; a long tail of busy ones.
+    talking = peers[: int(len(peers) * 0.9)] or peers
+    weights = [1.0 / (rank + 1) ** 0.5 for rank in range(len(talking))]
+    others = rng.choices(talking, weights=weights, k=args.messages)
+    others += rng.choices(strangers, k=args.messages // 20) if strangers else []
+    start = datetime(2025, 1, 1)
+    rows = []
+    for n, other in enumerate(others):
+        outgoing = rng.random() < 0.5
+        rows.append({
+            "sender_id": me if outgoing else other,
+            "receiver_id": other if outgoing else me,
+            "body": f"message {n}",
+            "is_read": outgoing or rng.random() < 0.8,
+            "is_archived": False,
+            "created_at": start + timedelta(seconds=rng.randrange(0, 90 * 24 * 3600)),
+        })
+    db.execute(insert(Message), rows)
+    db.commit()
+    return me
+
+
+def _legacy_rows(db: Any, user_id: int) -> list[tuple]:
+    from sqlalchemy import desc, or_
+
+    from ..models import Message, User
+    from ..routers.messages import _get_connection_user_ids
+
+    connection_ids = _get_connection_user_ids(user_id, db)
+    users_by_id = {user.id: user for user in db.query(User).filter(User.id.in_(connection_ids)).all()}
+    rows = []
+    for other_user_id in connection_ids:
+        other_user = users_by_id.get(other_user_id)
+        if other_user is None:
+            continue
+        last_message = db.query(Message).filter(
+            or_(
+                (Message.sender_id == user_id) & (Message.receiver_id == other_user_id),
+                (Message.sender_id == other_user_id) & (Message.receiver_id == user_id),
+            )
+        ).order_by(desc(Message.created_at)).first()
+        if last_message is None:
+            continue
+        unread_count = db.query(Message).filter(
+            Message.sender_id == other_user_id,
+            Message.receiver_id == user_id,
+            Message.is_read == False,
+            Message.is_archived == False,
+        ).count()
+        rows.append((other_user, last_message.body, last_message.created_at, unread_count))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows
+
+
+def _windowed_rows(db: Any, user_id: int) -> list[tuple]:
+    from ..models import User
+    from ..routers.messages import _get_connection_user_ids
+    from ..services.conversation_summaries import compute_summaries
+
+    peers = set(_get_connection_user_ids(user_id, db))
+    rows = [row for row in compute_summaries(db, user_id, user_id) if row["peer_id"] in peers]
+    users_by_id = {user.id: user for user in db.query(User).filter(User.id.in_([row["peer_id"] for row in rows])).all()}
+    rows.sort(key=lambda row: (row["last_message_at"], row["last_message_id"]), reverse=True)
+    return [
+        (users_by_id[row["peer_id"]], row["preview"], row["last_message_at"], row["unread_count"]) for row in rows
+    ]
+
+
+def _run(
+    build: Callable[[Any, int], list], session_factory: Any, engine: Any, user_id: int, repeat: int
+) -> tuple[dict[str, Any], list]:
+    from sqlalchemy import event
+
+    statements = [0]
+
+    def count(*_: Any) -> None:
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    latencies: list[float] = []
+    try:
+        for _ in range(repeat):
+            db = session_factory()
+            try:
+                started = time.perf_counter()
+                rows = build(db, user_id)
+                latencies.append(time.perf_counter() - started)
+                result = [(user.id, body, created_at, int(unread or 0)) for user, body, created_at, unread in rows]
+            finally:
+                db.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return {
+        "latency": _summary(latencies),
+        "statements_per_build": statements[0] / max(repeat, 1),
+        "conversations": len(result),
+    }, result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=1000, help="connected peers of the measured user")
+    parser.add_argument("--messages", type=int, default=10000, help="messages between the user and peers")
+    parser.add_argument("--strangers", type=int, default=50, help="users who message without a connection")
+    parser.add_argument("--repeat", type=int, default=10, help="builds per variant")
+    parser.add_argument("--chunk-size", type=int, default=500, help="users per rebuild chunk")
+    parser.add_argument("--database-url", default=None, help="database to seed (default: temporary SQLite)")
+    parser.add_argument("--skip-legacy", action="store_true", help="do not run the per-connection queries")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON only")
+    args = parser.parse_args(argv)
+
+    # The database engine is created at import time.
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        workdir = tempfile.mkdtemp(prefix="uruti-conversations-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/conversations_bench.db"
+
+    from ..database import Base, SessionLocal, engine
+    from ..models import Message
+    from ..routers.messages import _conversation_rows
+    from ..services.conversation_summaries import conversation_summary_rebuild
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        user_id = _seed(db, args)
+        seed_seconds = time.perf_counter() - started
+    finally:
+        db.close()
+
+    report: dict[str, Any] = {
+        "connections": args.connections,
+        "messages": args.messages,
+        "dialect": engine.dialect.name,
+        "seed_seconds": round(seed_seconds, 2),
+    }
+    started = time.perf_counter()
+    conversation_summary_rebuild.start(chunk_size=args.chunk_size)
+    conversation_summary_rebuild.run()
+    report["rebuild"] = {
+        **{key: conversation_summary_rebuild.describe()[key] for key in ("status", "processed_users", "summaries")},
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+    results: dict[str, list] = {}
+    report["summaries"], results["summaries"] = _run(
+        _conversation_rows, SessionLocal, engine, user_id, args.repeat
+    )
+    report["windowed"], results["windowed"] = _run(
+        _windowed_rows, SessionLocal, engine, user_id, args.repeat
+    )
+    if not args.skip_legacy:
+        report["legacy"], results["legacy"] = _run(
+            _legacy_rows, SessionLocal, engine, user_id, max(1, args.repeat // 5)
+        )
+
+    for index in Message.__table__.indexes:
+        index.drop(bind=engine)
+    try:
+        report["windowed_no_index"], results["windowed_no_index"] = _run(
+            _windowed_rows, SessionLocal, engine, user_id, args.repeat
+        )
+    finally:
+        for index in Message.__table__.indexes:
+            index.create(bind=engine)
+
+    # Same peers in the same order, with the same last message and unread count.
+    reference = results["summaries"]
+    report["results_match"] = all(result == reference for result in results.values())
+
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+        return 0 if report["results_match"] else 1
+
+    print(
+        f"{args.connections} connections, {args.messages} messages ({report['dialect']}), "
+        f"{report['summaries']['conversations']} conversations"
+    )
+    rebuild = report["rebuild"]
+    print(f"rebuild            {rebuild['summaries']} summaries for {rebuild['processed_users']} users in {rebuild['seconds']}s")
+    for name in ("summaries", "windowed", "windowed_no_index", "legacy"):
+        if name not in report:
+            continue
+        result = report[name]
+        latency = result["latency"]
+        print(
+            f"{name:<18} p50={latency['p50_ms']}ms p95={latency['p95_ms']}ms  "
+            f"{result['statements_per_build']:g} statements/build"
+        )
+    if not report["results_match"]:
+        print("results differ between variants", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,193 @@
+"""Measure concurrent pitch-video seek throughput on the uploads endpoint.
+
+Usage (from the backend directory):
+
+    python -m app.bench.media --viewers 8 --seeks 20
+    python -m app.bench.media --size-mb 128 --window-mb 4 --json
+
+Writes a synthetic video into a temporary upload dir and serves the real
+backend app (`app.main`) in-process over an ASGI transport. Each viewer
+seeks to random positions and requests the next --window-mb with a Range
+header, the way a video player buffers after a seek. The same seeks are
+replayed against the previous implementation (candidate roots resolved on
+every request, plain FileResponse without Range support), which has to send
+the whole file each time.
+
+Reports seeks per second, latency percentiles and bytes transferred per seek
+for both, plus the cost of the file lookup alone.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from .chat_load import _summary
+
+
+def _legacy_app(roots: list[Path]) -> Any:
+    from fastapi import FastAPI
+    from fastapi.responses import FileResponse, Response
+
+    legacy = FastAPI()
+
+    def resolve(filename: str) -> Path | None:
+        for root in [root.resolve() for root in roots]:
+            candidate = root / filename
+            if candidate.exists():
+                return candidate
+        return None
+
+    @legacy.get("/api/v1/profile/uploads/{filename}")
+    async def get_uploaded_file(filename: str):
+        file_path = resolve(filename)
+        if file_path is None:
+            return Response(status_code=404)
+        return FileResponse(file_path)
+
+    return legacy
+
+
+async def _seek_load(app: Any, url: str, size: int, args: argparse.Namespace) -> dict[str, Any]:
+    import httpx
+
+    rng = random.Random(args.seed)
+    window = int(args.window_mb * 1024 * 1024)
+    plans = [
+        [rng.randrange(0, max(size - window, 1)) for _ in range(args.seeks)] for _ in range(args.viewers)
+    ]
+    latencies: list[float] = []
+    transferred = 0
+    statuses: dict[int, int] = {}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def viewer(offsets: list[int]) -> None:
+            nonlocal transferred
+            for offset in offsets:
+                started = time.perf_counter()
+                response = await client.get(url, headers={"range": f"bytes={offset}-{offset + window - 1}"})
+                latencies.append(time.perf_counter() - started)
+                transferred += len(response.content)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(viewer(offsets) for offsets in plans))
+        wall = time.perf_counter() - started
+
+    seeks = len(latencies)
+    return {
+        "seeks": seeks,
+        "wall_seconds": round(wall, 3),
+        "seeks_per_second": round(seeks / wall, 1) if wall > 0 else None,
+        "latency": _summary(latencies),
+        "mb_transferred": round(transferred / (1024 * 1024), 1),
+        "kb_per_seek": round(transferred / seeks / 1024, 1) if seeks else None,
+        "status_codes": statuses,
+    }
+
+
+def _lookup_cost(filename: str, roots: list[Path], iterations: int) -> dict[str, float]:
+    from ..services.media_files import media_resolver
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for root in [root.resolve() for root in roots]:
+            if (root / filename).exists():
+                break
+    legacy = time.perf_counter() - started
+
+    media_resolver.resolve(filename)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        media_resolver.resolve(filename)
+    cached = time.perf_counter() - started
+    return {
+        "legacy_us": round(legacy / iterations * 1e6, 2),
+        "cached_us": round(cached / iterations * 1e6, 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--viewers", type=int, default=8, help="concurrent viewers")
+    parser.add_argument("--seeks", type=int, default=10, help="seeks per viewer")
+    parser.add_argument("--size-mb", type=float, default=32.0, help="size of the synthetic video")
+    parser.add_argument("--window-mb", type=float, default=2.0, help="bytes requested after each seek")
+    parser.add_argument("--lookups", type=int, default=20000, help="iterations for the lookup timing")
+    parser.add_argument("--skip-legacy", action="store_true", help="do not replay against the old endpoint")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON only")
+    args = parser.parse_args(argv)
+
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        print("httpx is required for the benchmark: pip install httpx", file=sys.stderr)
+        return 2
+
+    # Settings and the database engine are created at import time.
+    workdir = Path(tempfile.mkdtemp(prefix="uruti-media-bench-"))
+    upload_dir = workdir / "uploads"
+    upload_dir.mkdir()
+    os.environ["UPLOAD_DIR"] = str(upload_dir)
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/media_bench.db")
+
+    size = int(args.size_mb * 1024 * 1024)
+    filename = f"pitch_0_{uuid.uuid4().hex}.mp4"
+    with open(upload_dir / filename, "wb") as f:
+        block = os.urandom(1024 * 1024)
+        for _ in range(size // len(block)):
+            f.write(block)
+        f.write(block[: size % len(block)])
+
+    from ..main import app
+    from ..services.media_files import upload_roots
+
+    url = f"/api/v1/profile/uploads/{filename}"
+    roots = upload_roots()
+    report: dict[str, Any] = {
+        "viewers": args.viewers,
+        "seeks_per_viewer": args.seeks,
+        "file_mb": round(size / (1024 * 1024), 1),
+        "window_mb": args.window_mb,
+        "ranged": asyncio.run(_seek_load(app, url, size, args)),
+        "lookup": _lookup_cost(filename, roots, args.lookups),
+    }
+    if not args.skip_legacy:
+        report["legacy"] = asyncio.run(_seek_load(_legacy_app(roots), url, size, args))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(
+        f"{args.viewers} viewers x {args.seeks} seeks on a {report['file_mb']} MB video, "
+        f"{args.window_mb} MB per seek"
+    )
+    for name in ("ranged", "legacy"):
+        if name not in report:
+            continue
+        result = report[name]
+        latency = result["latency"]
+        print(
+            f"{name:<7} {result['seeks_per_second']} seeks/s  p50={latency['p50_ms']}ms "
+            f"p95={latency['p95_ms']}ms  {result['kb_per_seek']} KB/seek  {result['status_codes']}"
+        )
+    lookup = report["lookup"]
+    print(f"lookup  legacy={lookup['legacy_us']}us cached={lookup['cached_us']}us per request")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,162 @@
+"""Measure venture scoring latency for each model execution path.
+
+Usage (from the backend directory):
+
+    python -m app.bench.venture_scorer --iterations 500
+    python -m app.bench.venture_scorer --batch 200 --json
+
+Scores synthetic ventures (no database needed) through `VentureScorer` on
+up to three paths: the numpy tree-ensemble export of an XGBoost model, the
+compiled feature plan (numpy matrix straight into the model) and the
+DataFrame + full sklearn Pipeline path used for bundles the plan cannot
+compile. Reports single-venture p50/p95 latency, batch throughput and the
+largest probability difference from the DataFrame path. The estimator paths
+need the bundle unpickled in-process: run with
+VENTURE_SCORER_OUT_OF_PROCESS=false and no saved export to compare all three.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any
+
+from .chat_load import _summary
+
+
+def _ventures(count: int, seed: int) -> list[Any]:
+    from ..models import IndustryType, VentureStage
+
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            revenue=rng.choice([0.0, rng.uniform(0, 250_000)]),
+            funding_raised=rng.uniform(0, 500_000),
+            funding_goal=rng.uniform(10_000, 2_000_000),
+            team_size=rng.randint(1, 40),
+            customers=rng.randint(0, 5_000),
+            mrr=rng.uniform(0, 40_000),
+            monthly_burn_rate=rng.uniform(0, 60_000),
+            is_seeking_funding=rng.random() < 0.6,
+            industry=rng.choice(list(IndustryType)),
+            stage=rng.choice(list(VentureStage)),
+            created_at=now - timedelta(days=rng.randint(0, 3_000)),
+            tagline="Smart logistics" if rng.random() < 0.7 else None,
+            description="x" * rng.randint(0, 400),
+            problem_statement=None,
+            solution="Platform" if rng.random() < 0.5 else "",
+            target_market="SMEs",
+            business_model=None,
+            logo_url=None,
+            banner_url=None,
+            pitch_deck_url=None,
+            demo_video_url=None,
+        )
+        for _ in range(count)
+    ]
+
+
+def _time_path(scorer: Any, ventures: list[Any], iterations: int, batch: int) -> dict[str, Any]:
+    for venture in ventures[:5]:
+        scorer.score_venture(venture)
+
+    single: list[float] = []
+    for idx in range(iterations):
+        venture = ventures[idx % len(ventures)]
+        started = time.perf_counter()
+        scorer.score_venture(venture)
+        single.append(time.perf_counter() - started)
+
+    chunk = ventures[:batch]
+    started = time.perf_counter()
+    results = scorer.score_many(chunk)
+    elapsed = time.perf_counter() - started
+    return {
+        "single": _summary(single),
+        "batch": {
+            "size": len(chunk),
+            "seconds": round(elapsed, 4),
+            "ventures_per_second": round(len(chunk) / elapsed, 1) if elapsed > 0 else None,
+        },
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=300, help="single-venture calls per path")
+    parser.add_argument("--batch", type=int, default=200, help="ventures per score_many call")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON only")
+    args = parser.parse_args(argv)
+
+    from ..config import settings
+    from ..services.venture_scorer import venture_scorer
+
+    # Repeated ventures would otherwise be answered from the score cache.
+    settings.VENTURE_SCORER_CACHE_SIZE = 0
+    bundle = venture_scorer._load()
+    if bundle is None:
+        print(f"model bundle unavailable: {venture_scorer._load_error}")
+        return 1
+
+    ventures = _ventures(max(args.batch, 50), args.seed)
+    plan = bundle.plan
+    ensemble = bundle.ensemble
+    report: dict[str, Any] = {
+        "compiled_plan": bool(plan and plan.compiled),
+        "numpy_evaluator": ensemble is not None,
+        "estimator_in_process": bundle.estimator is not None,
+    }
+
+    timings: dict[str, dict[str, Any]] = {}
+    if ensemble is not None:
+        timings["numpy"] = _time_path(venture_scorer, ventures, args.iterations, args.batch)
+    if bundle.estimator is not None:
+        bundle.ensemble = None
+        try:
+            if report["compiled_plan"]:
+                timings["compiled"] = _time_path(venture_scorer, ventures, args.iterations, args.batch)
+            plan.compiled = False
+            timings["dataframe"] = _time_path(venture_scorer, ventures, args.iterations, args.batch)
+        finally:
+            plan.compiled = report["compiled_plan"]
+            bundle.ensemble = ensemble
+
+    for name, timing in timings.items():
+        report[name] = {key: value for key, value in timing.items() if key != "results"}
+    if "dataframe" in timings:
+        report["max_probability_diff"] = {
+            name: max(
+                abs(left["class_probabilities"].get(label, 0.0) - prob)
+                for left, right in zip(timing["results"], timings["dataframe"]["results"])
+                for label, prob in right["class_probabilities"].items()
+            )
+            for name, timing in timings.items()
+            if name != "dataframe"
+        }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    for name in ("dataframe", "compiled", "numpy"):
+        if name not in report:
+            continue
+        single, batch = report[name]["single"], report[name]["batch"]
+        print(
+            f"{name:<10} single p50={single['p50_ms']}ms p95={single['p95_ms']}ms | "
+            f"batch of {batch['size']} in {batch['seconds']}s ({batch['ventures_per_second']}/s)"
+        )
+    for name, diff in report.get("max_probability_diff", {}).items():
+        print(f"max probability difference {name} vs dataframe: {diff:.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
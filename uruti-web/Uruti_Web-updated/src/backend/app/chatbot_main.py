@@ -17,6 +17,7 @@ from .database import Base, engine
 from .routers import auth
 from .routers import chatbot as chatbot_router
 from .services.chatbot_engine import chatbot_engine
+from .services.runtime_status import runtime_status
 
 # Ensure chatbot service can run independently and create required tables.
 Base.metadata.create_all(bind=engine)
@@ -67,6 +68,17 @@ async def _warmup_chatbot_model() -> None:
     asyncio.create_task(asyncio.to_thread(chatbot_engine.warmup))
 
 
+@app.on_event("startup")
+async def _start_runtime_status() -> None:
+    # Refresh health probes and model info off the request path.
+    runtime_status.start()
+
+
+@app.on_event("shutdown")
+async def _stop_runtime_status() -> None:
+    await runtime_status.stop()
+
+
 if __name__ == "__main__":
     import uvicorn
 
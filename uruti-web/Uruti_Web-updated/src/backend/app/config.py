@@ -56,6 +56,23 @@ class Settings(BaseSettings):
     # File Upload
     UPLOAD_DIR: str = "uploads"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
+    MAX_PITCH_VIDEO_SIZE: int = 500 * 1024 * 1024  # 500MB
+    # Resumable uploads: chunk size suggested to clients, the most one PUT may
+    # carry, and how long an unfinished upload is kept.
+    UPLOAD_CHUNK_SIZE: int = 2 * 1024 * 1024
+    UPLOAD_MAX_CHUNK_BYTES: int = 16 * 1024 * 1024
+    UPLOAD_SESSION_TTL_HOURS: int = 24
+
+    # Content-addressed upload store (see app.services.blob_store): seconds
+    # between sweeps for unreferenced blobs (0 disables) and how long a blob
+    # may go unreferenced, e.g. an attachment not yet sent, before deletion.
+    UPLOAD_GC_INTERVAL_SECONDS: float = 3600.0
+    UPLOAD_GC_GRACE_HOURS: int = 48
+
+    # Resized WebP/JPEG variants of uploaded images (see
+    # app.services.image_variants): background workers and encoder quality.
+    IMAGE_VARIANT_WORKERS: int = 1
+    IMAGE_VARIANT_QUALITY: int = 80
     
     # Email (for future implementation)
     SMTP_HOST: Optional[str] = None
@@ -83,12 +100,79 @@ class Settings(BaseSettings):
     URUTI_CHATBOT_MAX_INPUT_CHARS: int = 1800
     URUTI_CHATBOT_RESPONSE_TIMEOUT_SECONDS: float = 45.0
     URUTI_CHATBOT_LOCAL_TIMEOUT_SECONDS: float = 20.0
+    # llama-cpp CPU tuning. Unset values fall back to the recommended config
+    # written by `python -m app.bench.chatbot`, then to llama-cpp defaults.
+    URUTI_CHATBOT_N_THREADS: Optional[int] = None
+    URUTI_CHATBOT_N_THREADS_BATCH: Optional[int] = None
+    URUTI_CHATBOT_N_BATCH: Optional[int] = None
+    URUTI_CHATBOT_N_UBATCH: Optional[int] = None
+    URUTI_CHATBOT_N_GPU_LAYERS: Optional[int] = None
+    URUTI_CHATBOT_USE_MMAP: Optional[bool] = None
+    URUTI_CHATBOT_USE_MLOCK: Optional[bool] = None
+    URUTI_CHATBOT_FLASH_ATTN: Optional[bool] = None
+    # KV-cache element types, e.g. "f16", "q8_0", "q4_0".
+    URUTI_CHATBOT_CACHE_TYPE_K: Optional[str] = None
+    URUTI_CHATBOT_CACHE_TYPE_V: Optional[str] = None
+    # Defaults to "Models/Uruti chatbot/llama_cpp_tuning.json" in the workspace.
+    URUTI_CHATBOT_TUNING_FILE: Optional[str] = None
+    # Fake chatbot/Gemini backends for load testing (see app.services.fake_llm).
+    # Never enable in production.
+    URUTI_FAKE_LLM: bool = False
+    URUTI_FAKE_LLM_FIRST_TOKEN_MS: float = 250.0
+    URUTI_FAKE_LLM_TOKENS_PER_SECOND: float = 12.0
+    URUTI_FAKE_LLM_FAILURE_RATE: float = 0.0
+    URUTI_FAKE_LLM_RESPONSE_TOKENS: int = 160
+    URUTI_FAKE_LLM_JITTER: float = 0.3
+    URUTI_FAKE_GEMINI_FIRST_TOKEN_MS: float = 500.0
+    URUTI_FAKE_GEMINI_TOKENS_PER_SECOND: float = 80.0
+    URUTI_FAKE_GEMINI_FAILURE_RATE: float = 0.0
     CHATBOT_SERVICE_URL: str = os.getenv("CHATBOT_SERVICE_URL", "http://127.0.0.1:8020")
     CHATBOT_HEALTH_PROBE_TIMEOUT_SECONDS: float = 5.0
+    # How often admin runtime-status probes and model info are refreshed in the background.
+    RUNTIME_STATUS_REFRESH_SECONDS: float = 30.0
+    # Where VentureScorer caches bundle probe verdicts (defaults to the system temp dir).
+    VENTURE_SCORER_PROBE_CACHE_PATH: Optional[str] = None
+    # Run the scoring model in separate worker processes so a native crash in
+    # numpy/sklearn/xgboost cannot take down the API.
+    VENTURE_SCORER_OUT_OF_PROCESS: bool = True
+    VENTURE_SCORER_WORKERS: int = 1
+    # Concurrent scoring requests arriving within this window share one batch.
+    VENTURE_SCORER_BATCH_WINDOW_MS: float = 5.0
+    VENTURE_SCORER_MAX_BATCH: int = 256
+    VENTURE_SCORER_WORKER_TIMEOUT_SECONDS: float = 30.0
+    # Score XGBoost bundles with a numpy export of their trees. The export is
+    # checked against the model once, saved in VENTURE_SCORER_EXPORT_DIR
+    # (defaults to the system temp dir) and later loads skip joblib entirely.
+    VENTURE_SCORER_NUMPY_EVALUATOR: bool = True
+    VENTURE_SCORER_EXPORT_DIR: Optional[str] = None
+    # Model results memoized by (model version, input feature fingerprint); 0 disables.
+    VENTURE_SCORER_CACHE_SIZE: int = 4096
     CORE_SERVICE_URL: str = os.getenv("CORE_SERVICE_URL", "http://173.249.25.80:1199")
     PITCH_COACH_MODEL_ID: Optional[str] = None
     PITCH_COACH_ENABLE_LOCAL_RL: bool = False
     PITCH_COACH_LOCAL_MODEL_DIR: Optional[str] = None
+    # Live pitch WebSocket: minimum seconds between model calls per session,
+    # concurrent model calls across all sessions, and transcript size cap.
+    PITCH_LIVE_MODEL_INTERVAL_SECONDS: float = 5.0
+    PITCH_LIVE_MAX_CONCURRENT_MODEL_CALLS: int = 4
+    PITCH_LIVE_MAX_TRANSCRIPT_CHARS: int = 50_000
+    # Pitch video transcoding (see app.services.pitch_video): concurrent
+    # ffmpeg jobs, threads per job, niceness added to ffmpeg and a hard
+    # per-job time limit.
+    PITCH_VIDEO_TRANSCODE_WORKERS: int = 1
+    PITCH_VIDEO_TRANSCODE_THREADS: int = 2
+    PITCH_VIDEO_TRANSCODE_NICE: int = 10
+    PITCH_VIDEO_TRANSCODE_PRESET: str = "veryfast"
+    PITCH_VIDEO_TRANSCODE_TIMEOUT_SECONDS: float = 1800.0
+    # Pitch session analysis (see app.services.pitch_analysis): concurrent
+    # jobs, niceness added to ffmpeg, seconds per timeline window, openai-whisper model used for the
+    # transcript and the time limit for each of audio extraction and
+    # transcription.
+    PITCH_ANALYSIS_WORKERS: int = 1
+    PITCH_ANALYSIS_NICE: int = 10
+    PITCH_ANALYSIS_WINDOW_SECONDS: float = 5.0
+    PITCH_ANALYSIS_WHISPER_MODEL: str = "base"
+    PITCH_ANALYSIS_TIMEOUT_SECONDS: float = 1800.0
     GEMINI_API_KEY: Optional[str] = None
     GEMINI_MODEL: str = "gemini-3-flash-preview"
     GEMINI_TIMEOUT_SECONDS: float = 12.0
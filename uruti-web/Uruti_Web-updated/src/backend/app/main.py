@@ -3,6 +3,8 @@ import warnings
 import asyncio
 import logging
 import base64
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 warnings.filterwarnings(
@@ -11,10 +13,9 @@ warnings.filterwarnings(
     category=FutureWarning,
 )
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, Response
-from pathlib import Path
+from fastapi.responses import Response
 from .config import settings
 from .database import engine, Base
 from .routers import (
@@ -34,8 +35,16 @@ from .routers import (
     chat,
     pitch_coach,
     pitch,
+    uploads,
 )
 from .services.pitch_coach_engine import pitch_coach_engine
+from .services.blob_store import blob_sha256, blob_store
+from .services.conversation_summaries import conversation_summary_rebuild
+from .services.image_variants import PENDING_CACHE_CONTROL, image_variants, is_variant_source
+from .services.media_files import media_resolver, media_response
+from .services.pitch_analysis import pitch_session_analyzer
+from .services.pitch_video import pitch_video_transcoder
+from .services.runtime_status import runtime_status
 from .services.venture_scorer import venture_scorer
 from .routers.messages import realtime_hub as message_realtime_hub
 from .routers.notifications import notification_hub as notification_realtime_hub
@@ -47,38 +56,6 @@ _TRANSPARENT_PNG = base64.b64decode(
 )
 
 
-def _candidate_upload_roots() -> list[Path]:
-    configured = Path(settings.UPLOAD_DIR)
-    if configured.is_absolute():
-        roots = [configured]
-    else:
-        app_file = Path(__file__).resolve()
-        roots = [
-            Path.cwd() / configured,
-            app_file.parents[1] / configured,  # .../src/backend/uploads
-            app_file.parents[3] / configured,  # .../Uruti_Web-updated/uploads
-            app_file.parents[4] / configured,  # .../uruti-platform/uploads
-        ]
-
-    seen: set[str] = set()
-    unique: list[Path] = []
-    for root in roots:
-        resolved = root.resolve()
-        key = str(resolved)
-        if key in seen:
-            continue
-        seen.add(key)
-        unique.append(resolved)
-    return unique
-
-
-def _resolve_upload_file(filename: str, *, subdir: str | None = None) -> Path | None:
-    for root in _candidate_upload_roots():
-        candidate = root / filename if subdir is None else root / subdir / filename
-        if candidate.exists():
-            return candidate
-    return None
-
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
@@ -104,6 +81,90 @@ def _migrate_venture_columns():
 
 _migrate_venture_columns()
 
+
+def _migrate_pitch_session_columns():
+    """Add the video_status, timeline and analysis columns to pitch_sessions
+    if missing."""
+    from sqlalchemy import text, inspect as sa_inspect
+    inspector = sa_inspect(engine)
+    existing = {c["name"] for c in inspector.get_columns("pitch_sessions")}
+    new_cols = {
+        "video_status": "VARCHAR",
+        "timeline": "BYTEA" if engine.dialect.name == "postgresql" else "BLOB",
+        "analysis": "JSON",
+    }
+    with engine.begin() as conn:
+        for col, col_type in new_cols.items():
+            if col not in existing:
+                conn.execute(text(f'ALTER TABLE pitch_sessions ADD COLUMN "{col}" {col_type}'))
+
+_migrate_pitch_session_columns()
+
+
+def _migrate_message_indexes():
+    """Create the composite messages indexes on existing databases and drop
+    the ones they replace."""
+    from sqlalchemy import text, inspect as sa_inspect
+    from .models import Message
+    existing = {index["name"] for index in sa_inspect(engine).get_indexes("messages")}
+    with engine.begin() as conn:
+        for name in ("ix_messages_sender_receiver_created", "ix_messages_receiver_sender_created"):
+            if name in existing:
+                conn.execute(text(f"DROP INDEX {name}"))
+    for index in Message.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+_migrate_message_indexes()
+
+
+_ATTACHMENT_MIGRATION = "message_attachment_names"
+# A claim older than this is taken to belong to a process that died.
+_DATA_MIGRATION_STALE = timedelta(hours=1)
+
+
+def _claim_data_migration(db, name: str) -> bool:
+    """Mark a one-off data migration as started by this process; False if it
+    is done or another process is running it."""
+    from sqlalchemy import update
+    from sqlalchemy.exc import IntegrityError
+    from .models import DataMigration
+    now = datetime.now(timezone.utc)
+    try:
+        db.add(DataMigration(name=name, started_at=now))
+        db.commit()
+        return True
+    except IntegrityError:
+        db.rollback()
+    claimed = db.execute(
+        update(DataMigration)
+        .where(
+            DataMigration.name == name,
+            DataMigration.completed_at.is_(None),
+            DataMigration.started_at < now - _DATA_MIGRATION_STALE,
+        )
+        .values(started_at=now)
+    ).rowcount
+    db.commit()
+    return bool(claimed)
+
+
+def _migrate_message_attachment_names() -> None:
+    """Move attachments sent with content-hash URLs to private blobs with
+    random names (see app.services.blob_store), once per database."""
+    from .database import SessionLocal
+    from .models import DataMigration
+    db = SessionLocal()
+    try:
+        if not _claim_data_migration(db, _ATTACHMENT_MIGRATION):
+            return
+        count = blob_store.privatize_message_attachments(db)
+        db.get(DataMigration, _ATTACHMENT_MIGRATION).completed_at = datetime.now(timezone.utc)
+        db.commit()
+        if count:
+            logger.info("moved attachments of %d messages to private names", count)
+    finally:
+        db.close()
+
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
@@ -146,24 +207,61 @@ def health_check():
 
 
 # Static file serving for uploaded images
-@app.get("/api/v1/profile/uploads/{filename}")
-async def get_uploaded_file(filename: str):
-    """Serve uploaded profile images"""
-    file_path = _resolve_upload_file(filename)
-    if file_path is None:
+@app.api_route("/api/v1/profile/uploads/{filename}", methods=["GET", "HEAD"])
+async def get_uploaded_file(
+    filename: str,
+    request: Request,
+    size: Optional[int] = Query(None, ge=1, le=4096),
+    image_format: Optional[str] = Query(None, alias="format"),
+):
+    """Serve uploaded profile images, venture media and pitch videos.
+
+    `size` (and optionally `format`) selects a resized variant of an image.
+    """
+    if size is not None:
+        variant = image_variants.lookup(filename, size, image_format, request.headers.get("accept"))
+        if variant is not None:
+            return media_response(
+                request,
+                variant.path,
+                variant.stat,
+                name=variant.name,
+                vary="Accept" if variant.negotiated else None,
+            )
+
+    found = media_resolver.resolve(filename)
+    if found is None:
         # Keep avatar/image widgets stable even when the referenced file is stale.
         return Response(content=_TRANSPARENT_PNG, media_type="image/png")
-    return FileResponse(file_path)
-
-
-@app.get("/api/v1/messages/uploads/{filename}")
-async def get_uploaded_message_file(filename: str):
-    """Serve uploaded message attachments"""
-    file_path = _resolve_upload_file(filename, subdir="messages")
-    if file_path is None:
-        from fastapi import HTTPException
+    if size is not None and is_variant_source(filename):
+        # Variants not rendered yet: serve the original briefly and render them.
+        image_variants.submit(blob_sha256(filename))
+        return media_response(request, *found, name=filename, cache_control=PENDING_CACHE_CONTROL)
+    return media_response(request, *found, name=filename)
+
+
+@app.api_route("/api/v1/messages/uploads/{filename}", methods=["GET", "HEAD"])
+def get_uploaded_message_file(filename: str, request: Request):
+    """Serve uploaded message attachments by their random names"""
+    from fastapi import HTTPException
+    from .database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        blob_name = blob_store.attachment_blob_name(db, filename)
+    finally:
+        db.close()
+    if blob_name is not None:
+        found = media_resolver.resolve(blob_name)
+    elif blob_sha256(filename) is not None:
+        # Never by content hash: that would reveal whether a file was sent.
+        found = None
+    else:
+        # Attachments stored before the blob store.
+        found = media_resolver.resolve(filename, subdir="messages")
+    if found is None:
         raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(file_path)
+    return media_response(request, *found, name=filename, private=True)
 
 
 # Include routers
@@ -183,6 +281,7 @@ app.include_router(profile.router, prefix=settings.API_V1_PREFIX)
 app.include_router(chat.router, prefix=settings.API_V1_PREFIX)
 app.include_router(pitch_coach.router, prefix=settings.API_V1_PREFIX)
 app.include_router(pitch.router, prefix=settings.API_V1_PREFIX)
+app.include_router(uploads.router, prefix=settings.API_V1_PREFIX)
 
 
 @app.on_event("startup")
@@ -205,6 +304,82 @@ async def _warmup_optional_models() -> None:
     asyncio.create_task(_ordered_warmup())
 
 
+@app.on_event("startup")
+async def _start_runtime_status() -> None:
+    # Refresh health probes and model info off the request path.
+    runtime_status.start()
+
+
+@app.on_event("shutdown")
+async def _stop_runtime_status() -> None:
+    await runtime_status.stop()
+
+
+@app.on_event("shutdown")
+async def _stop_scoring_workers() -> None:
+    await asyncio.to_thread(venture_scorer.close)
+
+
+@app.on_event("startup")
+async def _resume_pitch_video_jobs() -> None:
+    # Requeue transcodes interrupted by a restart.
+    job_ids = await asyncio.to_thread(pitch_video_transcoder.requeue_interrupted)
+    for job_id in job_ids:
+        pitch_video_transcoder.submit(job_id)
+    if job_ids:
+        logger.info("resumed %d pitch video transcode jobs", len(job_ids))
+
+
+@app.on_event("shutdown")
+async def _stop_pitch_video_jobs() -> None:
+    pitch_video_transcoder.close()
+
+
+@app.on_event("startup")
+async def _resume_pitch_analysis_jobs() -> None:
+    # Requeue session analyses interrupted by a restart.
+    job_ids = await asyncio.to_thread(pitch_session_analyzer.requeue_interrupted)
+    for job_id in job_ids:
+        pitch_session_analyzer.submit(job_id)
+    if job_ids:
+        logger.info("resumed %d pitch analysis jobs", len(job_ids))
+
+
+@app.on_event("shutdown")
+async def _stop_pitch_analysis_jobs() -> None:
+    pitch_session_analyzer.close()
+
+
+@app.on_event("startup")
+async def _backfill_conversation_summaries() -> None:
+    # Fill conversation_summaries from messages on the first start after it
+    # was added; afterwards the message endpoints keep it current.
+    # Held on app.state: the event loop only keeps weak references to tasks.
+    app.state.summary_backfill = asyncio.create_task(asyncio.to_thread(conversation_summary_rebuild.backfill_if_empty))
+
+
+@app.on_event("startup")
+async def _migrate_attachment_names() -> None:
+    # Runs once per database; held on app.state like the summary backfill.
+    app.state.attachment_migration = asyncio.create_task(asyncio.to_thread(_migrate_message_attachment_names))
+
+
+@app.on_event("startup")
+async def _start_upload_sweep() -> None:
+    # Reconcile upload reference counts and delete unreferenced blobs.
+    blob_store.start()
+
+
+@app.on_event("shutdown")
+async def _stop_upload_sweep() -> None:
+    await blob_store.stop()
+
+
+@app.on_event("shutdown")
+async def _stop_image_variants() -> None:
+    image_variants.close()
+
+
 @app.on_event("startup")
 async def _init_realtime_hubs() -> None:
     """Attempt to connect both realtime hubs to Redis for cross-worker broadcast."""
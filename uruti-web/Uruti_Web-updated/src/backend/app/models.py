@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Enum, Float, Table, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Text, ForeignKey, JSON, Enum, Float, Index, LargeBinary, Table, UniqueConstraint
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import enum
 from .database import Base
@@ -205,6 +205,29 @@ class Venture(Base):
     pitch_sessions = relationship("PitchSession", back_populates="venture", cascade="all, delete-orphan")
 
 
+class VentureRescoreJob(Base):
+    """Admin-triggered bulk rescore of all ventures, resumable by venture id."""
+    __tablename__ = "venture_rescore_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, nullable=False, default="pending")  # pending, running, completed, failed, cancelled
+    chunk_size = Column(Integer, nullable=False, default=200)
+
+    # Progress (ventures are processed in ascending id order)
+    total = Column(Integer, default=0)
+    processed = Column(Integer, default=0)
+    last_venture_id = Column(Integer, default=0)
+    model_name = Column(String, nullable=True)
+    error = Column(Text, nullable=True)
+
+    started_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
 class Message(Base):
     """Message/Inbox model for user communication"""
     __tablename__ = "messages"
@@ -235,6 +258,37 @@ class Message(Base):
     sender = relationship("User", foreign_keys=[sender_id], back_populates="messages_sent")
     receiver = relationship("User", foreign_keys=[receiver_id], back_populates="messages_received")
 
+    # Keyset pages on (created_at, id): threads (each direction is a
+    # sender/receiver pair), the inbox and sent messages. Conversation
+    # summaries are computed from the pair and inbox indexes.
+    __table_args__ = (
+        Index("ix_messages_pair_created_id", "sender_id", "receiver_id", "created_at", "id"),
+        Index("ix_messages_receiver_created_id", "receiver_id", "created_at", "id"),
+        Index("ix_messages_sender_created_id", "sender_id", "created_at", "id"),
+    )
+
+
+class ConversationSummary(Base):
+    """One side of a direct conversation: its latest message and the unread
+    count, maintained on write (see app.services.conversation_summaries)."""
+    __tablename__ = "conversation_summaries"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    peer_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    last_message_id = Column(Integer, nullable=True)
+    last_message_at = Column(DateTime(timezone=True), nullable=True)
+    preview = Column(Text, nullable=True)
+    unread_count = Column(Integer, nullable=False, default=0)
+
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # The conversation list is one range scan per user, newest first.
+    __table_args__ = (
+        Index("ix_conversation_summaries_user_last", "user_id", "last_message_at"),
+    )
+
 
 class SupportMessage(Base):
     """Support chat messages from public visitors to admin support inbox"""
@@ -277,6 +331,53 @@ class Notification(Base):
     user = relationship("User", back_populates="notifications")
 
 
+class UploadSession(Base):
+    """Resumable chunked upload in progress (see app.services.chunked_uploads)."""
+    __tablename__ = "upload_sessions"
+
+    id = Column(String, primary_key=True)  # random token, also names the partial file
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    purpose = Column(String, nullable=False)  # pitch_video, message_attachment
+    file_name = Column(String, nullable=False)
+    content_type = Column(String, nullable=True)
+    total_size = Column(BigInteger, nullable=False)
+    received_bytes = Column(BigInteger, default=0)
+    sha256 = Column(String, nullable=True)  # set when the upload completes
+    meta = Column(JSON, nullable=True)  # purpose-specific fields, e.g. venture_id
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class MediaBlob(Base):
+    """Uploaded file stored by content hash (see app.services.blob_store)."""
+    __tablename__ = "media_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(BigInteger, nullable=False)
+    content_type = Column(String, nullable=True)  # as sent by the first uploader
+    ref_count = Column(Integer, nullable=False, default=0)  # rows whose URLs point at the blob
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_referenced_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class MessageAttachmentFile(Base):
+    """Random per-upload name of a message attachment and the blob it serves."""
+    __tablename__ = "message_attachment_files"
+
+    name = Column(String(48), primary_key=True)  # uuid4 hex plus extension, used in URLs
+    blob_key = Column(String(64), nullable=False, index=True)  # MediaBlob.sha256 (a keyed digest)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class DataMigration(Base):
+    """One-off data migration run at startup; the row marks it claimed or done."""
+    __tablename__ = "data_migrations"
+
+    name = Column(String(64), primary_key=True)
+    started_at = Column(DateTime(timezone=True), nullable=False)  # when the current run claimed it
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+
 class PushDeviceToken(Base):
     """Stores device push token for each authenticated user/device."""
     __tablename__ = "push_device_tokens"
@@ -444,6 +545,15 @@ class PitchSession(Base):
     
     # Duration
     duration_seconds = Column(Integer, nullable=True)
+
+    # Video processing: "processing" while the upload is transcoded to MP4,
+    # then "ready". NULL for sessions created before transcoding jobs.
+    video_status = Column(String, nullable=True)
+
+    # Offline analysis (see app.services.pitch_analysis): float32 rows of
+    # timeline["columns"], one per window, and what produced them.
+    timeline = deferred(Column(LargeBinary, nullable=True))
+    analysis = Column(JSON, nullable=True)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -452,6 +562,42 @@ class PitchSession(Base):
     venture = relationship("Venture", back_populates="pitch_sessions")
 
 
+class PitchVideoJob(Base):
+    """Background transcode of an uploaded pitch video to MP4."""
+    __tablename__ = "pitch_video_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, ForeignKey("pitch_sessions.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(String, nullable=False, default="queued")  # queued, running, completed, failed
+
+    source_path = Column(String, nullable=False)
+    output_filename = Column(String, nullable=True)
+    progress = Column(Float, default=0.0)
+    error = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class PitchAnalysisJob(Base):
+    """Background audio, transcript and reward-model timeline of a pitch session."""
+    __tablename__ = "pitch_analysis_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, ForeignKey("pitch_sessions.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(String, nullable=False, default="queued")  # queued, running, completed, failed
+
+    progress = Column(Float, default=0.0)
+    error = Column(Text, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
 class Connection(Base):
     """Connection model for user-to-user connections/relationships"""
     __tablename__ = "connections"
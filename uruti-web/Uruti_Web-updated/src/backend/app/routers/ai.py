@@ -20,6 +20,7 @@ from ..config import settings
 from ..services.venture_scorer import venture_scorer
 from ..services.pitch_coach_engine import pitch_coach_engine
 from ..services.venture_context import build_venture_context
+from ..services.runtime_status import runtime_status
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 
@@ -76,12 +77,17 @@ def _probe_chatbot_service(base_url: str) -> dict:
         }
 
 
+runtime_status.register(
+    "chatbot_service",
+    lambda: _probe_chatbot_service(settings.CHATBOT_SERVICE_URL),
+)
+runtime_status.register("analysis_engine", venture_scorer.get_model_info)
+
+
 def _available_models() -> list[dict]:
-    try:
-        model_info = venture_scorer.get_model_info()
-        analysis_name = str(model_info.get("model_folder") or model_info.get("model_name") or "Uruti-Investor_Intelligence_and_Ranker")
-    except Exception:
-        analysis_name = "Uruti-Investor_Intelligence_and_Ranker"
+    # Only the display name comes from model info, so never block on a probe here.
+    model_info = runtime_status.peek("analysis_engine") or {}
+    analysis_name = str(model_info.get("model_folder") or model_info.get("model_name") or "Uruti-Investor_Intelligence_and_Ranker")
 
     models = [
         {
@@ -480,7 +486,7 @@ async def chat(
         if not venture:
             raise HTTPException(status_code=404, detail="Venture not found")
 
-        analysis = venture_scorer.score_venture(venture)
+        analysis = await venture_scorer.score_venture_async(venture)
         score = float(analysis.get("uruti_score") or 0.0)
         predicted_class = str(analysis.get("predicted_class") or "unknown")
 
@@ -561,8 +567,8 @@ async def get_admin_runtime_status(
     if role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
 
-    chatbot_service = await asyncio.to_thread(_probe_chatbot_service, settings.CHATBOT_SERVICE_URL)
-    analysis_info = venture_scorer.get_model_info()
+    chatbot_service = await runtime_status.get_async("chatbot_service")
+    analysis_info = await runtime_status.get_async("analysis_engine")
     pitch_info = pitch_coach_engine.status()
 
     gemini_key_present = bool((settings.GEMINI_API_KEY or "").strip())
@@ -610,6 +616,8 @@ async def get_admin_runtime_status(
             "status": "healthy",
         },
         "chatbot_service": chatbot_service,
+        # Age of the background-refreshed probe results above.
+        "status_cache": runtime_status.snapshot_meta(),
     }
 
 
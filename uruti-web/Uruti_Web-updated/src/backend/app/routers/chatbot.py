@@ -7,7 +7,7 @@ import json
 import time
 import urllib.request
 import uuid
-from typing import List
+from typing import Callable, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
@@ -24,6 +24,8 @@ from ..schemas import (
     AiChatSessionTitleUpdate,
 )
 from ..services.chatbot_engine import chatbot_engine
+from ..services.fake_llm import FakeGemini, FakeLatencyProfile
+from ..services.runtime_status import runtime_status
 from ..services.venture_context import build_venture_context
 
 router = APIRouter(prefix="/ai", tags=["uruti-ai-modules"])
@@ -34,6 +36,23 @@ _CHATBOT_INFERENCE_SEMAPHORE = asyncio.Semaphore(1)
 _CHATBOT_QUEUE_TIMEOUT_SECONDS = 2.0
 _GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta/models"
 
+# Optional replacement for the Gemini call, used by load tests.
+_GeminiBackend = Callable[[str, Optional[dict], List[dict]], Tuple[Optional[str], Optional[str]]]
+_gemini_backend: _GeminiBackend | None = (
+    FakeGemini(FakeLatencyProfile.from_settings("gemini")) if settings.URUTI_FAKE_LLM else None
+)
+
+
+def set_gemini_backend(backend: _GeminiBackend | None) -> None:
+    """Route Gemini calls through `backend` instead of the real API (None restores it)."""
+    global _gemini_backend
+    _gemini_backend = backend
+
+
+def _gemini_configured() -> bool:
+    return _gemini_backend is not None or bool((settings.GEMINI_API_KEY or "").strip())
+
+
 _SYSTEM_PROMPT = (
     "You are the Uruti AI Advisor - an expert startup advisor specialised in "
     "early-stage companies in Rwanda and Sub-Saharan Africa. You help founders "
@@ -104,6 +123,10 @@ def _probe_health(base_url: str) -> dict:
         }
 
 
+runtime_status.register("core_service", lambda: _probe_health(settings.CORE_SERVICE_URL))
+runtime_status.register("chatbot_service", lambda: _probe_health(settings.CHATBOT_SERVICE_URL))
+
+
 def _fallback_response(user_text: str, context: dict | None, history: list[dict]) -> str:
     lower = user_text.lower()
     name = context.get("name", "your startup") if context else "your startup"
@@ -180,6 +203,9 @@ def _extract_gemini_text(payload: dict) -> str:
 
 
 def _gemini_response(user_text: str, context: dict | None, history: list[dict]) -> tuple[str | None, str | None]:
+    if _gemini_backend is not None:
+        return _gemini_backend(user_text, context, history)
+
     api_key = (settings.GEMINI_API_KEY or "").strip()
     if not api_key:
         return None, "GEMINI_API_KEY not configured"
@@ -226,16 +252,15 @@ def _gemini_response(user_text: str, context: dict | None, history: list[dict])
         return None, str(exc)
 
 
-@router.get("/models")
-async def get_chatbot_models(
-    current_user: User = Depends(get_current_user),
-):
+def _ensure_chat_role(current_user: User) -> None:
     role = current_user.role.value if hasattr(current_user.role, "value") else str(current_user.role)
     if role not in {"founder", "investor", "admin"}:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
+
+def _chatbot_models() -> list[dict]:
     chatbot_status = chatbot_engine.status()
-    gemini_available = bool((settings.GEMINI_API_KEY or "").strip())
+    gemini_available = _gemini_configured()
     chatbot_available = bool(chatbot_status.get("loaded"))
     chatbot_initializing = bool(chatbot_status.get("startup_init_started")) and not bool(chatbot_status.get("startup_init_completed"))
 
@@ -267,14 +292,30 @@ async def get_chatbot_models(
     ]
 
 
+# Availability changes when the local model finishes loading, so refresh
+# this one more often than the HTTP health probes.
+runtime_status.register("chatbot_models", _chatbot_models, interval=5.0)
+
+
+@router.get("/models")
+async def get_chatbot_models(
+    current_user: User = Depends(get_current_user),
+):
+    _ensure_chat_role(current_user)
+    return await runtime_status.get_async("chatbot_models") or []
+
+
 @router.post("/chat", response_model=AiChatResponse)
 async def chat(
     payload: AiChatRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    _ensure_chat_role(current_user)
     session_id = payload.session_id or str(uuid.uuid4())
-    available_models = await get_chatbot_models(current_user)
+    # Availability comes from the background-refreshed snapshot; nothing is
+    # probed per message.
+    available_models = await runtime_status.get_async("chatbot_models") or []
     available_ids = {m["id"] for m in available_models}
     model_map = {m["id"]: m for m in available_models}
     model = payload.model if payload.model in available_ids else GEMINI_MODEL_ID
@@ -372,7 +413,10 @@ async def chat(
         attachment_name=payload.file_name,
     )
     db.add(user_msg)
-    db.flush()
+    # Commit before inference so no transaction or pooled connection is held
+    # while the model (or Gemini) is generating.
+    user_id = current_user.id
+    db.commit()
 
     fallback_used = False
     inference_backend = "unknown"
@@ -458,7 +502,7 @@ async def chat(
         ai_text = "I'm sorry, I couldn't generate a response. Please try again."
 
     ai_msg = AiChatMessage(
-        user_id=current_user.id,
+        user_id=user_id,
         session_id=session_id,
         role="assistant",
         content=ai_text,
@@ -619,8 +663,8 @@ async def get_chatbot_runtime_status(
     if role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
 
-    core_service = _probe_health(settings.CORE_SERVICE_URL)
-    chatbot_service = _probe_health(settings.CHATBOT_SERVICE_URL)
+    core_service = await runtime_status.get_async("core_service")
+    chatbot_service = await runtime_status.get_async("chatbot_service")
 
     return {
         "chatbot_model_id": CHATBOT_MODEL_ID,
@@ -633,4 +677,5 @@ async def get_chatbot_runtime_status(
             **core_service,
         },
         "chatbot_service": chatbot_service,
+        "status_cache": runtime_status.snapshot_meta(),
     }
@@ -8,6 +8,7 @@ from ..models import User, Connection, ConnectionRequest, NotificationType
 from ..schemas import ConnectionResponse, ConnectionRequestCreate, ConnectionRequestResponse
 from ..auth import get_current_active_user
 from .notifications import create_notification, publish_notification
+from ..services.image_variants import THUMBNAIL_SIZE, variant_url
 
 router = APIRouter(prefix="/connections", tags=["Connections"])
 
@@ -32,6 +33,7 @@ def _serialize_request_with_user(request: ConnectionRequest, current_user_id: in
             "email": counterpart.email if counterpart else None,
             "role": (counterpart.role.value if hasattr(counterpart.role, "value") else counterpart.role) if counterpart else None,
             "avatar_url": counterpart.avatar_url if counterpart else None,
+            "avatar_thumbnail_url": variant_url(counterpart.avatar_url, THUMBNAIL_SIZE) if counterpart else None,
             "bio": counterpart.bio if counterpart else None,
             "company": counterpart.company if counterpart else None,
             "location": counterpart.location if counterpart else None,
@@ -322,6 +324,7 @@ def get_connections(
                 "role": other_user.role,
                 "avatar": other_user.avatar_url,  # Use avatar_url from model
                 "avatar_url": other_user.avatar_url,  # Include both for compatibility
+                "avatar_thumbnail_url": variant_url(other_user.avatar_url, THUMBNAIL_SIZE),
                 "bio": other_user.bio,
                 "company": other_user.company,
                 "location": other_user.location,
@@ -1,8 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, WebSocket, WebSocketDisconnect, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, WebSocket, WebSocketDisconnect, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, desc
+from sqlalchemy import case, func, or_, select, tuple_, union_all
 from typing import List, Dict, Set, Any, Optional
-from pathlib import Path
 import uuid
 import asyncio
 import json
@@ -11,9 +10,15 @@ from jose import JWTError, jwt
 from ..database import get_db
 from ..config import settings
 from ..database import SessionLocal
-from ..models import User, Message, NotificationType, Connection, Notification
+from ..models import User, UserRole, Message, NotificationType, Connection, Notification, ConversationSummary
 from ..schemas import MessageCreate, MessageResponse
 from ..auth import get_current_active_user
+from ..services.blob_store import StoredBlob, blob_store, safe_extension
+from ..services.image_variants import THUMBNAIL_SIZE, variant_url
+from ..services.chunked_uploads import UploadRejected
+from ..services import conversation_summaries
+from ..services.conversation_summaries import conversation_summary_rebuild
+from ..services.cursors import decode_cursor
 from .notifications import (
     create_notification,
     publish_notification,
@@ -212,6 +217,7 @@ def _to_message_payload(message: Message, sender: Optional[User] = None) -> Dict
         "sender_name": sender_name,
         "sender_full_name": sender_full_name,
         "sender_avatar_url": sender_avatar_url,
+        "sender_avatar_thumbnail_url": variant_url(sender_avatar_url, THUMBNAIL_SIZE),
     }
 
 
@@ -302,6 +308,9 @@ async def send_message(
     )
     
     db.add(db_message)
+    db.flush()
+    db.refresh(db_message)
+    conversation_summaries.record_message(db, db_message)
     db.commit()
     db.refresh(db_message)
     
@@ -481,42 +490,41 @@ def consume_pending_call_events(
     return pending
 
 
+def _connection_peers(user_id: int):
+    """Subquery of the user IDs connected to `user_id`."""
+    return select(
+        case((Connection.user1_id == user_id, Connection.user2_id), else_=Connection.user1_id)
+    ).where(or_(Connection.user1_id == user_id, Connection.user2_id == user_id))
+
+
+def _conversation_rows(db: Session, user_id: int) -> List[Any]:
+    """(peer User, last message preview, last message time, unread count) for
+    every connection with at least one message, newest first, from the
+    conversation summaries."""
+    return db.execute(
+        select(
+            User,
+            ConversationSummary.preview,
+            ConversationSummary.last_message_at,
+            ConversationSummary.unread_count,
+        )
+        .join(User, User.id == ConversationSummary.peer_id)
+        .where(
+            ConversationSummary.user_id == user_id,
+            ConversationSummary.peer_id.in_(_connection_peers(user_id)),
+        )
+        .order_by(ConversationSummary.last_message_at.desc(), ConversationSummary.last_message_id.desc())
+    ).all()
+
+
 @router.get("/conversations", status_code=status.HTTP_200_OK)
 def get_conversations(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    connection_ids = _get_connection_user_ids(current_user.id, db)
-    if not connection_ids:
-        return []
-
-    users = db.query(User).filter(User.id.in_(connection_ids)).all()
-    users_by_id = {user.id: user for user in users}
+    # Only established conversations (threads with at least one message).
     conversations: List[Dict[str, Any]] = []
-
-    for other_user_id in connection_ids:
-        other_user = users_by_id.get(other_user_id)
-        if other_user is None:
-            continue
-
-        last_message = db.query(Message).filter(
-            or_(
-                (Message.sender_id == current_user.id) & (Message.receiver_id == other_user_id),
-                (Message.sender_id == other_user_id) & (Message.receiver_id == current_user.id),
-            )
-        ).order_by(desc(Message.created_at)).first()
-
-        # Only show established conversations (threads with at least one message).
-        if last_message is None:
-            continue
-
-        unread_count = db.query(Message).filter(
-            Message.sender_id == other_user_id,
-            Message.receiver_id == current_user.id,
-            Message.is_read == False,
-            Message.is_archived == False,
-        ).count()
-
+    for other_user, body, created_at, unread_count in _conversation_rows(db, current_user.id):
         is_online = bool(
             other_user.is_active and
             other_user.last_login and
@@ -530,98 +538,178 @@ def get_conversations(
                 "display_name": other_user.display_name,
                 "role": other_user.role.value if hasattr(other_user.role, "value") else str(other_user.role),
                 "avatar_url": other_user.avatar_url,
+                "avatar_thumbnail_url": variant_url(other_user.avatar_url, THUMBNAIL_SIZE),
                 "phone": other_user.phone,
                 "is_online": is_online,
             },
-            "last_message": (last_message.body if last_message else "") or "",
-            "last_message_time": last_message.created_at.isoformat() if last_message and last_message.created_at else "",
-            "unread_count": unread_count,
+            "last_message": body or "",
+            "last_message_time": created_at.isoformat() if created_at else "",
+            "unread_count": int(unread_count or 0),
             "is_starred": False,
         })
 
-    conversations.sort(key=lambda item: item.get("last_message_time") or "", reverse=True)
     return conversations
 
 
+def _cursor_key(token: str):
+    """The (created_at, id) a cursor points at, for row comparisons. The
+    stored created_at is used while the message exists, so the comparison
+    sees exactly the value in the index."""
+    try:
+        created_at, message_id = decode_cursor(token)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    stored = select(Message.created_at).where(Message.id == message_id).scalar_subquery()
+    return tuple_(func.coalesce(stored, created_at), message_id)
+
+
+def _message_page(
+    db: Session,
+    branches: List[List[Any]],
+    *,
+    before: Optional[str],
+    after: Optional[str],
+    skip: int,
+    limit: int,
+) -> tuple[List[Message], bool]:
+    """One page of messages matching any of `branches` (lists of filters),
+    by (created_at, id): the newest ones, those before a cursor, or the
+    oldest ones after it. Returns (messages, newest_first).
+
+    Each branch is read backwards (or forwards) along its own index and
+    limited before they are merged, so the cost depends on the page size,
+    not on the number of messages or the depth of the page.
+    """
+    if before and after:
+        raise HTTPException(status_code=400, detail="Use either before or after, not both")
+    key = tuple_(Message.created_at, Message.id)
+    newest_first = not after
+    if after:
+        filters, order = [key > _cursor_key(after)], (Message.created_at.asc(), Message.id.asc())
+    else:
+        filters = [key < _cursor_key(before)] if before else []
+        order = (Message.created_at.desc(), Message.id.desc())
+
+    parts = [
+        select(Message.id).where(*branch, *filters).order_by(*order).limit(skip + limit).subquery()
+        for branch in branches
+    ]
+    ids = [select(part.c.id) for part in parts]
+    candidates = ids[0] if len(ids) == 1 else union_all(*ids)
+    messages = (
+        db.query(Message)
+        .filter(Message.id.in_(candidates))
+        .order_by(*order)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    return messages, newest_first
+
+
+_PAGE_HELP = {
+    "before": "Cursor of a listed message; returns the messages just before it (older)",
+    "after": "Cursor of a listed message; returns the messages just after it (newer)",
+    "skip": "Deprecated offset; use the cursors",
+}
+
+
 @router.get("/thread/{other_user_id}", response_model=List[MessageResponse])
 def get_thread_messages(
     other_user_id: int,
-    skip: int = 0,
-    limit: int = 200,
+    before: Optional[str] = Query(None, description=_PAGE_HELP["before"]),
+    after: Optional[str] = Query(None, description=_PAGE_HELP["after"]),
+    skip: int = Query(0, ge=0, description=_PAGE_HELP["skip"]),
+    limit: int = Query(200, ge=1, le=500),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    messages = db.query(Message).filter(
-        or_(
-            (Message.sender_id == current_user.id) & (Message.receiver_id == other_user_id),
-            (Message.sender_id == other_user_id) & (Message.receiver_id == current_user.id),
-        )
-    ).order_by(Message.created_at.asc()).offset(skip).limit(limit).all()
-    return messages
+    """A page of a direct thread, oldest first: the newest `limit` messages
+    by default, then older pages with `before` the first message's cursor,
+    or new messages with `after` the last one's."""
+    branches = [[Message.sender_id == current_user.id, Message.receiver_id == other_user_id]]
+    if other_user_id != current_user.id:
+        branches.append([Message.sender_id == other_user_id, Message.receiver_id == current_user.id])
+    messages, newest_first = _message_page(db, branches, before=before, after=after, skip=skip, limit=limit)
+    return messages[::-1] if newest_first else messages
 
 
 @router.get("/inbox", response_model=List[MessageResponse])
 def get_inbox(
-    skip: int = 0,
-    limit: int = 100,
+    before: Optional[str] = Query(None, description=_PAGE_HELP["before"]),
+    after: Optional[str] = Query(None, description=_PAGE_HELP["after"]),
+    skip: int = Query(0, ge=0, description=_PAGE_HELP["skip"]),
+    limit: int = Query(100, ge=1, le=500),
     is_read: bool = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get received messages (inbox)"""
-    
-    query = db.query(Message).filter(
-        Message.receiver_id == current_user.id,
-        Message.is_archived == False
-    )
+    """Get received messages (inbox), newest first; page with `before` the
+    last message's cursor"""
     
+    branch = [Message.receiver_id == current_user.id, Message.is_archived == False]
     if is_read is not None:
-        query = query.filter(Message.is_read == is_read)
-    
-    messages = query.order_by(desc(Message.created_at)).offset(skip).limit(limit).all()
+        branch.append(Message.is_read == is_read)
     
-    return messages
+    messages, newest_first = _message_page(db, [branch], before=before, after=after, skip=skip, limit=limit)
+    return messages if newest_first else messages[::-1]
 
 
 @router.get("/sent", response_model=List[MessageResponse])
 def get_sent_messages(
-    skip: int = 0,
-    limit: int = 100,
+    before: Optional[str] = Query(None, description=_PAGE_HELP["before"]),
+    after: Optional[str] = Query(None, description=_PAGE_HELP["after"]),
+    skip: int = Query(0, ge=0, description=_PAGE_HELP["skip"]),
+    limit: int = Query(100, ge=1, le=500),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get sent messages"""
+    """Get sent messages, newest first; page with `before` the last
+    message's cursor"""
     
-    messages = db.query(Message).filter(
-        Message.sender_id == current_user.id
-    ).order_by(desc(Message.created_at)).offset(skip).limit(limit).all()
-    
-    return messages
+    branch = [Message.sender_id == current_user.id]
+    messages, newest_first = _message_page(db, [branch], before=before, after=after, skip=skip, limit=limit)
+    return messages if newest_first else messages[::-1]
+
+
+def message_attachment_payload(
+    db: Session, file_name: Optional[str], stored: StoredBlob, content_type: Optional[str]
+) -> Dict[str, Any]:
+    """Name a private blob stored for an attachment and describe it."""
+    name = blob_store.name_attachment(db, stored)
+    return {
+        "file_name": file_name or name,
+        "url": f"/api/v1/messages/uploads/{name}",
+        "content_type": content_type,
+        "size": stored.size,
+    }
 
 
 @router.post("/attachments/upload")
 async def upload_message_attachment(
     file: UploadFile = File(...),
+    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Upload chat attachment and return downloadable URL."""
+    """Upload chat attachment and return downloadable URL.
 
-    uploads_dir = Path("uploads") / "messages"
-    uploads_dir.mkdir(parents=True, exist_ok=True)
+    Limited to MAX_UPLOAD_SIZE; the resumable protocol under /uploads
+    accepts the same files in chunks.
+    """
 
-    ext = Path(file.filename or "").suffix
-    stored_name = f"{current_user.id}_{uuid.uuid4().hex}{ext}"
-    target_path = uploads_dir / stored_name
-
-    content = await file.read()
-    target_path.write_bytes(content)
+    try:
+        stored = await blob_store.store_upload(
+            db,
+            file.file,
+            extension=safe_extension(file.filename),
+            content_type=file.content_type,
+            max_size=settings.MAX_UPLOAD_SIZE,
+            private=True,
+        )
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
 
-    return {
-        "file_name": file.filename or stored_name,
-        "url": f"/api/v1/messages/uploads/{stored_name}",
-        "content_type": file.content_type,
-        "size": len(content),
-    }
+    return message_attachment_payload(db, file.filename, stored, file.content_type)
 
 
 @router.put("/read/thread/{other_user_id}")
@@ -643,6 +731,7 @@ def mark_thread_as_read(
     for message in unread_messages:
         message.is_read = True
         message.read_at = now
+    conversation_summaries.clear_unread(db, current_user.id, other_user_id)
 
     db.commit()
 
@@ -667,6 +756,7 @@ def get_message(
     
     # Mark as read if user is receiver
     if message.receiver_id == current_user.id and not message.is_read:
+        conversation_summaries.mark_read(db, message)
         message.is_read = True
         message.read_at = datetime.utcnow()
         db.commit()
@@ -691,6 +781,7 @@ def mark_as_read(
     if message.receiver_id != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
     
+    conversation_summaries.mark_read(db, message)
     message.is_read = True
     message.read_at = datetime.utcnow()
     
@@ -716,6 +807,7 @@ def archive_message(
     if message.receiver_id != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
     
+    conversation_summaries.mark_read(db, message)
     message.is_archived = True
     
     db.commit()
@@ -741,6 +833,8 @@ def delete_message(
         raise HTTPException(status_code=403, detail="Access denied")
     
     db.delete(message)
+    db.flush()
+    conversation_summaries.refresh_pair(db, message.sender_id, message.receiver_id)
     db.commit()
     
     return None
@@ -763,11 +857,47 @@ def delete_thread(
             (Message.sender_id == other_user_id) & (Message.receiver_id == current_user.id),
         )
     ).delete(synchronize_session=False)
+    conversation_summaries.remove_pair(db, current_user.id, other_user_id)
 
     db.commit()
     return None
 
 
+def _ensure_admin(current_user: User) -> None:
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+
+@router.post("/admin/summaries/rebuild")
+def rebuild_conversation_summaries(
+    background_tasks: BackgroundTasks,
+    chunk_size: int = Query(500, ge=1, le=10000),
+    after_user_id: int = Query(0, ge=0, description="Resume after this user id (see last_user_id)"),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Recompute conversation summaries from messages in the background (admin only)."""
+
+    _ensure_admin(current_user)
+
+    try:
+        state = conversation_summary_rebuild.start(chunk_size=chunk_size, after_user_id=after_user_id)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+    background_tasks.add_task(conversation_summary_rebuild.run)
+    return state
+
+
+@router.get("/admin/summaries/rebuild")
+def get_conversation_summary_rebuild(
+    current_user: User = Depends(get_current_active_user),
+):
+    """Progress of the last conversation summary rebuild in this worker (admin only)."""
+
+    _ensure_admin(current_user)
+    return conversation_summary_rebuild.describe()
+
+
 @router.get("/unread/count")
 def get_unread_count(
     db: Session = Depends(get_db),
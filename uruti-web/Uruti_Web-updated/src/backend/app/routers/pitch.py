@@ -1,17 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import timezone
+import asyncio
+import logging
+import time
+from jose import JWTError, jwt
 
 from ..auth import get_current_active_user
-from ..database import get_db
-from ..models import User, Venture, PitchSession
+from ..config import settings
+from ..database import get_db, SessionLocal
+from ..models import User, Venture, PitchSession, PitchAnalysisJob
+from ..services.pitch_analysis import decode_timeline, pitch_session_analyzer
 from ..services.pitch_coach_engine import pitch_coach_engine
 
 
 router = APIRouter(prefix="/pitch", tags=["Pitch"])
 
+logger = logging.getLogger(__name__)
+
 
 def _best_pitch_video_for_venture(db: Session, venture_id: int) -> str | None:
     best_session = (
@@ -66,6 +74,23 @@ def _derive_live_metrics(
     }
 
 
+def _live_context_text(
+    *,
+    transcript: str,
+    pitch_type: str,
+    duration_seconds: int,
+    target_duration_seconds: int,
+    current_slide: int,
+    total_slides: int,
+    transitions_count: int,
+) -> str:
+    return (
+        transcript
+        or f"{pitch_type}. duration={duration_seconds}s target={target_duration_seconds}s "
+           f"slide={current_slide}/{max(total_slides, 1)} transitions={transitions_count}"
+    )
+
+
 def _map_session(session: PitchSession, venture_name: str) -> Dict[str, Any]:
     total_seconds = session.duration_seconds or 0
     mins = total_seconds // 60
@@ -118,6 +143,7 @@ def _map_session(session: PitchSession, venture_name: str) -> Dict[str, Any]:
         "structure": structure,
         "engagement": engagement,
         "videoUrl": session.video_url or "",
+        "videoStatus": session.video_status or "ready",
         "transcriptUrl": "",
         "feedback": feedback,
     }
@@ -208,6 +234,64 @@ def delete_pitch_analysis(
     return None
 
 
+def _owned_session(db: Session, session_id: int, user: User) -> PitchSession:
+    session = db.query(PitchSession).filter(PitchSession.id == session_id).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="Pitch session not found")
+    venture = db.query(Venture).filter(Venture.id == session.venture_id).first()
+    if not venture or venture.founder_id != user.id:
+        raise HTTPException(status_code=403, detail="Not authorized for this pitch session")
+    return session
+
+
+def _latest_analysis_job(db: Session, session_id: int) -> Optional[PitchAnalysisJob]:
+    return (
+        db.query(PitchAnalysisJob)
+        .filter(PitchAnalysisJob.session_id == session_id)
+        .order_by(desc(PitchAnalysisJob.id))
+        .first()
+    )
+
+
+@router.get("/analyses/{session_id}/timeline")
+def get_pitch_timeline(
+    session_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Per-window reward scores, coaching actions and delivery metrics of a
+    recorded session, once its analysis job has finished."""
+    session = _owned_session(db, session_id, current_user)
+    return {
+        "session_id": session.id,
+        "job": pitch_session_analyzer.describe(_latest_analysis_job(db, session.id)),
+        "analysis": session.analysis,
+        "timeline": decode_timeline(session),
+        "transcript": session.transcript,
+        "audio_url": session.audio_url,
+    }
+
+
+@router.post("/analyses/{session_id}/timeline", status_code=status.HTTP_202_ACCEPTED)
+async def analyze_pitch_session(
+    session_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Queue (re)analysis of a recorded session, e.g. one uploaded before
+    analysis jobs existed."""
+    session = _owned_session(db, session_id, current_user)
+    if not session.video_url:
+        raise HTTPException(status_code=400, detail="Pitch session has no recording")
+    if not pitch_session_analyzer.available():
+        raise HTTPException(status_code=503, detail="Pitch analysis is unavailable (ffmpeg not found)")
+    job = _latest_analysis_job(db, session.id)
+    if job is None or job.status not in ("queued", "running"):
+        job = pitch_session_analyzer.enqueue(db, session)
+        pitch_session_analyzer.submit(job.id)
+    return pitch_session_analyzer.describe(job)
+
+
 @router.post("/live-feedback")
 def get_live_pitch_feedback(
     payload: Dict[str, Any],
@@ -232,10 +316,14 @@ def get_live_pitch_feedback(
 
     transcript = str(payload.get("transcript") or "").strip()
     pitch_type = str(payload.get("pitch_type") or "Investor Pitch").strip()
-    context_text = (
-        transcript
-        or f"{pitch_type}. duration={duration_seconds}s target={target_duration_seconds}s "
-           f"slide={current_slide}/{max(total_slides, 1)} transitions={transitions_count}"
+    context_text = _live_context_text(
+        transcript=transcript,
+        pitch_type=pitch_type,
+        duration_seconds=duration_seconds,
+        target_duration_seconds=target_duration_seconds,
+        current_slide=current_slide,
+        total_slides=total_slides,
+        transitions_count=transitions_count,
     )
 
     tips = pitch_coach_engine.generate_feedback(
@@ -261,3 +349,208 @@ def get_live_pitch_feedback(
         "model_loaded": model_status.get("loaded"),
         "model_error": model_status.get("load_error"),
     }
+
+
+# ── Live coaching over WebSocket ─────────────────────────────────────────────
+#
+# One socket per live pitch. The venture is checked once at connect time and
+# the session keeps duration, slides, transition count and transcript on the
+# server, so the client only sends what changed:
+#
+#   {"type": "update", "duration_seconds": 42, "current_slide": 3,
+#    "total_slides": 12, "target_duration_seconds": 300,
+#    "pitch_type": "Investor Pitch", "transcript_delta": "new words"}
+#
+# Every field is optional. The server answers with "metrics" and "tips" events
+# only when they differ from what it last sent. Model calls (RL agent, HF
+# pipeline or Gemini) run off the event loop, at most one per session every
+# PITCH_LIVE_MODEL_INTERVAL_SECONDS and only when their input has changed.
+
+_live_model_slots: Optional[asyncio.Semaphore] = None
+
+
+def _model_slots() -> asyncio.Semaphore:
+    # Created lazily so it binds to the running event loop.
+    global _live_model_slots
+    if _live_model_slots is None:
+        _live_model_slots = asyncio.Semaphore(max(1, settings.PITCH_LIVE_MAX_CONCURRENT_MODEL_CALLS))
+    return _live_model_slots
+
+
+def _get_ws_user(token: str, db: Session) -> Optional[User]:
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        subject = payload.get("sub")
+        user_id = int(subject) if subject is not None else None
+    except (JWTError, ValueError, TypeError):
+        return None
+
+    if user_id is None:
+        return None
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None or not user.is_active:
+        return None
+    return user
+
+
+def _as_int(value: Any, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class LivePitchSession:
+    def __init__(self, websocket: WebSocket, venture_id: int):
+        self.websocket = websocket
+        self.venture_id = venture_id
+        self.pitch_type = "Investor Pitch"
+        self.duration_seconds = 0
+        self.target_duration_seconds = 0
+        self.current_slide = 1
+        self.total_slides = 1
+        self.transitions_count = 0
+        self.transcript_parts: List[str] = []
+        self.transcript_chars = 0
+
+        self._send_lock = asyncio.Lock()
+        self._last_metrics: Optional[Dict[str, int]] = None
+        self._last_tips: Optional[Dict[str, Any]] = None
+        self._last_model_input: Optional[tuple] = None
+        self._last_model_call = 0.0
+        self._tips_task: Optional[asyncio.Task] = None
+
+    def apply(self, delta: Dict[str, Any]) -> None:
+        if "pitch_type" in delta:
+            self.pitch_type = str(delta.get("pitch_type") or "Investor Pitch").strip()
+        if "duration_seconds" in delta:
+            self.duration_seconds = max(_as_int(delta.get("duration_seconds"), self.duration_seconds), 0)
+        if "target_duration_seconds" in delta:
+            self.target_duration_seconds = max(
+                _as_int(delta.get("target_duration_seconds"), self.target_duration_seconds), 0
+            )
+        if "total_slides" in delta:
+            self.total_slides = max(_as_int(delta.get("total_slides"), self.total_slides), 1)
+        if "current_slide" in delta:
+            slide = max(_as_int(delta.get("current_slide"), self.current_slide), 1)
+            if slide != self.current_slide:
+                self.transitions_count += 1
+                self.current_slide = slide
+
+        text = str(delta.get("transcript_delta") or "").strip()
+        if text and self.transcript_chars + len(text) <= settings.PITCH_LIVE_MAX_TRANSCRIPT_CHARS:
+            self.transcript_parts.append(text)
+            self.transcript_chars += len(text) + 1
+
+    def _model_input(self) -> tuple:
+        context_text = _live_context_text(
+            transcript=" ".join(self.transcript_parts),
+            pitch_type=self.pitch_type,
+            duration_seconds=self.duration_seconds,
+            target_duration_seconds=self.target_duration_seconds,
+            current_slide=self.current_slide,
+            total_slides=self.total_slides,
+            transitions_count=self.transitions_count,
+        )
+        return (context_text, self.duration_seconds, self.target_duration_seconds, self.pitch_type)
+
+    async def send(self, payload: Dict[str, Any]) -> None:
+        # The receive loop and the tips task both push; keep frames whole.
+        async with self._send_lock:
+            await self.websocket.send_json(payload)
+
+    async def push_metrics(self) -> None:
+        metrics = _derive_live_metrics(
+            duration_seconds=self.duration_seconds,
+            target_duration_seconds=self.target_duration_seconds,
+            current_slide=self.current_slide,
+            total_slides=self.total_slides,
+            transitions_count=self.transitions_count,
+        )
+        if metrics != self._last_metrics:
+            self._last_metrics = metrics
+            await self.send({"event": "metrics", "metrics": metrics})
+
+    def schedule_tips(self) -> None:
+        if self._tips_task is None or self._tips_task.done():
+            self._tips_task = asyncio.create_task(self._refresh_tips())
+
+    async def _refresh_tips(self) -> None:
+        try:
+            while self._model_input() != self._last_model_input:
+                wait = self._last_model_call + settings.PITCH_LIVE_MODEL_INTERVAL_SECONDS - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                model_input = self._model_input()
+                context_text, duration_seconds, target_duration_seconds, pitch_type = model_input
+                self._last_model_input = model_input
+                self._last_model_call = time.monotonic()
+                async with _model_slots():
+                    tips = await asyncio.to_thread(
+                        pitch_coach_engine.generate_feedback,
+                        context_text,
+                        duration_seconds=duration_seconds,
+                        target_duration_seconds=target_duration_seconds,
+                        pitch_type=pitch_type,
+                    )
+                model_status = pitch_coach_engine.status()
+                payload = {
+                    "tips": tips,
+                    "model_backend": model_status.get("backend"),
+                    "model_loaded": model_status.get("loaded"),
+                    "model_error": model_status.get("load_error"),
+                }
+                if payload != self._last_tips:
+                    self._last_tips = payload
+                    await self.send({"event": "tips", **payload})
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Closed socket or failed model call; the next update reschedules.
+            logger.debug("live pitch tips refresh stopped: %s", exc)
+
+    def close(self) -> None:
+        if self._tips_task is not None:
+            self._tips_task.cancel()
+
+
+@router.websocket("/live/ws")
+async def live_pitch_ws(websocket: WebSocket, token: str = Query(...), venture_id: int = Query(...)):
+    # Authenticate and check ownership once, then release the DB connection for
+    # the rest of the session.
+    db = SessionLocal()
+    try:
+        user = _get_ws_user(token, db)
+        venture = db.query(Venture).filter(Venture.id == venture_id).first() if user else None
+        authorized = venture is not None and venture.founder_id == user.id
+    finally:
+        db.close()
+    if not authorized:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    session = LivePitchSession(websocket, venture_id)
+    try:
+        await session.send({"event": "connected", "venture_id": venture_id})
+        while True:
+            message = await websocket.receive_json()
+            if not isinstance(message, dict):
+                continue
+            kind = message.get("type")
+            if kind == "ping":
+                await session.send({"event": "pong"})
+                continue
+            if kind != "update":
+                await session.send({"event": "error", "detail": f"unknown message type: {kind}"})
+                continue
+            session.apply(message)
+            await session.push_metrics()
+            session.schedule_tips()
+    except WebSocketDisconnect:
+        pass
+    except Exception as exc:
+        logger.debug("live pitch socket closed: %s", exc)
+    finally:
+        session.close()
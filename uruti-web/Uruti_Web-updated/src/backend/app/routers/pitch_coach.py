@@ -34,6 +34,7 @@ def _format_session(session: PitchSession, venture_name: str) -> Dict[str, Any]:
         "venture_name": venture_name,
         "title": session.title,
         "video_url": session.video_url or "",
+        "video_status": session.video_status or "ready",
         "duration": f"{mins}:{secs:02d}",
         "duration_seconds": total_seconds,
         "overall_score": overall,
@@ -3,21 +3,16 @@ Profile endpoints for image uploads (avatar and cover image)
 """
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.orm import Session
-import os
-import shutil
-import uuid
-from pathlib import Path
 from ..database import get_db
 from ..models import User
 from ..schemas import UserResponse, UserUpdate
 from ..auth import get_current_active_user
+from ..services.blob_store import StoredBlob, blob_store, safe_extension
+from ..services.chunked_uploads import UploadRejected
+from ..services.image_variants import image_variants
 
 router = APIRouter(prefix="/profile", tags=["Profile"])
 
-# Create uploads directory if it doesn't exist
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
-
 # Allowed file types for images
 ALLOWED_IMAGE_TYPES = {
     "image/jpeg",
@@ -31,19 +26,27 @@ MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
 
 def validate_image_file(file: UploadFile) -> str:
-    """Validate image file and return file path"""
+    """Validate image file and return the extension to store it with"""
     if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_IMAGE_TYPES)}"
         )
-    
-    # Generate unique filename
-    file_extension = Path(file.filename).suffix
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = UPLOAD_DIR / unique_filename
-    
-    return str(file_path), unique_filename
+    return safe_extension(file.filename)
+
+
+async def store_image(db: Session, file: UploadFile, max_size: int = MAX_FILE_SIZE) -> StoredBlob:
+    """Validate and store an uploaded image and queue its resized variants"""
+    extension = validate_image_file(file)
+    try:
+        stored = await blob_store.store_upload(
+            db, file.file, extension=extension, content_type=file.content_type, max_size=max_size
+        )
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+    # Thumbnails and WebP/JPEG variants are rendered in the background.
+    image_variants.submit(stored.sha256)
+    return stored
 
 
 @router.post("/avatar", response_model=dict)
@@ -53,16 +56,12 @@ async def upload_avatar(
     current_user: User = Depends(get_current_active_user),
 ):
     """Upload user avatar image"""
-    file_path = None
     try:
-        file_path, unique_filename = validate_image_file(file)
-        
-        # Save file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Update user's avatar_url
-        avatar_url = f"/api/v1/profile/uploads/{unique_filename}"
+        stored = await store_image(db, file)
+
+        # Update user's avatar_url; the previous image loses a reference
+        avatar_url = f"/api/v1/profile/uploads/{stored.name}"
+        blob_store.release(db, current_user.avatar_url)
         current_user.avatar_url = avatar_url
         db.commit()
         db.refresh(current_user)
@@ -72,9 +71,7 @@ async def upload_avatar(
     except HTTPException:
         raise
     except Exception as e:
-        # Clean up on error
-        if file_path and os.path.exists(file_path):
-            os.remove(file_path)
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload avatar: {str(e)}"
@@ -88,16 +85,12 @@ async def upload_cover_image(
     current_user: User = Depends(get_current_active_user),
 ):
     """Upload user cover image"""
-    file_path = None
     try:
-        file_path, unique_filename = validate_image_file(file)
-        
-        # Save file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Update user's cover_image_url
-        cover_image_url = f"/api/v1/profile/uploads/{unique_filename}"
+        stored = await store_image(db, file)
+
+        # Update user's cover_image_url; the previous image loses a reference
+        cover_image_url = f"/api/v1/profile/uploads/{stored.name}"
+        blob_store.release(db, current_user.cover_image_url)
         current_user.cover_image_url = cover_image_url
         db.commit()
         db.refresh(current_user)
@@ -107,9 +100,7 @@ async def upload_cover_image(
     except HTTPException:
         raise
     except Exception as e:
-        # Clean up on error
-        if file_path and os.path.exists(file_path):
-            os.remove(file_path)
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload cover image: {str(e)}"
@@ -0,0 +1,166 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from typing import Any
+
+from ..auth import get_current_active_user
+from ..database import get_db
+from ..models import User, Venture
+from ..schemas import PitchVideoUploadMetadata, UploadInit, UploadComplete
+from ..services.blob_store import blob_store, safe_extension
+from ..services.chunked_uploads import UploadRejected, chunked_uploads
+from .messages import message_attachment_payload
+from .ventures import create_pitch_session, pitch_video_extension
+
+
+router = APIRouter(prefix="/uploads", tags=["Uploads"])
+
+
+def _rejected(exc: UploadRejected) -> JSONResponse:
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail, **exc.extra})
+
+
+def _owned_venture(db: Session, venture_id: Any, user: User) -> Venture:
+    try:
+        venture = db.query(Venture).filter(Venture.id == int(venture_id)).first()
+    except (TypeError, ValueError):
+        venture = None
+    if not venture:
+        raise HTTPException(status_code=404, detail="Venture not found")
+    if venture.founder_id != user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to upload for this venture")
+    return venture
+
+
+@router.post("")
+def init_upload(
+    payload: UploadInit,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Start a resumable upload; send the data with PUT /uploads/{id}?offset=N."""
+    meta = payload.metadata
+    if payload.purpose == "pitch_video":
+        # Fail before any bytes are sent.
+        try:
+            meta = PitchVideoUploadMetadata.model_validate(payload.metadata).model_dump()
+        except ValidationError as exc:
+            raise HTTPException(status_code=422, detail=jsonable_encoder(exc.errors(include_url=False)))
+        _owned_venture(db, meta["venture_id"], current_user)
+        pitch_video_extension(payload.content_type, payload.file_name)
+
+    try:
+        upload = chunked_uploads.create(
+            db,
+            user_id=current_user.id,
+            purpose=payload.purpose,
+            file_name=payload.file_name,
+            content_type=payload.content_type,
+            size=payload.size,
+            meta=meta,
+        )
+    except UploadRejected as exc:
+        return _rejected(exc)
+    return chunked_uploads.describe(upload, 0)
+
+
+@router.get("/{upload_id}")
+def get_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Where to resume: `offset` is the number of bytes already stored."""
+    try:
+        upload = chunked_uploads.get(db, upload_id, current_user.id)
+        return chunked_uploads.describe(upload, chunked_uploads.offset(upload))
+    except UploadRejected as exc:
+        return _rejected(exc)
+
+
+@router.put("/{upload_id}")
+async def put_upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Append the request body at `offset`. 409 carries the current offset."""
+    content_length = request.headers.get("content-length")
+    try:
+        upload = chunked_uploads.get(db, upload_id, current_user.id)
+        new_offset = await chunked_uploads.write_chunk(
+            db,
+            upload,
+            offset,
+            request.stream(),
+            content_length=int(content_length) if content_length and content_length.isdigit() else None,
+        )
+    except UploadRejected as exc:
+        return _rejected(exc)
+    return {"upload_id": upload_id, "offset": new_offset, "size": int(upload.total_size)}
+
+
+@router.post("/{upload_id}/complete")
+async def complete_upload(
+    upload_id: str,
+    payload: UploadComplete,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Verify size and checksum, then store the file like the one-shot upload would."""
+    try:
+        upload = chunked_uploads.get(db, upload_id, current_user.id)
+        part_path = await chunked_uploads.finish(db, upload, payload.sha256)
+    except UploadRejected as exc:
+        return _rejected(exc)
+
+    # The part file is kept (the store gets a link to it) until the result is
+    # committed, so a failed completion can be retried without re-uploading.
+    if upload.purpose == "message_attachment":
+        stored = blob_store.adopt(
+            db,
+            part_path,
+            extension=safe_extension(upload.file_name),
+            content_type=upload.content_type,
+            sha256=upload.sha256,
+            private=True,
+            keep_source=True,
+        )
+        result = message_attachment_payload(db, upload.file_name, stored, upload.content_type)
+    else:
+        meta = PitchVideoUploadMetadata.model_validate(upload.meta or {})
+        venture = _owned_venture(db, meta.venture_id, current_user)
+        extension = pitch_video_extension(upload.content_type, upload.file_name)
+        stored = blob_store.adopt(
+            db,
+            part_path,
+            extension=extension,
+            content_type=upload.content_type,
+            sha256=upload.sha256,
+            keep_source=True,
+        )
+        try:
+            result = await create_pitch_session(
+                db,
+                venture,
+                stored,
+                pitch_type=meta.pitch_type,
+                duration=meta.duration,
+                target_duration=meta.target_duration,
+                notes=meta.notes,
+            )
+        except Exception as exc:
+            # Raised before the session was committed (see create_pitch_session);
+            # the upload stays completable.
+            db.rollback()
+            blob_store.release(db, stored.name)
+            db.commit()
+            raise HTTPException(status_code=500, detail=f"Failed to upload pitch video: {exc}")
+
+    result["sha256"] = upload.sha256
+    chunked_uploads.discard(db, upload)
+    return result
@@ -1,20 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, UploadFile, File, Form
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, or_
+from sqlalchemy import and_, case, desc, func, or_
 from typing import List, Optional
 from pathlib import Path
-import shutil
-import subprocess
-import uuid
+import asyncio
+import logging
+from ..config import settings
 from ..database import get_db
-from ..models import User, Venture, PitchSession, Connection, Bookmark, NotificationType, UserRole
+from ..models import User, Venture, PitchSession, PitchVideoJob, Connection, Bookmark, NotificationType, UserRole
 from ..schemas import VentureCreate, VentureResponse, VentureUpdate
 from ..auth import get_current_active_user
 from .notifications import create_notification, publish_notification
 from ..services.venture_scorer import venture_scorer
+from ..services.venture_rescore import venture_rescore
 from ..services.pitch_coach_engine import pitch_coach_engine
+from ..services.pitch_analysis import pitch_session_analyzer
+from ..services.pitch_video import pitch_video_transcoder, upload_url as pitch_upload_url
+from ..services.blob_store import StoredBlob, blob_store, safe_extension
+from ..services.chunked_uploads import UploadRejected
+from ..services.image_variants import image_variants
 
 router = APIRouter(prefix="/ventures", tags=["Ventures"])
+logger = logging.getLogger(__name__)
 
 VENTURE_FIELD_LABELS = {
     "name": "name",
@@ -48,9 +55,6 @@ VENTURE_FIELD_LABELS = {
     "is_seeking_funding": "funding status",
 }
 
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
-
 ALLOWED_VIDEO_TYPES = {
     "video/webm",
     "video/mp4",
@@ -74,12 +78,29 @@ ALLOWED_IMAGE_TYPES = {
 }
 
 
-def _apply_venture_score(venture: Venture) -> None:
-    analysis = venture_scorer.score_venture(venture)
+def _store_venture_score(venture: Venture, analysis: dict) -> None:
     venture.uruti_score = float(analysis.get("uruti_score") or 0.0)
     venture.score_breakdown = analysis
 
 
+def _apply_venture_score(venture: Venture) -> None:
+    _store_venture_score(venture, venture_scorer.score_venture(venture))
+
+
+async def _apply_venture_score_async(venture: Venture) -> None:
+    # Lets concurrent create/update requests share a scoring worker batch.
+    _store_venture_score(venture, await venture_scorer.score_venture_async(venture))
+
+
+async def _store_upload(db: Session, file: UploadFile, extension: str, max_size: int) -> StoredBlob:
+    try:
+        return await blob_store.store_upload(
+            db, file.file, extension=extension, content_type=file.content_type, max_size=max_size
+        )
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+
+
 def _best_pitch_video_for_venture(db: Session, venture_id: int) -> Optional[str]:
     best_session = (
         db.query(PitchSession)
@@ -117,7 +138,7 @@ async def create_venture(
         founder_id=current_user.id
     )
 
-    _apply_venture_score(db_venture)
+    await _apply_venture_score_async(db_venture)
     
     db.add(db_venture)
     db.commit()
@@ -223,47 +244,44 @@ def get_model_performance(
 
     _ensure_admin(current_user)
 
-    ventures = db.query(Venture).all()
-    scored = [v for v in ventures if v.uruti_score is not None]
-    scores = [float(v.uruti_score or 0.0) for v in scored]
-
-    class_distribution = {
-        "not_ready": 0,
-        "mentorship_needed": 0,
-        "investment_ready": 0,
-    }
+    # One aggregate query instead of loading every venture: counts, score
+    # stats and the class/source distributions read from score_breakdown.
+    scored = Venture.uruti_score.isnot(None)
+    predicted_class = func.lower(func.trim(Venture.score_breakdown["predicted_class"].as_string()))
+    model_source = func.lower(func.trim(Venture.score_breakdown["model_source"].as_string()))
+    class_names = ("not_ready", "mentorship_needed", "investment_ready")
+    known_sources = ("root_models_bundle", "heuristic_fallback")
+
+    row = db.query(
+        func.count(Venture.id),
+        func.count(Venture.uruti_score),
+        func.avg(Venture.uruti_score),
+        func.max(Venture.uruti_score),
+        func.min(Venture.uruti_score),
+        *[func.count(case((and_(scored, predicted_class == name), 1))) for name in class_names],
+        *[func.count(case((and_(scored, model_source == name), 1))) for name in known_sources],
+        func.count(case((and_(scored, model_source != "", model_source.notin_(known_sources)), 1))),
+    ).one()
+
+    total_ventures, scored_ventures, average, maximum, minimum = row[:5]
+    class_distribution = dict(zip(class_names, (int(count) for count in row[5:8])))
     source_distribution = {
-        "root_models_bundle": 0,
-        "heuristic_fallback": 0,
-        "other": 0,
+        "root_models_bundle": int(row[8]),
+        "heuristic_fallback": int(row[9]),
+        "other": int(row[10]),
     }
 
-    for venture in scored:
-        breakdown = venture.score_breakdown if isinstance(venture.score_breakdown, dict) else {}
-
-        predicted_class = str(breakdown.get("predicted_class") or "").strip().lower()
-        if predicted_class in class_distribution:
-            class_distribution[predicted_class] += 1
-
-        model_source = str(breakdown.get("model_source") or "").strip().lower()
-        if model_source == "root_models_bundle":
-            source_distribution["root_models_bundle"] += 1
-        elif model_source == "heuristic_fallback":
-            source_distribution["heuristic_fallback"] += 1
-        elif model_source:
-            source_distribution["other"] += 1
-
-    average_score = round(sum(scores) / len(scores), 2) if scores else 0.0
-    max_score = round(max(scores), 2) if scores else 0.0
-    min_score = round(min(scores), 2) if scores else 0.0
+    average_score = round(float(average), 2) if average is not None else 0.0
+    max_score = round(float(maximum), 2) if maximum is not None else 0.0
+    min_score = round(float(minimum), 2) if minimum is not None else 0.0
 
     model_info = venture_scorer.get_model_info()
 
     return {
         "model_info": model_info,
         "performance": {
-            "total_ventures": len(ventures),
-            "scored_ventures": len(scored),
+            "total_ventures": int(total_ventures),
+            "scored_ventures": int(scored_ventures),
             "average_score": average_score,
             "max_score": max_score,
             "min_score": min_score,
@@ -273,6 +291,56 @@ def get_model_performance(
     }
 
 
+@router.post("/admin/rescore")
+def start_venture_rescore(
+    background_tasks: BackgroundTasks,
+    chunk_size: int = Query(200, ge=1, le=5000),
+    restart: bool = Query(False, description="Start over instead of resuming the last unfinished job"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Rescore every venture with the current model in the background (admin only)."""
+
+    _ensure_admin(current_user)
+
+    try:
+        job = venture_rescore.start(db, user_id=current_user.id, chunk_size=chunk_size, restart=restart)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+
+    # Runs in the threadpool once the response is sent.
+    background_tasks.add_task(venture_rescore.run, job.id)
+    return venture_rescore.describe(job)
+
+
+@router.get("/admin/rescore")
+def get_venture_rescore_status(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Progress of the latest bulk rescore job (admin only)."""
+
+    _ensure_admin(current_user)
+
+    payload = venture_rescore.describe(venture_rescore.latest(db))
+    payload["active_in_this_worker"] = venture_rescore.is_running()
+    return payload
+
+
+@router.post("/admin/rescore/cancel")
+def cancel_venture_rescore(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Stop the running rescore job after its current chunk (admin only)."""
+
+    _ensure_admin(current_user)
+
+    if not venture_rescore.cancel():
+        raise HTTPException(status_code=409, detail="No rescore job is running in this worker")
+    return venture_rescore.describe(venture_rescore.latest(db))
+
+
 @router.get("/{venture_id}", response_model=VentureResponse)
 def get_venture(
     venture_id: int,
@@ -319,7 +387,7 @@ async def update_venture(
     for field, value in update_data.items():
         setattr(venture, field, value)
 
-    _apply_venture_score(venture)
+    await _apply_venture_score_async(venture)
     
     db.commit()
     db.refresh(venture)
@@ -453,21 +521,21 @@ async def upload_venture_logo(
     if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(status_code=400, detail="Invalid image format")
 
-    extension = Path(file.filename or "logo.png").suffix or ".png"
-    filename = f"venture_logo_{venture_id}_{uuid.uuid4().hex}{extension}"
-    file_path = UPLOAD_DIR / filename
+    extension = safe_extension(file.filename, ".png") or ".png"
 
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        stored = await _store_upload(db, file, extension, settings.MAX_UPLOAD_SIZE)
+        image_variants.submit(stored.sha256)
 
-        venture.logo_url = f"/api/v1/profile/uploads/{filename}"
+        blob_store.release(db, venture.logo_url)
+        venture.logo_url = f"/api/v1/profile/uploads/{stored.name}"
         db.commit()
         db.refresh(venture)
         return venture
+    except HTTPException:
+        raise
     except Exception as exc:
-        if file_path.exists():
-            file_path.unlink(missing_ok=True)
+        db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to upload venture logo: {exc}")
 
 
@@ -489,24 +557,161 @@ async def upload_venture_banner(
     if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(status_code=400, detail="Invalid image format")
 
-    extension = Path(file.filename or "banner.png").suffix or ".png"
-    filename = f"venture_banner_{venture_id}_{uuid.uuid4().hex}{extension}"
-    file_path = UPLOAD_DIR / filename
+    extension = safe_extension(file.filename, ".png") or ".png"
 
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        stored = await _store_upload(db, file, extension, settings.MAX_UPLOAD_SIZE)
+        image_variants.submit(stored.sha256)
 
-        venture.banner_url = f"/api/v1/profile/uploads/{filename}"
+        blob_store.release(db, venture.banner_url)
+        venture.banner_url = f"/api/v1/profile/uploads/{stored.name}"
         db.commit()
         db.refresh(venture)
         return venture
+    except HTTPException:
+        raise
     except Exception as exc:
-        if file_path.exists():
-            file_path.unlink(missing_ok=True)
+        db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to upload venture banner: {exc}")
 
 
+def pitch_video_extension(content_type: Optional[str], filename: Optional[str]) -> str:
+    """Validate a pitch video's type and return the extension to store it with."""
+    normalized_content_type = (content_type or "").split(";")[0].strip().lower()
+    extension = safe_extension(filename or "pitch.webm", ".webm") or ".webm"
+    inferred_type = VIDEO_EXTENSION_TO_TYPE.get(extension)
+
+    # Some browsers include codec suffixes in content type (e.g. video/webm;codecs=vp9)
+    # and some mobile uploads may use a generic binary mime type; extension fallback keeps uploads usable.
+    if normalized_content_type not in ALLOWED_VIDEO_TYPES and inferred_type not in ALLOWED_VIDEO_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Invalid video format ({content_type or 'unknown'}). "
+                "Supported formats: webm, mp4, mov"
+            ),
+        )
+    return extension
+
+
+async def create_pitch_session(
+    db: Session,
+    venture: Venture,
+    video: StoredBlob,
+    *,
+    pitch_type: str,
+    duration: int,
+    target_duration: int,
+    notes: str,
+) -> dict:
+    """Create the PitchSession for a stored pitch video and queue its transcode.
+
+    Raises only before the session is committed; failing to queue the
+    transcode or analysis afterwards is logged and the session is returned.
+    """
+    filename = video.name
+
+    # Non-MP4 uploads are normalized to MP4 in the background when ffmpeg
+    # is available; the original plays until the MP4 replaces it.
+    needs_transcode = Path(filename).suffix.lower() != ".mp4" and pitch_video_transcoder.available()
+
+    target = target_duration if target_duration > 0 else max(duration, 1)
+    ratio = min(max(float(duration) / float(target), 0.0), 1.0)
+    pacing_score = round(60 + ratio * 40, 2)
+    confidence_score = round(65 + ratio * 30, 2)
+    clarity_score = round(68 + ratio * 28, 2)
+    overall_score = round((pacing_score + confidence_score + clarity_score) / 3, 2)
+
+    generated_tips = await asyncio.to_thread(
+        pitch_coach_engine.generate_feedback,
+        notes or f"{pitch_type} pitch session",
+        duration_seconds=duration,
+        target_duration_seconds=target_duration,
+        pitch_type=pitch_type,
+    )
+    coach_status = pitch_coach_engine.status()
+
+    ai_feedback = {
+        "pitch_type": pitch_type,
+        "target_duration": target_duration,
+        "duration": duration,
+        "notes": notes,
+        "tips": generated_tips,
+        "model_backend": coach_status.get("backend"),
+        "model_loaded": coach_status.get("loaded"),
+    }
+
+    session = PitchSession(
+        venture_id=venture.id,
+        title=f"{pitch_type} Practice",
+        video_url=pitch_upload_url(filename),
+        video_status="processing" if needs_transcode else "ready",
+        duration_seconds=duration,
+        pacing_score=pacing_score,
+        confidence_score=confidence_score,
+        clarity_score=clarity_score,
+        overall_score=overall_score,
+        ai_feedback=ai_feedback,
+    )
+
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+
+    # The session exists from here on. What follows is best effort: errors
+    # are logged rather than raised, so callers never fail the upload (and
+    # release the video) of a committed session.
+    try:
+        # Keep venture-level demo video in sync with strongest/latest pitch result.
+        venture.demo_video_url = _best_pitch_video_for_venture(db, venture.id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("could not update the demo video of venture %s", venture.id)
+
+    job = None
+    if needs_transcode:
+        try:
+            job = pitch_video_transcoder.enqueue(db, session, video.path)
+            pitch_video_transcoder.submit(job.id)
+        except Exception:
+            db.rollback()
+            logger.exception("could not queue the transcode of pitch session %s", session.id)
+            if job is None:
+                # Nothing will replace the original, which plays as it is.
+                try:
+                    session.video_status = "ready"
+                    db.commit()
+                except Exception:
+                    db.rollback()
+
+    # Transcript, timeline and measured pacing are computed in the background.
+    analysis_job = None
+    if pitch_session_analyzer.available():
+        try:
+            analysis_job = pitch_session_analyzer.enqueue(db, session)
+            pitch_session_analyzer.submit(analysis_job.id)
+        except Exception:
+            db.rollback()
+            logger.exception("could not queue the analysis of pitch session %s", session.id)
+
+    return {
+        "message": "Pitch video uploaded successfully",
+        "session": {
+            "id": session.id,
+            "venture_id": session.venture_id,
+            "title": session.title,
+            "video_url": session.video_url,
+            "video_status": session.video_status,
+            "duration_seconds": session.duration_seconds,
+            "overall_score": session.overall_score,
+            "created_at": session.created_at,
+        },
+        "processing": pitch_video_transcoder.describe(job) if job is not None else None,
+        "analysis": pitch_session_analyzer.describe(analysis_job) if analysis_job is not None else None,
+    }
+
+
 @router.post("/{venture_id}/pitch-video")
 async def upload_pitch_video(
     venture_id: int,
@@ -518,7 +723,10 @@ async def upload_pitch_video(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Upload pitch video and create a PitchSession record."""
+    """Upload pitch video and create a PitchSession record.
+
+    Large recordings should use the resumable protocol under /uploads.
+    """
     venture = db.query(Venture).filter(Venture.id == venture_id).first()
     if not venture:
         raise HTTPException(status_code=404, detail="Venture not found")
@@ -526,120 +734,60 @@ async def upload_pitch_video(
     if venture.founder_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to upload for this venture")
 
-    normalized_content_type = (file.content_type or "").split(";")[0].strip().lower()
-    extension = Path(file.filename or "pitch.webm").suffix.lower() or ".webm"
-    inferred_type = VIDEO_EXTENSION_TO_TYPE.get(extension)
-
-    # Some browsers include codec suffixes in content type (e.g. video/webm;codecs=vp9)
-    # and some mobile uploads may use a generic binary mime type; extension fallback keeps uploads usable.
-    if normalized_content_type not in ALLOWED_VIDEO_TYPES and inferred_type not in ALLOWED_VIDEO_TYPES:
-        raise HTTPException(
-            status_code=400,
-            detail=(
-                f"Invalid video format ({file.content_type or 'unknown'}). "
-                "Supported formats: webm, mp4, mov"
-            ),
-        )
-
-    filename = f"pitch_{venture_id}_{uuid.uuid4().hex}{extension}"
-    file_path = UPLOAD_DIR / filename
+    extension = pitch_video_extension(file.content_type, file.filename)
+    video = await _store_upload(db, file, extension, settings.MAX_PITCH_VIDEO_SIZE)
 
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        # Normalize uploaded video to MP4 when ffmpeg is available so playback
-        # works consistently across platforms/devices.
-        if file_path.suffix.lower() != ".mp4" and shutil.which("ffmpeg"):
-            mp4_filename = f"pitch_{venture_id}_{uuid.uuid4().hex}.mp4"
-            mp4_path = UPLOAD_DIR / mp4_filename
-            conversion = subprocess.run(
-                [
-                    "ffmpeg",
-                    "-y",
-                    "-i",
-                    str(file_path),
-                    "-c:v",
-                    "libx264",
-                    "-preset",
-                    "veryfast",
-                    "-movflags",
-                    "+faststart",
-                    "-c:a",
-                    "aac",
-                    str(mp4_path),
-                ],
-                check=False,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            if conversion.returncode == 0 and mp4_path.exists():
-                file_path.unlink(missing_ok=True)
-                filename = mp4_filename
-                file_path = mp4_path
-
-        target = target_duration if target_duration > 0 else max(duration, 1)
-        ratio = min(max(float(duration) / float(target), 0.0), 1.0)
-        pacing_score = round(60 + ratio * 40, 2)
-        confidence_score = round(65 + ratio * 30, 2)
-        clarity_score = round(68 + ratio * 28, 2)
-        overall_score = round((pacing_score + confidence_score + clarity_score) / 3, 2)
-
-        generated_tips = pitch_coach_engine.generate_feedback(
-            notes or f"{pitch_type} pitch session",
-            duration_seconds=duration,
-            target_duration_seconds=target_duration,
+        return await create_pitch_session(
+            db,
+            venture,
+            video,
             pitch_type=pitch_type,
+            duration=duration,
+            target_duration=target_duration,
+            notes=notes,
         )
-        coach_status = pitch_coach_engine.status()
-
-        ai_feedback = {
-            "pitch_type": pitch_type,
-            "target_duration": target_duration,
-            "duration": duration,
-            "notes": notes,
-            "tips": generated_tips,
-            "model_backend": coach_status.get("backend"),
-            "model_loaded": coach_status.get("loaded"),
-        }
+    except Exception as exc:
+        # create_pitch_session only raises before the session is committed,
+        # so the video is not referenced by anything yet.
+        db.rollback()
+        blob_store.release(db, video.name)
+        db.commit()
+        if isinstance(exc, HTTPException):
+            raise
+        raise HTTPException(status_code=500, detail=f"Failed to upload pitch video: {exc}")
 
-        session = PitchSession(
-            venture_id=venture_id,
-            title=f"{pitch_type} Practice",
-            video_url=f"/api/v1/profile/uploads/{filename}",
-            duration_seconds=duration,
-            pacing_score=pacing_score,
-            confidence_score=confidence_score,
-            clarity_score=clarity_score,
-            overall_score=overall_score,
-            ai_feedback=ai_feedback,
-        )
 
-        db.add(session)
-        db.commit()
-        db.refresh(session)
+@router.get("/{venture_id}/pitch-video/{session_id}/processing")
+def get_pitch_video_processing(
+    venture_id: int,
+    session_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Transcoding status and progress of an uploaded pitch video."""
+    venture = db.query(Venture).filter(Venture.id == venture_id).first()
+    if not venture:
+        raise HTTPException(status_code=404, detail="Venture not found")
+    if venture.founder_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized for this venture")
 
-        # Keep venture-level demo video in sync with strongest/latest pitch result.
-        venture.demo_video_url = _best_pitch_video_for_venture(db, venture_id)
-        db.commit()
+    session = (
+        db.query(PitchSession)
+        .filter(PitchSession.id == session_id, PitchSession.venture_id == venture_id)
+        .first()
+    )
+    if not session:
+        raise HTTPException(status_code=404, detail="Pitch session not found")
 
-        return {
-            "message": "Pitch video uploaded successfully",
-            "session": {
-                "id": session.id,
-                "venture_id": session.venture_id,
-                "title": session.title,
-                "video_url": session.video_url,
-                "duration_seconds": session.duration_seconds,
-                "overall_score": session.overall_score,
-                "created_at": session.created_at,
-            },
-        }
-    except HTTPException:
-        db.rollback()
-        raise
-    except Exception as exc:
-        db.rollback()
-        if file_path.exists():
-            file_path.unlink(missing_ok=True)
-        raise HTTPException(status_code=500, detail=f"Failed to upload pitch video: {exc}")
+    job = (
+        db.query(PitchVideoJob)
+        .filter(PitchVideoJob.session_id == session_id)
+        .order_by(desc(PitchVideoJob.id))
+        .first()
+    )
+    return {
+        "video_url": session.video_url,
+        "video_status": session.video_status or "ready",
+        "job": pitch_video_transcoder.describe(job),
+    }
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, ConfigDict, EmailStr, Field, validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, computed_field, validator
 from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 from enum import Enum
+from .services.cursors import encode_cursor
+from .services.image_variants import DISPLAY_SIZE, THUMBNAIL_SIZE, variant_url
 
 
 # Enums
@@ -59,6 +61,28 @@ class PushTokenRemove(BaseModel):
 
 
 # Base Schemas
+class UploadInit(BaseModel):
+    purpose: Literal["pitch_video", "message_attachment"]
+    file_name: str
+    content_type: Optional[str] = None
+    size: int = Field(..., gt=0)
+    # pitch_video: PitchVideoUploadMetadata, checked before any bytes are sent
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
+class PitchVideoUploadMetadata(BaseModel):
+    """Form fields of the one-shot pitch video upload, for chunked uploads."""
+    venture_id: int
+    pitch_type: str = "Investor Pitch"
+    duration: int = Field(0, ge=0)
+    target_duration: int = Field(0, ge=0)
+    notes: str = ""
+
+
+class UploadComplete(BaseModel):
+    sha256: Optional[str] = None
+
+
 class UserBase(BaseModel):
     email: EmailStr
     full_name: str
@@ -138,6 +162,17 @@ class UserResponse(UserBase):
     last_login: Optional[datetime] = None
     uruti_score: float = 0.0
 
+    # Resized variants for lists and cards; the *_url fields stay the originals.
+    @computed_field
+    @property
+    def avatar_thumbnail_url(self) -> Optional[str]:
+        return variant_url(self.avatar_url, THUMBNAIL_SIZE)
+
+    @computed_field
+    @property
+    def cover_image_thumbnail_url(self) -> Optional[str]:
+        return variant_url(self.cover_image_url, DISPLAY_SIZE)
+
     class Config:
         from_attributes = True
 
@@ -241,6 +276,17 @@ class VentureResponse(VentureBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
+    # Resized variants for lists and cards; the *_url fields stay the originals.
+    @computed_field
+    @property
+    def logo_thumbnail_url(self) -> Optional[str]:
+        return variant_url(self.logo_url, THUMBNAIL_SIZE)
+
+    @computed_field
+    @property
+    def banner_thumbnail_url(self) -> Optional[str]:
+        return variant_url(self.banner_url, DISPLAY_SIZE)
+
     class Config:
         from_attributes = True
 
@@ -266,6 +312,12 @@ class MessageResponse(MessageBase):
     thread_id: Optional[str] = None
     created_at: datetime
 
+    # Pass as `before`/`after` to page through threads, inbox and sent.
+    @computed_field
+    @property
+    def cursor(self) -> str:
+        return encode_cursor(self.created_at, self.id)
+
     class Config:
         from_attributes = True
 
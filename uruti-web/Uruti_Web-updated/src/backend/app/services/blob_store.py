@@ -0,0 +1,499 @@
+"""Content-addressed storage for uploaded files.
+
+Every upload (avatars, cover images, venture logos and banners, pitch
+videos, message attachments) is stored once per distinct content, named by
+its SHA-256 and sharded two levels deep:
+
+    uploads/blobs/3f/a9/3fa9...e1
+
+URLs keep the original extension (`/api/v1/profile/uploads/3fa9...e1.mp4`)
+so clients and content types work as before; the extension is not part of
+the stored name, so identical bytes uploaded under different names share one
+file. Older flat `uploads/` files keep being served as they are.
+
+Message attachments are private. Their blobs are keyed by an HMAC of the
+digest (`attachment_key`), so holding a file does not reveal where it would
+be stored, and each upload is served under its own random name
+(`MessageAttachmentFile`) from /api/v1/messages/uploads/ only. The public
+profile route cannot find them by content.
+
+`MediaBlob` rows count the references to each blob. Storing a file adds one
+and replacing an avatar/logo/... releases the old one; the background sweep
+recounts references from the URL columns and message attachments (so counts
+cannot drift for long), and deletes blobs that have stayed unreferenced for
+UPLOAD_GC_GRACE_HOURS, as well as files left without a row by a crash.
+
+The reference is committed before the file is moved into place, and the
+sweep deletes the row before it touches the file, then checks again before
+removing it, so a concurrent upload of the same content never loses its file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+import re
+import secrets
+import shutil
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Optional
+
+from sqlalchemy import case, delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import MediaBlob, Message, MessageAttachmentFile, PitchSession, PitchVideoJob, User, Venture
+from .chunked_uploads import UploadRejected
+
+logger = logging.getLogger(__name__)
+
+BLOB_DIR_NAME = "blobs"
+
+_BLOB_NAME = re.compile(r"^([0-9a-f]{64})(\.[a-z0-9]{1,10})?$")
+_EXTENSION = re.compile(r"^\.[a-z0-9]{1,10}$")
+# Any SHA-256 in a stored URL or path; a false match only keeps a blob longer.
+_REFERENCE = re.compile(r"(?<![0-9a-f])[0-9a-f]{64}(?![0-9a-f])")
+_ATTACHMENT_NAME = re.compile(r"^[0-9a-f]{32}(\.[a-z0-9]{1,10})?$")
+# Attachment names in message payloads.
+_ATTACHMENT_REFERENCE = re.compile(r"/messages/uploads/([0-9a-f]{32}(?:\.[a-z0-9]{1,10})?)(?![0-9a-z.])")
+# Digests of blobs in older attachment URLs (`/messages/uploads/<sha256>.<ext>`).
+_PUBLIC_ATTACHMENT_REFERENCE = re.compile(r"/messages/uploads/([0-9a-f]{64})(\.[a-z0-9]{1,10})?(?![0-9a-z.])")
+_READ_BLOCK = 1024 * 1024
+
+
+def safe_extension(file_name: Optional[str], default: str = "") -> str:
+    extension = Path(file_name or "").suffix.lower()
+    return extension if _EXTENSION.match(extension) else default
+
+
+def blob_sha256(name: str) -> Optional[str]:
+    """The digest in a blob file name like `<sha256>.png`, None for other names."""
+    match = _BLOB_NAME.match(name or "")
+    return match.group(1) if match else None
+
+
+def attachment_key(sha256: str) -> str:
+    """Store key of a message attachment with this content digest."""
+    return hmac.new(
+        settings.SECRET_KEY.encode("utf-8"), f"message-attachment:{sha256}".encode("ascii"), hashlib.sha256
+    ).hexdigest()
+
+
+def blob_relative_path(name: str) -> Optional[Path]:
+    """Where a blob named `name` lives relative to the upload dir."""
+    sha256 = blob_sha256(name)
+    if sha256 is None:
+        return None
+    return Path(BLOB_DIR_NAME, sha256[:2], sha256[2:4], sha256)
+
+
+@dataclass
+class StoredBlob:
+    sha256: str
+    name: str  # digest plus extension, used in URLs
+    path: Path
+    size: int
+    deduplicated: bool  # the content was already stored
+
+
+class BlobStore:
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def root(self) -> Path:
+        return Path(settings.UPLOAD_DIR) / BLOB_DIR_NAME
+
+    @property
+    def staging_dir(self) -> Path:
+        path = self.root / ".staging"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def path_for(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256[2:4] / sha256
+
+    def staging_path(self, extension: str = "") -> Path:
+        """A fresh temporary path on the same filesystem as the blobs."""
+        return self.staging_dir / f"{secrets.token_hex(16)}{extension}.part"
+
+    # Storing
+
+    def stage(self, source: BinaryIO, max_size: Optional[int] = None) -> tuple[Path, str, int]:
+        """Copy `source` to a staging file while hashing it; blocking."""
+        tmp_path = self.staging_path()
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp_path, "wb") as out:
+                for block in iter(lambda: source.read(_READ_BLOCK), b""):
+                    size += len(block)
+                    if max_size is not None and size > max_size:
+                        raise UploadRejected(413, f"File is too large (limit {max_size} bytes)")
+                    digest.update(block)
+                    out.write(block)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return tmp_path, digest.hexdigest(), size
+
+    def adopt(
+        self,
+        db: Session,
+        path: Path,
+        *,
+        extension: str = "",
+        content_type: Optional[str] = None,
+        sha256: Optional[str] = None,
+        private: bool = False,
+        keep_source: bool = False,
+    ) -> StoredBlob:
+        """Move a complete file (staged, uploaded in chunks, transcoded) into
+        the store and take one reference to it. Commits. `private` stores it
+        under its `attachment_key` instead of the digest; `keep_source`
+        stores a hard link (or copy) and leaves `path` in place."""
+        if sha256 is None:
+            sha256 = _file_sha256(path)
+        if keep_source:
+            staged = self.staging_path()
+            try:
+                os.link(path, staged)
+            except OSError:
+                shutil.copyfile(path, staged)
+            path = staged
+        if private:
+            sha256 = attachment_key(sha256)
+        size = path.stat().st_size
+        self.acquire(db, sha256, size=size, content_type=content_type)
+        db.commit()
+
+        target = self.path_for(sha256)
+        deduplicated = target.exists()
+        if deduplicated:
+            path.unlink(missing_ok=True)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(path, target)
+        return StoredBlob(sha256, f"{sha256}{extension}", target, size, deduplicated)
+
+    async def store_upload(
+        self,
+        db: Session,
+        source: BinaryIO,
+        *,
+        extension: str = "",
+        content_type: Optional[str] = None,
+        max_size: Optional[int] = None,
+        private: bool = False,
+    ) -> StoredBlob:
+        """Store an uploaded file object (e.g. `UploadFile.file`)."""
+        tmp_path, sha256, _ = await asyncio.to_thread(self.stage, source, max_size)
+        try:
+            return self.adopt(
+                db, tmp_path, extension=extension, content_type=content_type, sha256=sha256, private=private
+            )
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    # Message attachments
+
+    @staticmethod
+    def name_attachment(db: Session, stored: StoredBlob, *, commit: bool = True) -> str:
+        """A new random name for a private blob stored as an attachment."""
+        name = f"{uuid.uuid4().hex}{Path(stored.name).suffix}"
+        db.add(MessageAttachmentFile(name=name, blob_key=stored.sha256))
+        if commit:
+            db.commit()
+        return name
+
+    @staticmethod
+    def attachment_blob_name(db: Session, name: str) -> Optional[str]:
+        """The blob name (key plus extension) an attachment name serves, or
+        None if it is not one."""
+        if not _ATTACHMENT_NAME.match(name or ""):
+            return None
+        row = db.get(MessageAttachmentFile, name)
+        return f"{row.blob_key}{Path(name).suffix}" if row is not None else None
+
+    def privatize_attachment(self, db: Session, sha256: str, extension: str, count: int = 1) -> Optional[str]:
+        """Move `count` references of an attachment stored under its public
+        digest to a private blob with a new name, which is returned (None if
+        the file is gone). Not committed, so the caller can commit it with the
+        message that uses the name; the public blob is left to the sweep."""
+        source = self.path_for(sha256)
+        row = db.get(MediaBlob, sha256)
+        if row is None or not source.exists():
+            return None
+        key = attachment_key(sha256)
+        target = self.path_for(key)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            staged = self.staging_path()
+            shutil.copyfile(source, staged)
+            os.replace(staged, target)
+        for _ in range(count):
+            self.acquire(db, key, size=row.size, content_type=row.content_type)
+        self.release(db, sha256, count)
+        return self.name_attachment(db, StoredBlob(key, f"{key}{extension}", target, row.size, True), commit=False)
+
+    # Reference counting
+
+    def acquire(self, db: Session, sha256: str, *, size: int, content_type: Optional[str] = None) -> None:
+        """Add one reference; creates the row for new content. Not committed."""
+        now = datetime.now(timezone.utc)
+        for _ in range(2):
+            updated = db.execute(
+                update(MediaBlob)
+                .where(MediaBlob.sha256 == sha256)
+                .values(ref_count=MediaBlob.ref_count + 1, last_referenced_at=now)
+            ).rowcount
+            if updated:
+                return
+            try:
+                with db.begin_nested():
+                    db.add(
+                        MediaBlob(
+                            sha256=sha256,
+                            size=size,
+                            content_type=content_type,
+                            ref_count=1,
+                            last_referenced_at=now,
+                        )
+                    )
+                return
+            except IntegrityError:
+                # Inserted concurrently; count on the existing row instead.
+                continue
+        raise RuntimeError(f"could not reference blob {sha256}")
+
+    def release(self, db: Session, url_or_name: Optional[str], count: int = 1) -> None:
+        """Drop references to the blob a URL points at; other URLs are ignored.
+        Not committed. The file stays until the sweep finds it unreferenced."""
+        sha256 = blob_sha256(str(url_or_name or "").rsplit("/", 1)[-1])
+        if sha256 is None or count <= 0:
+            return
+        db.execute(
+            update(MediaBlob)
+            .where(MediaBlob.sha256 == sha256, MediaBlob.ref_count > 0)
+            .values(ref_count=case((MediaBlob.ref_count > count, MediaBlob.ref_count - count), else_=0))
+        )
+
+    def privatize_message_attachments(self, db: Session) -> int:
+        """Give attachments whose URLs still name a public blob (sent before
+        attachments were private) private blobs and new names. Each message
+        is re-checked under a row lock, so concurrent runs rewrite it once.
+        Commits per message; returns the number of messages rewritten."""
+        pending = []
+        for message_id, value in db.query(Message.id, Message.attachments).filter(Message.attachments.isnot(None)):
+            text = value if isinstance(value, str) else json.dumps(value)
+            if _PUBLIC_ATTACHMENT_REFERENCE.search(text):
+                pending.append(message_id)
+
+        def rename(match: "re.Match[str]") -> str:
+            name = self.privatize_attachment(db, match.group(1), match.group(2) or "")
+            return f"/messages/uploads/{name}" if name is not None else match.group(0)
+
+        rewritten = 0
+        for message_id in pending:
+            message = db.query(Message).filter(Message.id == message_id).with_for_update().first()
+            attachments = message.attachments if message is not None else None
+            if not isinstance(attachments, list) or not any(
+                isinstance(item, str) and _PUBLIC_ATTACHMENT_REFERENCE.search(item) for item in attachments
+            ):
+                db.rollback()
+                continue
+            message.attachments = [
+                _PUBLIC_ATTACHMENT_REFERENCE.sub(rename, item) if isinstance(item, str) else item
+                for item in attachments
+            ]
+            db.commit()
+            rewritten += 1
+        return rewritten
+
+    # Garbage collection
+
+    @staticmethod
+    def count_references(db: Session) -> Counter:
+        """References per digest, counted from the rows that store upload URLs."""
+        counts: Counter = Counter()
+
+        def scan(values: Iterable[Any]) -> None:
+            for (value,) in values:
+                text = value if isinstance(value, str) else json.dumps(value)
+                counts.update(_REFERENCE.findall(text))
+
+        for column in (
+            User.avatar_url,
+            User.cover_image_url,
+            Venture.logo_url,
+            Venture.banner_url,
+            Venture.pitch_deck_url,
+            Venture.demo_video_url,
+            PitchSession.video_url,
+            PitchSession.audio_url,
+        ):
+            scan(db.query(column).filter(column.like("%uploads/%")).yield_per(1000))
+        attachment_names: Counter = Counter()
+        for (value,) in db.query(Message.attachments).filter(Message.attachments.isnot(None)).yield_per(1000):
+            text = value if isinstance(value, str) else json.dumps(value)
+            attachment_names.update(_ATTACHMENT_REFERENCE.findall(text))
+            counts.update(_REFERENCE.findall(text))
+        names = list(attachment_names)
+        for start in range(0, len(names), 500):
+            for name, blob_key in db.query(MessageAttachmentFile.name, MessageAttachmentFile.blob_key).filter(
+                MessageAttachmentFile.name.in_(names[start : start + 500])
+            ):
+                counts[blob_key] += attachment_names[name]
+        # Transcodes still reading their source.
+        scan(
+            db.query(PitchVideoJob.source_path)
+            .filter(PitchVideoJob.status.in_(("queued", "running")))
+            .yield_per(1000)
+        )
+        return counts
+
+    def sweep(self, db: Session) -> Dict[str, int]:
+        """Reconcile reference counts and delete long-unreferenced blobs."""
+        started = time.perf_counter()
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.UPLOAD_GC_GRACE_HOURS)
+        references = self.count_references(db)
+        stats = {"blobs": 0, "recounted": 0, "deleted": 0, "deleted_bytes": 0, "stray_files": 0}
+
+        rows = db.query(MediaBlob.sha256, MediaBlob.ref_count, MediaBlob.size).all()
+        known = set()
+        for sha256, ref_count, size in rows:
+            known.add(sha256)
+            stats["blobs"] += 1
+            actual = references.get(sha256, 0)
+            if ref_count != actual:
+                # Only if no upload changed the count since it was read.
+                stats["recounted"] += db.execute(
+                    update(MediaBlob)
+                    .where(MediaBlob.sha256 == sha256, MediaBlob.ref_count == ref_count)
+                    .values(ref_count=actual)
+                ).rowcount
+                db.commit()
+            if actual:
+                continue
+            deleted = db.execute(
+                delete(MediaBlob).where(
+                    MediaBlob.sha256 == sha256,
+                    MediaBlob.ref_count <= 0,
+                    MediaBlob.last_referenced_at < cutoff,
+                )
+            ).rowcount
+            db.commit()
+            if deleted and self._remove_file(db, sha256):
+                # Names of attachments nobody sent; newer ones belong to a
+                # concurrent upload of the same content.
+                db.execute(
+                    delete(MessageAttachmentFile).where(
+                        MessageAttachmentFile.blob_key == sha256, MessageAttachmentFile.created_at < cutoff
+                    )
+                )
+                db.commit()
+                known.discard(sha256)
+                stats["deleted"] += 1
+                stats["deleted_bytes"] += int(size or 0)
+
+        stats["stray_files"] = self._remove_strays(db, known, cutoff.timestamp())
+        stats["duration_ms"] = round((time.perf_counter() - started) * 1000)
+        return stats
+
+    def _remove_file(self, db: Session, sha256: str) -> bool:
+        path = self.path_for(sha256)
+        tombstone = path.with_name(f".{sha256}.{secrets.token_hex(4)}.deleted")
+        try:
+            os.replace(path, tombstone)
+        except FileNotFoundError:
+            return True
+        # An upload of the same content may have referenced it meanwhile; it
+        # commits its reference before placing the file, so either it is
+        # visible now or the file it places arrives after this rename.
+        if db.get(MediaBlob, sha256) is not None:
+            if not path.exists():
+                os.replace(tombstone, path)
+            else:
+                tombstone.unlink(missing_ok=True)
+            return False
+        tombstone.unlink(missing_ok=True)
+        from .image_variants import image_variants
+
+        image_variants.remove(sha256)
+        return True
+
+    def _remove_strays(self, db: Session, known: set, older_than: float) -> int:
+        """Blob files without a row (crash between commit and rename) and
+        abandoned staging files."""
+        removed = 0
+        if not self.root.is_dir():
+            return 0
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                try:
+                    if path.stat().st_mtime >= older_than:
+                        continue
+                except FileNotFoundError:
+                    continue
+                sha256 = blob_sha256(filename)
+                if sha256 is not None and (sha256 in known or db.get(MediaBlob, sha256) is not None):
+                    continue
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def sweep_once(self) -> Dict[str, int]:
+        db = SessionLocal()
+        try:
+            return self.sweep(db)
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                stats = await asyncio.to_thread(self.sweep_once)
+                if stats["deleted"] or stats["stray_files"]:
+                    logger.info("upload sweep: %s", stats)
+            except Exception as exc:  # pragma: no cover
+                logger.warning("upload sweep failed: %s", exc)
+            await asyncio.sleep(settings.UPLOAD_GC_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        """Start the periodic sweep on the running event loop (idempotent)."""
+        if settings.UPLOAD_GC_INTERVAL_SECONDS <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_READ_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+blob_store = BlobStore()
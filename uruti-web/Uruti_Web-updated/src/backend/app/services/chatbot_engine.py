@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import os
 import time
 from pathlib import Path
@@ -8,6 +9,35 @@ from typing import Any
 from ..config import settings
 
 
+# llama-cpp constructor kwargs that can come from the benchmark tuning file.
+_TUNABLE_KEYS = frozenset(
+    {
+        "n_threads",
+        "n_threads_batch",
+        "n_batch",
+        "n_ubatch",
+        "n_gpu_layers",
+        "use_mmap",
+        "use_mlock",
+        "flash_attn",
+        "type_k",
+        "type_v",
+    }
+)
+
+
+def _ggml_type(name: str) -> int | str:
+    """Map a KV-cache type name such as "q8_0" to llama-cpp's GGML enum value."""
+    try:
+        import llama_cpp  # type: ignore
+    except Exception:
+        return name
+    value = getattr(llama_cpp, f"GGML_TYPE_{name.strip().upper()}", None)
+    if value is None:
+        raise ValueError(f"unknown GGML cache type: {name}")
+    return int(value)
+
+
 class ChatbotEngine:
     """Runtime chatbot engine with optional llama-cpp GGUF backend.
 
@@ -29,6 +59,11 @@ class ChatbotEngine:
         self.temperature = settings.URUTI_CHATBOT_TEMPERATURE
         self.max_tokens = settings.URUTI_CHATBOT_MAX_TOKENS
         self.ctx = settings.URUTI_CHATBOT_CTX
+        self.tuning_source: str | None = None
+        self._llama_kwargs: dict[str, Any] | None = None
+        # Resolved once: status() reports it on every chat models lookup.
+        self._workspace_root = self._resolve_workspace_root()
+        self._tuning_file = self._resolve_tuning_file()
 
     def _resolve_workspace_root(self) -> Path:
         here = Path(__file__).resolve()
@@ -41,7 +76,7 @@ class ChatbotEngine:
         if self.local_path and os.path.exists(self.local_path):
             return self.local_path
 
-        workspace_root = self._resolve_workspace_root()
+        workspace_root = self._workspace_root
         candidates = [
             workspace_root / "Models" / "Uruti chatbot",
             workspace_root / "Models",
@@ -58,6 +93,54 @@ class ChatbotEngine:
                     return str(gguf)
         return None
 
+    def _resolve_tuning_file(self) -> Path:
+        configured = settings.URUTI_CHATBOT_TUNING_FILE
+        if configured:
+            return Path(configured).expanduser()
+        return self._workspace_root / "Models" / "Uruti chatbot" / "llama_cpp_tuning.json"
+
+    def tuning_file_path(self) -> Path:
+        return self._tuning_file
+
+    def _load_tuning(self) -> dict[str, Any]:
+        """Read the benchmark-recommended llama-cpp settings, if any."""
+        path = self.tuning_file_path()
+        if not path.exists():
+            return {}
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+        recommended = payload.get("recommended") if isinstance(payload, dict) else None
+        if not isinstance(recommended, dict):
+            return {}
+        self.tuning_source = str(path)
+        return {key: value for key, value in recommended.items() if key in _TUNABLE_KEYS}
+
+    def llama_kwargs(self) -> dict[str, Any]:
+        """Performance kwargs for `Llama(...)`: explicit settings > tuning file > llama-cpp defaults."""
+        kwargs: dict[str, Any] = {"n_ctx": self.ctx, "verbose": False}
+        kwargs.update(self._load_tuning())
+
+        explicit = {
+            "n_threads": settings.URUTI_CHATBOT_N_THREADS,
+            "n_threads_batch": settings.URUTI_CHATBOT_N_THREADS_BATCH,
+            "n_batch": settings.URUTI_CHATBOT_N_BATCH,
+            "n_ubatch": settings.URUTI_CHATBOT_N_UBATCH,
+            "n_gpu_layers": settings.URUTI_CHATBOT_N_GPU_LAYERS,
+            "use_mmap": settings.URUTI_CHATBOT_USE_MMAP,
+            "use_mlock": settings.URUTI_CHATBOT_USE_MLOCK,
+            "flash_attn": settings.URUTI_CHATBOT_FLASH_ATTN,
+            "type_k": settings.URUTI_CHATBOT_CACHE_TYPE_K,
+            "type_v": settings.URUTI_CHATBOT_CACHE_TYPE_V,
+        }
+        kwargs.update({key: value for key, value in explicit.items() if value is not None})
+
+        for key in ("type_k", "type_v"):
+            if isinstance(kwargs.get(key), str):
+                kwargs[key] = _ggml_type(kwargs[key])
+        return kwargs
+
     def _hf_token(self) -> str | None:
         return (
             settings.HF_TOKEN
@@ -83,6 +166,12 @@ class ChatbotEngine:
         self._load_error = None
         self._last_load_attempt = now
 
+        if settings.URUTI_FAKE_LLM:
+            from .fake_llm import FakeLatencyProfile, FakeLlama
+
+            self.set_backend(FakeLlama(FakeLatencyProfile.from_settings("llm")))
+            return
+
         try:
             from llama_cpp import Llama  # type: ignore
         except Exception as exc:
@@ -90,14 +179,12 @@ class ChatbotEngine:
             raise RuntimeError(self._load_error) from exc
 
         try:
+            llama_kwargs = self.llama_kwargs()
+            self._llama_kwargs = {key: value for key, value in llama_kwargs.items() if key != "verbose"}
             resolved_local = self._discover_local_model()
             if resolved_local and os.path.exists(resolved_local):
                 self.local_path = resolved_local
-                self._llm = Llama(
-                    model_path=resolved_local,
-                    n_ctx=self.ctx,
-                    verbose=False,
-                )
+                self._llm = Llama(model_path=resolved_local, **llama_kwargs)
                 return
 
             token = self._hf_token()
@@ -106,20 +193,25 @@ class ChatbotEngine:
                     repo_id=self.repo_id,
                     filename=self.filename,
                     token=token,
-                    n_ctx=self.ctx,
-                    verbose=False,
+                    **llama_kwargs,
                 )
             else:
                 self._llm = Llama.from_pretrained(
                     repo_id=self.repo_id,
                     filename=self.filename,
-                    n_ctx=self.ctx,
-                    verbose=False,
+                    **llama_kwargs,
                 )
         except Exception as exc:
             self._load_error = f"failed to load GGUF chatbot model: {exc}"
             raise RuntimeError(self._load_error) from exc
 
+    def set_backend(self, llm: Any) -> None:
+        """Install an already-built backend (e.g. `FakeLlama` for load tests)."""
+        self._llm = llm
+        self._load_error = None
+        self._startup_init_started = True
+        self._startup_init_completed = True
+
     def warmup(self) -> None:
         """Best-effort eager chatbot model load to reduce first-message latency."""
         self._startup_init_started = True
@@ -160,6 +252,7 @@ class ChatbotEngine:
         local_exists = bool(self.local_path and os.path.exists(self.local_path))
         return {
             "loaded": self._llm is not None,
+            "backend": self._llm.__class__.__name__ if self._llm is not None else None,
             "load_error": self._load_error,
             "last_load_attempt": self._last_load_attempt,
             "retry_after_seconds": self._retry_after_seconds,
@@ -171,6 +264,9 @@ class ChatbotEngine:
             "max_tokens": self.max_tokens,
             "temperature": self.temperature,
             "hf_token_configured": bool(self._hf_token()),
+            "llama_kwargs": self._llama_kwargs,
+            "tuning_file": str(self.tuning_file_path()),
+            "tuning_source": self.tuning_source,
             "startup_init_started": self._startup_init_started,
             "startup_init_completed": self._startup_init_completed,
         }
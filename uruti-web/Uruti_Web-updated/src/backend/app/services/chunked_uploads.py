@@ -0,0 +1,274 @@
+"""Resumable chunked uploads for pitch videos and message attachments.
+
+Protocol (under /api/v1/uploads):
+
+    POST /uploads                  {purpose, file_name, content_type, size, metadata}
+                                   -> {upload_id, chunk_size, offset}
+    GET  /uploads/{id}             -> {offset, size, ...}  (where to resume)
+    PUT  /uploads/{id}?offset=N    raw bytes of the next chunk -> {offset}
+    POST /uploads/{id}/complete    {sha256?} -> same result as the one-shot upload
+
+Chunks are appended in order. A PUT whose offset is not the current end of
+the partial file gets 409 with the current offset, so a client that lost its
+connection resumes from there. Request bodies are streamed to disk through a
+bounded buffer, never held whole in memory, and the declared size is checked
+against the purpose's limit up front and enforced byte by byte.
+
+The SHA-256 is updated as chunks arrive. The hasher lives in the process
+that received the chunks; if a chunk went to another worker, or the process
+restarted, the digest is recomputed from the file when the upload completes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import secrets
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import UploadSession
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+PURPOSES = ("pitch_video", "message_attachment")
+
+# Request bytes are written to disk once this much has been buffered.
+_WRITE_BUFFER_BYTES = 1024 * 1024
+
+
+class UploadRejected(Exception):
+    def __init__(self, status_code: int, detail: str, **extra: Any) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.extra = extra
+
+
+def size_limit(purpose: str) -> int:
+    if purpose == "pitch_video":
+        return settings.MAX_PITCH_VIDEO_SIZE
+    return settings.MAX_UPLOAD_SIZE
+
+
+class ChunkedUploads:
+    def __init__(self) -> None:
+        # upload id -> (offset the hasher has consumed, hasher)
+        self._hashers: Dict[str, tuple[int, Any]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @property
+    def staging_dir(self) -> Path:
+        path = Path(settings.UPLOAD_DIR) / ".partial"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def part_path(self, upload_id: str) -> Path:
+        return self.staging_dir / f"{upload_id}.part"
+
+    def create(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        purpose: str,
+        file_name: str,
+        content_type: Optional[str],
+        size: int,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> UploadSession:
+        if purpose not in PURPOSES:
+            raise UploadRejected(400, f"Unknown upload purpose: {purpose}")
+        if size <= 0:
+            raise UploadRejected(400, "size must be positive")
+        limit = size_limit(purpose)
+        if size > limit:
+            raise UploadRejected(413, f"File is too large (limit {limit} bytes)")
+
+        self.purge_expired(db)
+        upload = UploadSession(
+            id=secrets.token_urlsafe(24),
+            user_id=user_id,
+            purpose=purpose,
+            file_name=Path(file_name or "upload").name,
+            content_type=content_type,
+            total_size=size,
+            received_bytes=0,
+            meta=meta or {},
+        )
+        self.part_path(upload.id).touch()
+        self._hashers[upload.id] = (0, hashlib.sha256())
+        db.add(upload)
+        db.commit()
+        db.refresh(upload)
+        return upload
+
+    def get(self, db: Session, upload_id: str, user_id: int) -> UploadSession:
+        upload = db.get(UploadSession, upload_id)
+        if upload is None or upload.user_id != user_id:
+            raise UploadRejected(404, "Upload not found")
+        return upload
+
+    def offset(self, upload: UploadSession) -> int:
+        """Bytes on disk; the partial file is the source of truth."""
+        try:
+            return self.part_path(upload.id).stat().st_size
+        except FileNotFoundError:
+            raise UploadRejected(410, "Upload data has expired; start a new upload")
+
+    async def write_chunk(
+        self,
+        db: Session,
+        upload: UploadSession,
+        offset: int,
+        chunk: AsyncIterator[bytes],
+        content_length: Optional[int] = None,
+    ) -> int:
+        """Append one chunk at `offset`; returns the new offset.
+
+        Bytes received before a dropped connection are kept, so the next
+        attempt resumes after them.
+        """
+        if upload.sha256:
+            raise UploadRejected(409, "Upload already completed", offset=upload.total_size)
+        remaining = int(upload.total_size) - offset
+        if content_length is not None and (
+            content_length > settings.UPLOAD_MAX_CHUNK_BYTES or content_length > remaining
+        ):
+            raise UploadRejected(413, "Chunk is too large")
+
+        lock = self._locks.setdefault(upload.id, asyncio.Lock())
+        if lock.locked():
+            raise UploadRejected(409, "Another chunk for this upload is in progress")
+        async with lock:
+            path = self.part_path(upload.id)
+            if not path.exists():
+                raise UploadRejected(410, "Upload data has expired; start a new upload")
+            handle = open(path, "r+b")
+            try:
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        raise UploadRejected(409, "Another chunk for this upload is in progress")
+
+                current = os.fstat(handle.fileno()).st_size
+                if offset != current:
+                    raise UploadRejected(409, "Offset does not match the uploaded data", offset=current)
+                handle.seek(current)
+
+                hashed_offset, hasher = self._hashers.get(upload.id, (-1, None))
+                if hashed_offset != current:
+                    # Earlier bytes came through another process; rehash at completion.
+                    hasher = None
+                    self._hashers.pop(upload.id, None)
+
+                written = 0
+                chunk_limit = min(settings.UPLOAD_MAX_CHUNK_BYTES, remaining)
+                buffer = bytearray()
+                try:
+                    async for piece in chunk:
+                        if written + len(buffer) + len(piece) > chunk_limit:
+                            raise UploadRejected(413, "Chunk exceeds the declared upload size or chunk limit")
+                        buffer += piece
+                        if len(buffer) >= _WRITE_BUFFER_BYTES:
+                            written += await asyncio.to_thread(_append, handle, bytes(buffer), hasher)
+                            buffer.clear()
+                finally:
+                    # Also on disconnect or rejection: keep what arrived intact.
+                    if buffer:
+                        written += await asyncio.to_thread(_append, handle, bytes(buffer), hasher)
+                    await asyncio.to_thread(handle.flush)
+                    new_offset = current + written
+                    if hasher is not None:
+                        self._hashers[upload.id] = (new_offset, hasher)
+                    upload.received_bytes = new_offset
+                    db.commit()
+                return new_offset
+            finally:
+                handle.close()
+
+    async def finish(self, db: Session, upload: UploadSession, expected_sha256: Optional[str] = None) -> Path:
+        """Check size and digest; returns the complete file for the caller to move."""
+        received = self.offset(upload)
+        if received != int(upload.total_size):
+            raise UploadRejected(409, "Upload is incomplete", offset=received)
+
+        path = self.part_path(upload.id)
+        hashed_offset, hasher = self._hashers.pop(upload.id, (-1, None))
+        if hasher is not None and hashed_offset == received:
+            digest = hasher.hexdigest()
+        elif upload.sha256:
+            # A retried completion; the file cannot change once it is full.
+            digest = upload.sha256
+        else:
+            digest = await asyncio.to_thread(_file_sha256, path)
+        if expected_sha256 and expected_sha256.strip().lower() != digest:
+            raise UploadRejected(422, "Checksum mismatch", sha256=digest)
+
+        upload.sha256 = digest
+        db.commit()
+        return path
+
+    def discard(self, db: Session, upload: UploadSession) -> None:
+        self._hashers.pop(upload.id, None)
+        self._locks.pop(upload.id, None)
+        self.part_path(upload.id).unlink(missing_ok=True)
+        db.delete(upload)
+        db.commit()
+
+    def purge_expired(self, db: Session) -> int:
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS)
+        expired = (
+            db.query(UploadSession)
+            .filter(UploadSession.created_at < cutoff)
+            .all()
+        )
+        for upload in expired:
+            self._hashers.pop(upload.id, None)
+            self._locks.pop(upload.id, None)
+            self.part_path(upload.id).unlink(missing_ok=True)
+            db.delete(upload)
+        if expired:
+            db.commit()
+        return len(expired)
+
+    @staticmethod
+    def describe(upload: UploadSession, offset: int) -> Dict[str, Any]:
+        return {
+            "upload_id": upload.id,
+            "purpose": upload.purpose,
+            "file_name": upload.file_name,
+            "size": int(upload.total_size),
+            "offset": offset,
+            "chunk_size": settings.UPLOAD_CHUNK_SIZE,
+            "max_chunk_bytes": settings.UPLOAD_MAX_CHUNK_BYTES,
+            "completed": bool(upload.sha256),
+            "sha256": upload.sha256,
+        }
+
+
+def _append(handle: Any, data: bytes, hasher: Any) -> int:
+    handle.write(data)
+    if hasher is not None:
+        hasher.update(data)
+    return len(data)
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+chunked_uploads = ChunkedUploads()
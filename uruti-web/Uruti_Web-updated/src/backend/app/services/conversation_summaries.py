@@ -0,0 +1,322 @@
+"""Conversation summaries maintained on write.
+
+`conversation_summaries` has one row per user and peer with at least one
+message between them: the latest message (id, time, preview) and how many
+incoming messages are unread and not archived, the same count the inbox
+used to compute per connection. The conversation list reads it with one
+range scan on (user_id, last_message_at).
+
+The message endpoints update it in the same transaction as the messages
+themselves:
+
+- `record_message` when a message is sent;
+- `mark_read` when one unread message is read or archived;
+- `clear_unread` when a whole thread is marked read;
+- `refresh_pair` after a single message is deleted (recomputed from the
+  pair's messages through the composite messages indexes);
+- `remove_pair` when a thread is deleted.
+
+`ConversationSummaryRebuild` recomputes the table from `messages` in chunks
+of users, as a backfill for existing databases (started automatically when
+the table is empty) and as a repair job for admins.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, case, delete, func, insert, literal, or_, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import ConversationSummary, Message, User
+
+logger = logging.getLogger(__name__)
+
+# Characters of the latest message kept for the conversation list.
+PREVIEW_CHARS = 280
+
+
+def _preview(body: Optional[str]) -> str:
+    return (body or "")[:PREVIEW_CHARS]
+
+
+def _sides(message: Message) -> List[tuple[int, int, int]]:
+    """(user, peer, unread increment) for each side of a new message."""
+    if message.sender_id == message.receiver_id:
+        return [(message.receiver_id, message.sender_id, 1)]
+    return [(message.sender_id, message.receiver_id, 0), (message.receiver_id, message.sender_id, 1)]
+
+
+def record_message(db: Session, message: Message) -> None:
+    """Make a new message the latest of its conversation and count it as
+    unread for the receiver. The message must be flushed with created_at
+    loaded. Not committed."""
+    preview = _preview(message.body)
+    summary = ConversationSummary
+    for user_id, peer_id, unread in _sides(message):
+        newer = or_(summary.last_message_id.is_(None), summary.last_message_id < message.id)
+        for _ in range(2):
+            updated = db.execute(
+                update(summary)
+                .where(summary.user_id == user_id, summary.peer_id == peer_id)
+                .values(
+                    last_message_id=case((newer, message.id), else_=summary.last_message_id),
+                    last_message_at=case((newer, message.created_at), else_=summary.last_message_at),
+                    preview=case((newer, preview), else_=summary.preview),
+                    unread_count=summary.unread_count + unread,
+                )
+            ).rowcount
+            if updated:
+                break
+            try:
+                with db.begin_nested():
+                    db.add(
+                        ConversationSummary(
+                            user_id=user_id,
+                            peer_id=peer_id,
+                            last_message_id=message.id,
+                            last_message_at=message.created_at,
+                            preview=preview,
+                            unread_count=unread,
+                        )
+                    )
+                break
+            except IntegrityError:
+                # Created concurrently; update that row instead.
+                continue
+        else:
+            raise RuntimeError(f"could not update conversation summary {user_id}/{peer_id}")
+
+
+def mark_read(db: Session, message: Message) -> None:
+    """Call before an unread, unarchived incoming message is marked read or
+    archived. Not committed."""
+    if message.is_read or message.is_archived:
+        return
+    summary = ConversationSummary
+    db.execute(
+        update(summary)
+        .where(summary.user_id == message.receiver_id, summary.peer_id == message.sender_id)
+        .values(unread_count=case((summary.unread_count > 1, summary.unread_count - 1), else_=0))
+    )
+
+
+def clear_unread(db: Session, user_id: int, peer_id: int) -> None:
+    """All incoming messages from `peer_id` were read. Not committed."""
+    db.execute(
+        update(ConversationSummary)
+        .where(ConversationSummary.user_id == user_id, ConversationSummary.peer_id == peer_id)
+        .values(unread_count=0)
+    )
+
+
+def remove_pair(db: Session, user_id: int, peer_id: int) -> None:
+    """The conversation between the two users is gone. Not committed."""
+    db.execute(
+        delete(ConversationSummary).where(
+            or_(
+                and_(ConversationSummary.user_id == user_id, ConversationSummary.peer_id == peer_id),
+                and_(ConversationSummary.user_id == peer_id, ConversationSummary.peer_id == user_id),
+            )
+        )
+    )
+
+
+def refresh_pair(db: Session, user_id: int, peer_id: int) -> None:
+    """Recompute both sides of a conversation from its messages. Not committed."""
+    latest = (
+        db.query(Message.id, Message.created_at, Message.body)
+        .filter(
+            or_(
+                (Message.sender_id == user_id) & (Message.receiver_id == peer_id),
+                (Message.sender_id == peer_id) & (Message.receiver_id == user_id),
+            )
+        )
+        .order_by(Message.created_at.desc(), Message.id.desc())
+        .first()
+    )
+    remove_pair(db, user_id, peer_id)
+    if latest is None:
+        return
+    for owner, other in {(user_id, peer_id), (peer_id, user_id)}:
+        unread = (
+            db.query(func.count(Message.id))
+            .filter(
+                Message.sender_id == other,
+                Message.receiver_id == owner,
+                Message.is_read == False,
+                Message.is_archived == False,
+            )
+            .scalar()
+        )
+        db.add(
+            ConversationSummary(
+                user_id=owner,
+                peer_id=other,
+                last_message_id=latest.id,
+                last_message_at=latest.created_at,
+                preview=_preview(latest.body),
+                unread_count=int(unread or 0),
+            )
+        )
+    db.flush()
+
+
+def compute_summaries(db: Session, first_user_id: int, last_user_id: int) -> List[Dict[str, Any]]:
+    """Summary rows of the users with ids in [first_user_id, last_user_id],
+    computed from `messages` with window functions in one query."""
+    both = union_all(
+        select(
+            Message.id.label("message_id"),
+            Message.sender_id.label("user_id"),
+            Message.receiver_id.label("peer_id"),
+            Message.created_at.label("created_at"),
+            literal(0).label("unread"),
+        ).where(
+            Message.sender_id.between(first_user_id, last_user_id),
+            # Messages to oneself are counted once, as received.
+            Message.receiver_id != Message.sender_id,
+        ),
+        select(
+            Message.id,
+            Message.receiver_id,
+            Message.sender_id,
+            Message.created_at,
+            case((and_(Message.is_read == False, Message.is_archived == False), 1), else_=0),
+        ).where(Message.receiver_id.between(first_user_id, last_user_id)),
+    ).subquery()
+    partition = (both.c.user_id, both.c.peer_id)
+    ranked = select(
+        both.c.message_id,
+        both.c.user_id,
+        both.c.peer_id,
+        func.row_number()
+        .over(partition_by=partition, order_by=(both.c.created_at.desc(), both.c.message_id.desc()))
+        .label("rank"),
+        func.sum(both.c.unread).over(partition_by=partition).label("unread_count"),
+    ).subquery()
+    rows = db.execute(
+        select(ranked.c.user_id, ranked.c.peer_id, Message.id, Message.created_at, Message.body, ranked.c.unread_count)
+        .join(Message, Message.id == ranked.c.message_id)
+        .where(ranked.c.rank == 1)
+    ).all()
+    return [
+        {
+            "user_id": row[0],
+            "peer_id": row[1],
+            "last_message_id": row[2],
+            "last_message_at": row[3],
+            "preview": _preview(row[4]),
+            "unread_count": int(row[5] or 0),
+        }
+        for row in rows
+    ]
+
+
+class ConversationSummaryRebuild:
+    """Rebuilds conversation summaries from messages, a chunk of users at a
+    time; at most one rebuild per process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = {"status": "idle"}
+
+    def is_running(self) -> bool:
+        return self._state.get("status") == "running"
+
+    def describe(self) -> Dict[str, Any]:
+        return dict(self._state)
+
+    def start(self, *, chunk_size: int = 500, after_user_id: int = 0) -> Dict[str, Any]:
+        """Reserve the runner; `run` then processes users with id > after_user_id.
+        Raises RuntimeError if a rebuild is already running."""
+        with self._lock:
+            if self.is_running():
+                raise RuntimeError("A conversation summary rebuild is already running")
+            self._state = {
+                "status": "running",
+                "chunk_size": chunk_size,
+                "last_user_id": after_user_id,
+                "processed_users": 0,
+                "summaries": 0,
+                "error": None,
+                "started_at": datetime.now(timezone.utc),
+                "finished_at": None,
+            }
+            return self.describe()
+
+    def run(self) -> None:
+        """Process the reserved rebuild chunk by chunk. Meant to run in a
+        worker thread; a failed rebuild can be resumed from last_user_id."""
+        state = self._state
+        db = SessionLocal()
+        try:
+            while True:
+                user_ids = [
+                    row[0]
+                    for row in db.query(User.id)
+                    .filter(User.id > state["last_user_id"])
+                    .order_by(User.id)
+                    .limit(state["chunk_size"])
+                    .all()
+                ]
+                if not user_ids:
+                    break
+                written = self._rebuild_chunk(db, user_ids[0], user_ids[-1])
+                state["last_user_id"] = user_ids[-1]
+                state["processed_users"] += len(user_ids)
+                state["summaries"] += written
+            state["status"] = "completed"
+        except Exception as exc:
+            logger.exception("conversation summary rebuild failed")
+            db.rollback()
+            state["status"] = "failed"
+            state["error"] = str(exc)
+        finally:
+            state["finished_at"] = datetime.now(timezone.utc)
+            db.close()
+
+    @staticmethod
+    def _rebuild_chunk(db: Session, first_user_id: int, last_user_id: int) -> int:
+        for attempt in range(2):
+            try:
+                rows = compute_summaries(db, first_user_id, last_user_id)
+                db.execute(
+                    delete(ConversationSummary).where(ConversationSummary.user_id.between(first_user_id, last_user_id))
+                )
+                if rows:
+                    db.execute(insert(ConversationSummary), rows)
+                db.commit()
+                return len(rows)
+            except IntegrityError:
+                # A message was sent into this chunk meanwhile; recompute.
+                db.rollback()
+                if attempt:
+                    raise
+        return 0
+
+    def backfill_if_empty(self) -> bool:
+        """Rebuild in the calling thread if there are messages but no
+        summaries yet (first start after the table was added)."""
+        db = SessionLocal()
+        try:
+            has_summaries = db.query(ConversationSummary.user_id).first() is not None
+            has_messages = db.query(Message.id).first() is not None
+        finally:
+            db.close()
+        if has_summaries or not has_messages:
+            return False
+        try:
+            self.start()
+        except RuntimeError:
+            return False
+        self.run()
+        return True
+
+
+conversation_summary_rebuild = ConversationSummaryRebuild()
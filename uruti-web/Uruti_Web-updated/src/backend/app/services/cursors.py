@@ -0,0 +1,31 @@
+"""Opaque keyset cursors for (created_at, id) ordered lists.
+
+A cursor names one row by its creation time and id, encoded as URL-safe
+base64 so clients treat it as a token. Pages are then selected with
+`(created_at, id) < cursor` or `> cursor` against an index ending in
+(created_at, id), which costs the same at any depth, unlike OFFSET.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+
+_SEPARATOR = "|"
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: int) -> str:
+    raw = f"{created_at.isoformat() if created_at else ''}{_SEPARATOR}{int(row_id)}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Optional[datetime], int]:
+    """(created_at, id) of a cursor; ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode("utf-8")
+        stamp, _, row_id = raw.rpartition(_SEPARATOR)
+        return (datetime.fromisoformat(stamp) if stamp else None), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
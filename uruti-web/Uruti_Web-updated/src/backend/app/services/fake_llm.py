@@ -0,0 +1,110 @@
+"""Fake LLM backends for load testing the chat endpoints without real models.
+
+`FakeLlama` mimics the part of `llama_cpp.Llama` that `ChatbotEngine` uses and
+`FakeGemini` mimics `_gemini_response` in the chatbot router. Both block the
+calling thread for a sampled generation time, so queueing, timeouts and
+fallbacks behave like they would with real backends.
+
+Enable them for a whole service with `URUTI_FAKE_LLM=true`, or install them
+programmatically via `chatbot_engine.set_backend(...)` and
+`routers.chatbot.set_gemini_backend(...)` (see `app.bench.chat_load`).
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from ..config import settings
+
+
+@dataclass
+class FakeLatencyProfile:
+    """Generation time = first-token latency + tokens / token rate, with log-normal jitter."""
+
+    first_token_ms: float = 250.0
+    tokens_per_second: float = 12.0
+    response_tokens: int = 160
+    jitter: float = 0.3
+    failure_rate: float = 0.0
+
+    @classmethod
+    def from_settings(cls, backend: str) -> "FakeLatencyProfile":
+        prefix = f"URUTI_FAKE_{backend.upper()}_"
+        return cls(
+            first_token_ms=float(getattr(settings, f"{prefix}FIRST_TOKEN_MS")),
+            tokens_per_second=float(getattr(settings, f"{prefix}TOKENS_PER_SECOND")),
+            response_tokens=int(settings.URUTI_FAKE_LLM_RESPONSE_TOKENS),
+            jitter=float(settings.URUTI_FAKE_LLM_JITTER),
+            failure_rate=float(getattr(settings, f"{prefix}FAILURE_RATE")),
+        )
+
+    def sample_seconds(self, rng: random.Random, max_tokens: int | None = None) -> tuple[float, int]:
+        tokens = self.response_tokens if max_tokens is None else min(self.response_tokens, max_tokens)
+        tokens = max(1, int(tokens * rng.lognormvariate(0.0, self.jitter / 2)))
+        rate = max(self.tokens_per_second * rng.lognormvariate(0.0, self.jitter), 0.1)
+        first_token = self.first_token_ms / 1000.0 * rng.lognormvariate(0.0, self.jitter)
+        return first_token + tokens / rate, tokens
+
+
+class _FakeBackend:
+    def __init__(self, profile: FakeLatencyProfile, seed: int | None = None) -> None:
+        self.profile = profile
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+
+    def _simulate(self, max_tokens: int | None = None) -> int:
+        with self._lock:
+            self.calls += 1
+            seconds, tokens = self.profile.sample_seconds(self._rng, max_tokens)
+            failed = self._rng.random() < self.profile.failure_rate
+            if failed:
+                self.failures += 1
+        time.sleep(seconds)
+        if failed:
+            raise RuntimeError("fake backend injected failure")
+        return tokens
+
+    @staticmethod
+    def _text(tokens: int, prompt: str) -> str:
+        topic = " ".join(prompt.split()[:6]) or "your startup"
+        return f"[fake response about {topic}] " + " ".join(["insight"] * max(tokens - 6, 1))
+
+
+class FakeLlama(_FakeBackend):
+    """Stand-in for `llama_cpp.Llama.create_chat_completion`."""
+
+    def create_chat_completion(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: int | None = None,
+        **_: Any,
+    ) -> dict[str, Any]:
+        tokens = self._simulate(max_tokens)
+        prompt = str(messages[-1].get("content") or "") if messages else ""
+        return {
+            "choices": [{"message": {"role": "assistant", "content": self._text(tokens, prompt)}}],
+            "usage": {"completion_tokens": tokens},
+        }
+
+
+class FakeGemini(_FakeBackend):
+    """Stand-in for the Gemini call: returns `(text, error)` like `_gemini_response`."""
+
+    def __call__(
+        self,
+        user_text: str,
+        context: dict | None,
+        history: list[dict],
+    ) -> tuple[str | None, str | None]:
+        try:
+            tokens = self._simulate()
+        except RuntimeError as exc:
+            return None, f"fake Gemini error: {exc}"
+        return self._text(tokens, user_text), None
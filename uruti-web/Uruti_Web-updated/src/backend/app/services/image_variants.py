@@ -0,0 +1,227 @@
+"""Resized WebP/JPEG variants of uploaded images.
+
+Avatars, cover images and venture logos/banners are stored as uploaded,
+often multi-MB PNG or HEIC files. After an upload a background worker
+renders each distinct image once, at every size in VARIANT_SIZES (longest
+side, never upscaled) and in WebP and JPEG, next to the upload store:
+
+    uploads/variants/3f/a9/3fa9...e1_256.webp
+
+`GET /api/v1/profile/uploads/<sha256>.png?size=256` serves the smallest
+variant at least that large; `format=webp|jpeg` picks the encoding, which
+otherwise follows the Accept header. Until the variants exist the original
+is served with a short cache lifetime and rendering is queued, which also
+covers images uploaded before variants were introduced. Older flat uploads
+(not content-addressed) are always served as they are.
+
+Payloads reference the variants through `variant_url`.
+
+Pillow is optional: without it no variants are made and the originals are
+served. HEIC/HEIF sources additionally need pillow-heif.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import secrets
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from ..config import settings
+from .blob_store import blob_sha256, blob_store
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None  # type: ignore[assignment]
+    ImageOps = None  # type: ignore[assignment]
+
+try:
+    import pillow_heif  # type: ignore[import-not-found]
+
+    pillow_heif.register_heif_opener()
+except ImportError:  # pragma: no cover - optional dependency
+    pass
+
+logger = logging.getLogger(__name__)
+
+VARIANT_DIR_NAME = "variants"
+VARIANT_SIZES = (64, 256, 1024)
+VARIANT_FORMATS = ("webp", "jpeg")
+
+# Sizes referenced by payloads: avatars and logos in lists and cards,
+# covers and banners across the page.
+THUMBNAIL_SIZE = 256
+DISPLAY_SIZE = 1024
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".heic", ".heif"}
+
+# Shown while variants are pending; the same URL serves the variant soon after.
+PENDING_CACHE_CONTROL = "max-age=60"
+
+
+def is_variant_source(name: str) -> bool:
+    """Content-addressed images get variants; other uploads do not."""
+    return blob_sha256(name) is not None and Path(name).suffix in IMAGE_EXTENSIONS
+
+
+def variant_url(url: Optional[str], size: int) -> Optional[str]:
+    """URL of the `size` variant of an uploaded image; other URLs unchanged."""
+    if not url or "?" in url or not is_variant_source(url.rsplit("/", 1)[-1]):
+        return url
+    return f"{url}?size={size}"
+
+
+def variant_name(sha256: str, size: int, fmt: str) -> str:
+    return f"{sha256}_{size}.{fmt}"
+
+
+def pick_size(requested: int) -> int:
+    for size in VARIANT_SIZES:
+        if size >= requested:
+            return size
+    return VARIANT_SIZES[-1]
+
+
+@dataclass
+class Variant:
+    path: Path
+    stat: os.stat_result
+    name: str
+    negotiated: bool  # format chosen from the Accept header
+
+
+class ImageVariants:
+    """Renders image variants in a small thread pool, once per image."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: set[str] = set()
+        # Images Pillow could not read; not retried until restart.
+        self._failed: set[str] = set()
+
+    @staticmethod
+    def available() -> bool:
+        return Image is not None
+
+    @property
+    def root(self) -> Path:
+        return Path(settings.UPLOAD_DIR) / VARIANT_DIR_NAME
+
+    def path_for(self, name: str) -> Path:
+        return self.root / name[:2] / name[2:4] / name
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.IMAGE_VARIANT_WORKERS),
+                    thread_name_prefix="image-variants",
+                )
+            return self._executor
+
+    def submit(self, sha256: str) -> Optional[Future]:
+        """Queue rendering of all variants of a stored image (any thread)."""
+        if not self.available():
+            return None
+        with self._lock:
+            if sha256 in self._pending or sha256 in self._failed:
+                return None
+            self._pending.add(sha256)
+        try:
+            return self._pool().submit(self._generate_logged, sha256)
+        except RuntimeError:  # pool shut down
+            with self._lock:
+                self._pending.discard(sha256)
+            return None
+
+    def _generate_logged(self, sha256: str) -> None:
+        try:
+            self.generate(sha256)
+        except Exception as exc:
+            logger.warning("image variants for %s failed: %s", sha256, exc)
+            with self._lock:
+                self._failed.add(sha256)
+        finally:
+            with self._lock:
+                self._pending.discard(sha256)
+
+    def generate(self, sha256: str) -> List[Path]:
+        """Render the missing variants of blob `sha256`; returns the new files."""
+        targets = {
+            (size, fmt): self.path_for(variant_name(sha256, size, fmt))
+            for size in VARIANT_SIZES
+            for fmt in VARIANT_FORMATS
+        }
+        if all(path.exists() for path in targets.values()):
+            return []
+
+        largest = max(VARIANT_SIZES)
+        with Image.open(blob_store.path_for(sha256)) as opened:
+            # JPEG sources decode at a reduced scale when that is still big enough.
+            opened.draft("RGB", (largest, largest))
+            image = ImageOps.exif_transpose(opened)
+            has_alpha = image.mode in ("RGBA", "LA", "PA") or (
+                image.mode == "P" and "transparency" in image.info
+            )
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        written: List[Path] = []
+        # Largest first, each size downscaled from the previous one.
+        for size in sorted(VARIANT_SIZES, reverse=True):
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            for fmt in VARIANT_FORMATS:
+                path = targets[(size, fmt)]
+                if path.exists():
+                    continue
+                frame = image
+                if fmt == "jpeg" and has_alpha:
+                    frame = Image.new("RGB", image.size, (255, 255, 255))
+                    frame.paste(image, mask=image.getchannel("A"))
+                options = {"optimize": True, "progressive": True} if fmt == "jpeg" else {"method": 4}
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f".{path.name}.{secrets.token_hex(4)}.part")
+                try:
+                    frame.save(tmp_path, format=fmt.upper(), quality=settings.IMAGE_VARIANT_QUALITY, **options)
+                    os.replace(tmp_path, path)
+                finally:
+                    tmp_path.unlink(missing_ok=True)
+                written.append(path)
+        return written
+
+    def lookup(self, filename: str, size: int, fmt: Optional[str], accept: Optional[str]) -> Optional[Variant]:
+        """The stored variant for a `?size=` request, or None if there is none (yet)."""
+        sha256 = blob_sha256(filename)
+        if sha256 is None or not is_variant_source(filename):
+            return None
+        fmt = (fmt or "").lower()
+        fmt = "jpeg" if fmt == "jpg" else fmt
+        negotiated = fmt not in VARIANT_FORMATS
+        if negotiated:
+            fmt = "webp" if "image/webp" in (accept or "") else "jpeg"
+        name = variant_name(sha256, pick_size(size), fmt)
+        path = self.path_for(name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return Variant(path, st, name, negotiated)
+
+    def remove(self, sha256: str) -> None:
+        for size in VARIANT_SIZES:
+            for fmt in VARIANT_FORMATS:
+                self.path_for(variant_name(sha256, size, fmt)).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+image_variants = ImageVariants()
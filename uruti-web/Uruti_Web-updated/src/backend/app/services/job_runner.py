@@ -0,0 +1,158 @@
+"""Shared plumbing of the pitch video and pitch analysis background jobs.
+
+A job is a row (`PitchVideoJob`, `PitchAnalysisJob`) with `session_id`,
+`status`, `progress`, `error` and timestamps. `BackgroundJobRunner` runs them
+in a small dedicated thread pool: `submit` schedules a job from the event
+loop, `run` (implemented by each runner) starts by claiming it with `_claim`,
+and `requeue_interrupted` picks up what a previous process left behind.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import PitchSession
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundJobRunner:
+    """Runs jobs of `job_model` in a bounded thread pool.
+
+    `stale_seconds` is how long a running job may go without an update
+    before a restart runs it again; `niceness` is added to the subprocesses
+    it starts (see `preexec_fn`)."""
+
+    # The jobs run ffmpeg.
+    executable = "ffmpeg"
+
+    def __init__(
+        self,
+        job_model: Any,
+        *,
+        name: str,
+        workers: int,
+        stale_seconds: float,
+        niceness: int = 0,
+    ) -> None:
+        self.job_model = job_model
+        self.name = name
+        self.workers = max(1, workers)
+        self.stale_seconds = stale_seconds
+        self.niceness = niceness
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # The event loop only keeps weak references to tasks.
+        self._tasks: set["asyncio.Task[None]"] = set()
+
+    def available(self) -> bool:
+        return shutil.which(self.executable) is not None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+            return self._executor
+
+    def preexec_fn(self) -> Optional[Callable[[], None]]:
+        """Lowers the priority of a subprocess started by a job, if configured."""
+        niceness = self.niceness
+        return (lambda: os.nice(niceness)) if niceness > 0 and hasattr(os, "nice") else None
+
+    def enqueue(self, db: Session, session: PitchSession, **fields: Any) -> Any:
+        job = self.job_model(session_id=session.id, **fields)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def submit(self, job_id: int) -> "asyncio.Task[None]":
+        """Queue the job on the pool; must be called from the event loop."""
+        task = asyncio.create_task(self._run_logged(job_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run_logged(self, job_id: int) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._pool(), self._run_in_pool, job_id)
+            await self._after_run(result)
+        except Exception:
+            logger.exception("%s job %s failed", self.name, job_id)
+
+    def _run_in_pool(self, job_id: int) -> Any:
+        """What the pool thread runs; `run` unless a runner adds to it."""
+        return self.run(job_id)
+
+    async def _after_run(self, result: Any) -> None:
+        """Called on the event loop with what `_run_in_pool` returned."""
+
+    def run(self, job_id: int) -> Any:
+        raise NotImplementedError
+
+    def _claim(self, db: Session, job_id: int) -> Any:
+        """Move a queued job to running and return it; None if another
+        worker resuming the same queue got it first."""
+        model = self.job_model
+        claimed = db.execute(
+            update(model)
+            .where(model.id == job_id, model.status == "queued")
+            .values(status="running", progress=0.0, error=None)
+        ).rowcount
+        db.commit()
+        return db.get(model, job_id) if claimed else None
+
+    def requeue_interrupted(self) -> list[int]:
+        """Mark jobs left queued, or running past `stale_seconds`, by a
+        previous process as queued again and return their ids for `submit`."""
+        model = self.job_model
+        db = SessionLocal()
+        try:
+            stale_before = datetime.now(timezone.utc) - timedelta(seconds=self.stale_seconds)
+            jobs = db.query(model).filter(model.status.in_(["queued", "running"])).all()
+            job_ids = []
+            for job in jobs:
+                heartbeat = job.updated_at or job.created_at
+                if heartbeat is not None and heartbeat.tzinfo is None:
+                    heartbeat = heartbeat.replace(tzinfo=timezone.utc)
+                if job.status == "running" and heartbeat is not None and heartbeat > stale_before:
+                    continue
+                job.status = "queued"
+                job_ids.append(job.id)
+            db.commit()
+        finally:
+            db.close()
+        return job_ids
+
+    @staticmethod
+    def describe(job: Any) -> Dict[str, Any]:
+        if job is None:
+            return {"status": "none"}
+        return {
+            "job_id": job.id,
+            "session_id": job.session_id,
+            "status": job.status,
+            "progress": float(job.progress or 0.0),
+            "error": job.error,
+            "created_at": job.created_at,
+            "updated_at": job.updated_at,
+            "finished_at": job.finished_at,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,265 @@
+"""Serving uploaded media: cached path lookup, validators and byte ranges.
+
+Uploads can live under any of a few candidate roots (see `upload_roots`);
+content-addressed names map to their shard under `blobs/` in those roots.
+Looking a file up used to resolve and stat every root on each request; now
+the location is cached per file name and a hit costs a single `stat`, which
+is needed anyway for the validators. Misses are cached briefly so stale
+avatar URLs do not rescan the roots on every page view.
+
+Responses carry a strong ETag (size and mtime) and Last-Modified and answer
+conditional requests with 304. Single byte ranges get 206, so seeking in a
+pitch video fetches only the part being played. Stored names include a
+random uuid or a content hash and are never rewritten in place, so they are
+served with an immutable one-year Cache-Control.
+"""
+
+from __future__ import annotations
+
+import mimetypes
+import os
+import re
+import stat
+import threading
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+import anyio
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from ..config import settings
+from .blob_store import blob_relative_path
+
+_CHUNK_SIZE = 256 * 1024
+_PATH_CACHE_SIZE = 4096
+_MISS_TTL_SECONDS = 10.0
+
+# uuid4().hex or a SHA-256 hex digest somewhere in the name.
+_IMMUTABLE_NAME = re.compile(r"[0-9a-f]{32}")
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+IMMUTABLE_CACHE_CONTROL = "max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "max-age=300"
+
+
+def upload_roots() -> list[Path]:
+    configured = Path(settings.UPLOAD_DIR)
+    if configured.is_absolute():
+        roots = [configured]
+    else:
+        app_file = Path(__file__).resolve()
+        roots = [
+            Path.cwd() / configured,
+            app_file.parents[2] / configured,  # .../src/backend/uploads
+            app_file.parents[4] / configured,  # .../Uruti_Web-updated/uploads
+            app_file.parents[5] / configured,  # .../uruti-platform/uploads
+        ]
+
+    seen: set[str] = set()
+    unique: list[Path] = []
+    for root in roots:
+        resolved = root.resolve()
+        key = str(resolved)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(resolved)
+    return unique
+
+
+class MediaResolver:
+    """Maps (subdir, file name) to a file under one of the upload roots."""
+
+    def __init__(self, max_entries: int = _PATH_CACHE_SIZE) -> None:
+        self._lock = threading.Lock()
+        self._roots: Optional[list[Path]] = None
+        self._roots_key: Optional[tuple[str, str]] = None
+        self._max_entries = max_entries
+        # key -> Path, or the monotonic time a miss was recorded
+        self._entries: "OrderedDict[tuple[Optional[str], str], Path | float]" = OrderedDict()
+
+    def _current_roots(self) -> list[Path]:
+        # Recomputed only if the configured dir or working directory changes.
+        key = (settings.UPLOAD_DIR, os.getcwd())
+        if self._roots is None or self._roots_key != key:
+            self._roots = upload_roots()
+            self._roots_key = key
+            self._entries.clear()
+        return self._roots
+
+    def resolve(self, filename: str, *, subdir: Optional[str] = None) -> Optional[tuple[Path, os.stat_result]]:
+        """The file and its stat, or None if it does not exist."""
+        if not filename or filename.startswith(".") or "/" in filename or "\\" in filename:
+            return None
+        key = (subdir, filename)
+        with self._lock:
+            roots = self._current_roots()
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+        if isinstance(cached, Path):
+            st = _regular_file_stat(cached)
+            if st is not None:
+                return cached, st
+        elif cached is not None and time.monotonic() - cached < _MISS_TTL_SECONDS:
+            return None
+
+        relative = blob_relative_path(filename)
+        if relative is None:
+            relative = Path(filename) if subdir is None else Path(subdir, filename)
+        for root in roots:
+            candidate = root / relative
+            st = _regular_file_stat(candidate)
+            if st is not None:
+                self._remember(key, candidate)
+                return candidate, st
+        self._remember(key, time.monotonic())
+        return None
+
+    def forget(self, filename: str, *, subdir: Optional[str] = None) -> None:
+        with self._lock:
+            self._entries.pop((subdir, filename), None)
+
+    def _remember(self, key: tuple[Optional[str], str], value: Path | float) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+def _regular_file_stat(path: Path) -> Optional[os.stat_result]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def etag_for(st: os.stat_result) -> str:
+    return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def _not_modified(request: Request, etag: str, st: os.stat_result) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(st.st_mtime) <= int(parsedate_to_datetime(if_modified_since).timestamp())
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+    return False
+
+
+def _requested_range(request: Request, etag: str, st: os.stat_result) -> Optional[tuple[int, int]] | str:
+    """(start, end) inclusive, None for the whole file, or "unsatisfiable"."""
+    header = request.headers.get("range")
+    if not header:
+        return None
+    if_range = request.headers.get("if-range")
+    if if_range is not None:
+        if if_range.strip().startswith('"'):
+            if if_range.strip() != etag:
+                return None
+        else:
+            try:
+                if int(parsedate_to_datetime(if_range).timestamp()) < int(st.st_mtime):
+                    return None
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return None
+
+    # Multiple ranges are allowed to be answered with the full file.
+    match = _RANGE.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    size = st.st_size
+    if first == "" and last == "":
+        return None
+    if first == "":
+        length = int(last)
+        # An empty file has no last N bytes to send.
+        if length == 0 or size == 0:
+            return "unsatisfiable"
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        return "unsatisfiable"
+    return start, end
+
+
+async def _file_chunks(path: Path, start: int, length: int) -> AsyncIterator[bytes]:
+    async with await anyio.open_file(path, mode="rb") as f:
+        await f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = await f.read(min(_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def media_response(
+    request: Request,
+    path: Path,
+    st: os.stat_result,
+    *,
+    name: Optional[str] = None,
+    cache_control: Optional[str] = None,
+    private: bool = False,
+    vary: Optional[str] = None,
+) -> Response:
+    """Serve `path` with validators, 304s and single byte ranges.
+
+    `name` is the requested file name; it sets the content type when the
+    stored file has none (content-addressed blobs).
+    """
+    name = name or path.name
+    etag = etag_for(st)
+    if cache_control is None:
+        cache_control = IMMUTABLE_CACHE_CONTROL if _IMMUTABLE_NAME.search(name) else DEFAULT_CACHE_CONTROL
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(st.st_mtime, usegmt=True),
+        "cache-control": f"{'private' if private else 'public'}, {cache_control}",
+        "accept-ranges": "bytes",
+    }
+    if vary:
+        headers["vary"] = vary
+    if _not_modified(request, etag, st):
+        return Response(status_code=304, headers=headers)
+
+    media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    size = st.st_size
+    requested = _requested_range(request, etag, st)
+    if requested == "unsatisfiable":
+        return Response(status_code=416, headers={**headers, "content-range": f"bytes */{size}"})
+
+    start, end = requested if requested is not None else (0, size - 1)
+    length = max(end - start + 1, 0)
+    headers["content-length"] = str(length)
+    status_code = 200
+    if requested is not None:
+        status_code = 206
+        headers["content-range"] = f"bytes {start}-{end}/{size}"
+
+    if request.method == "HEAD" or length == 0:
+        return Response(status_code=status_code, headers=headers, media_type=media_type)
+    return StreamingResponse(
+        _file_chunks(path, start, length),
+        status_code=status_code,
+        headers=headers,
+        media_type=media_type,
+    )
+
+
+media_resolver = MediaResolver()
@@ -0,0 +1,449 @@
+"""Offline analysis of recorded pitch sessions.
+
+Scores stored by `create_pitch_session` only reflect the duration the client
+reported. After an upload a `PitchAnalysisJob` is queued and run in a small
+dedicated thread pool, off the request path:
+
+1. ffmpeg extracts the audio track once, as 16 kHz mono PCM WAV. It is kept
+   in the upload store as the session's `audio_url` (re-analysis reuses it)
+   and decoded into a numpy array.
+2. openai-whisper transcribes that array with word timestamps into
+   `PitchSession.transcript`. Without whisper the timeline is built from the
+   audio alone.
+3. The recording is cut into PITCH_ANALYSIS_WINDOW_SECONDS windows. The 9
+   core features `RewardMLP` takes, plus the 3 context features of the coach
+   policy, are computed for all windows at once with numpy, laid out like
+   `PitchCoachEngine._compute_local_state` would for the transcript and
+   duration reached at the end of each window (what the live coach sees).
+4. All windows are scored in one batched reward-model pass
+   (`pitch_coach_engine.score_frames`) and coached in one policy pass
+   (`coach_frames`).
+
+The result is a float32 array with one row per window (TIMELINE_COLUMNS),
+stored in `PitchSession.timeline`, and a JSON summary in
+`PitchSession.analysis`. The pacing score is recomputed from the measured
+speaking rate.
+"""
+
+from __future__ import annotations
+
+import logging
+import subprocess
+import threading
+import wave
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import PitchAnalysisJob, PitchSession
+from .blob_store import blob_store
+from .job_runner import BackgroundJobRunner
+from .media_files import media_resolver
+from .pitch_coach_engine import pitch_coach_engine
+from .pitch_video import UPLOAD_URL_PREFIX, upload_url
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16_000
+# Loudness and speech activity are measured over 30 ms frames.
+_FRAME_SAMPLES = SAMPLE_RATE * 30 // 1000
+
+TIMELINE_COLUMNS = ("end", "score", "action", "words_per_minute", "loudness_db", "speech_ratio")
+
+# Keyword features of the coach state: words (substrings, as in
+# `_compute_local_state`), value once any was said, value before.
+_KEYWORD_FEATURES = (
+    (("market",), 0.65, 0.45),
+    (("revenue", "traction"), 0.70, 0.50),
+    (("problem",), 0.68, 0.50),
+    (("ask", "fund"), 0.72, 0.48),
+    (("team",), 0.66, 0.52),
+)
+
+# Speaking rate counted as well paced, in words per minute.
+_PACED_WPM = (110.0, 170.0)
+
+
+def window_ends(duration_seconds: float, window_seconds: float) -> np.ndarray:
+    """End time of every window; the last one ends with the recording."""
+    count = max(int(np.ceil(duration_seconds / window_seconds)), 1)
+    return np.minimum(np.arange(1, count + 1, dtype=np.float64) * window_seconds, max(duration_seconds, 1e-3))
+
+
+def window_states(
+    ends: np.ndarray,
+    word_starts: np.ndarray,
+    words: List[str],
+    target_seconds: float,
+) -> np.ndarray:
+    """(N, 12) coach states for windows ending at `ends`; the first 9 columns
+    are the reward model's features."""
+    word_starts = np.asarray(word_starts, dtype=np.float64)
+    spoken = np.searchsorted(np.sort(word_starts), ends, side="right").astype(np.float64)
+    word_count = np.maximum(spoken, 1.0)
+    minutes = np.maximum(ends / 60.0, 1 / 60.0)
+    wpm = np.minimum(word_count / minutes, 220.0)
+    ratio = np.clip(ends / max(target_seconds, 1.0), 0.0, 1.5)
+
+    states = np.empty((len(ends), 12), dtype=np.float32)
+    states[:, 0] = np.minimum(word_count / 220.0, 1.0)
+    states[:, 1] = np.minimum(wpm / 200.0, 1.0)
+    states[:, 2] = ratio
+    states[:, 3] = np.maximum(0.0, 1.0 - np.abs(1.0 - ratio))
+
+    lowered = [word.lower() for word in words]
+    for column, (keywords, said, unsaid) in enumerate(_KEYWORD_FEATURES, start=4):
+        hits = [start for start, word in zip(word_starts, lowered) if any(k in word for k in keywords)]
+        first = min(hits) if hits else np.inf
+        states[:, column] = np.where(ends >= first, said, unsaid)
+
+    states[:, 9] = 1.0  # slide index, as in the live coach without slides
+    states[:, 10] = np.maximum(0.0, 1.0 - ratio)
+    states[:, 11] = np.minimum(ratio, 1.0)
+    return states
+
+
+def audio_levels(samples: np.ndarray, ends: np.ndarray, window_seconds: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Loudness (dBFS of voiced frames) and share of voiced frames per window."""
+    count = len(ends)
+    frames = len(samples) // _FRAME_SAMPLES
+    if frames == 0:
+        return np.full(count, np.nan, dtype=np.float32), np.zeros(count, dtype=np.float32)
+
+    power = np.square(samples[: frames * _FRAME_SAMPLES].reshape(frames, _FRAME_SAMPLES), dtype=np.float64).mean(axis=1)
+    level = 10.0 * np.log10(power + 1e-12)
+    # Voiced: within 30 dB of the loud end of the recording, and not silence.
+    voiced = (level > np.percentile(level, 95) - 30.0) & (level > -55.0)
+
+    window = np.minimum((np.arange(frames) * _FRAME_SAMPLES / SAMPLE_RATE // window_seconds).astype(np.int64), count - 1)
+    total = np.bincount(window, minlength=count)
+    voiced_total = np.bincount(window, weights=voiced, minlength=count)
+    voiced_power = np.bincount(window, weights=np.where(voiced, power, 0.0), minlength=count)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speech_ratio = np.where(total > 0, voiced_total / total, 0.0)
+        loudness = np.where(voiced_total > 0, 10.0 * np.log10(voiced_power / voiced_total + 1e-12), np.nan)
+    return loudness.astype(np.float32), speech_ratio.astype(np.float32)
+
+
+def local_speaking_rate(ends: np.ndarray, word_starts: np.ndarray, window_seconds: float) -> np.ndarray:
+    """Words per minute within each window."""
+    count = len(ends)
+    starts = np.asarray(word_starts, dtype=np.float64)
+    window = np.minimum((starts // window_seconds).astype(np.int64), count - 1)
+    words = np.bincount(window[window >= 0], minlength=count)
+    lengths = np.diff(np.concatenate(([0.0], ends)))
+    return (words / np.maximum(lengths, 1e-3) * 60.0).astype(np.float32)
+
+
+def decode_timeline(session: PitchSession) -> Optional[Dict[str, List[Optional[float]]]]:
+    """The stored timeline as {column: values}; NaN becomes None."""
+    analysis = session.analysis or {}
+    if session.timeline is None or not isinstance(analysis, dict):
+        return None
+    columns = list(analysis.get("columns") or TIMELINE_COLUMNS)
+    rows = np.frombuffer(session.timeline, dtype="<f4").reshape(-1, len(columns))
+    return {
+        name: [None if np.isnan(value) else round(float(value), 3) for value in rows[:, index]]
+        for index, name in enumerate(columns)
+    }
+
+
+class PitchSessionAnalyzer(BackgroundJobRunner):
+    """Runs pitch session analysis jobs in a bounded thread pool."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            PitchAnalysisJob,
+            name="pitch-analysis",
+            workers=settings.PITCH_ANALYSIS_WORKERS,
+            # Audio extraction and transcription have a time limit each.
+            stale_seconds=settings.PITCH_ANALYSIS_TIMEOUT_SECONDS * 2 + 60,
+            niceness=settings.PITCH_ANALYSIS_NICE,
+        )
+        self._whisper_lock = threading.Lock()
+        self._whisper_model: Any | None = None
+        self._whisper_error: Optional[str] = None
+
+    def run(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Analyze the job's session and store its timeline. Runs in a pool thread."""
+        db = SessionLocal()
+        try:
+            job = self._claim(db, job_id)
+            if job is None:
+                return None
+            session = db.get(PitchSession, job.session_id)
+            if session is None:
+                return self._fail(db, job, "pitch session was deleted")
+
+            audio_url: Optional[str] = None
+            extracted = False
+            try:
+                audio_url, samples, extracted = self._audio(db, session)
+                self._progress(db, job, 0.2)
+
+                words, word_starts, transcript, transcriber = self._transcribe_bounded(samples)
+                self._progress(db, job, 0.7)
+
+                db.refresh(job)
+                session = db.get(PitchSession, job.session_id)
+                if session is None:
+                    raise RuntimeError("pitch session was deleted")
+
+                timeline, summary = self._timeline(session, samples, words, word_starts)
+                summary["transcriber"] = transcriber
+
+                if extracted:
+                    blob_store.release(db, session.audio_url)
+                    session.audio_url = audio_url
+                if transcript is not None:
+                    session.transcript = transcript
+                if not session.duration_seconds:
+                    session.duration_seconds = int(round(summary["duration_seconds"]))
+                pacing = summary.get("pacing_score")
+                if pacing is not None:
+                    session.pacing_score = pacing
+                    scores = [session.pacing_score, session.confidence_score, session.clarity_score]
+                    if all(score is not None for score in scores):
+                        session.overall_score = round(sum(scores) / 3, 2)
+                session.timeline = timeline.astype("<f4").tobytes()
+                session.analysis = summary
+
+                job.status = "completed"
+                job.progress = 1.0
+                job.finished_at = datetime.now(timezone.utc)
+                db.commit()
+            except Exception as exc:
+                # Any stage: mark the job failed so it can be retried, and drop
+                # the reference to audio extracted for it.
+                db.rollback()
+                logger.exception("pitch analysis job %s failed", job_id)
+                return self._fail(db, job, str(exc) or type(exc).__name__, release=audio_url if extracted else None)
+            return {"session_id": session.id, "windows": summary["windows"]}
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def _progress(db: Session, job: PitchAnalysisJob, progress: float) -> None:
+        job.progress = progress
+        db.commit()
+
+    @staticmethod
+    def _fail(db: Session, job: PitchAnalysisJob, error: str, *, release: Optional[str] = None) -> None:
+        logger.warning("pitch analysis job %s failed: %s", job.id, error)
+        if release:
+            blob_store.release(db, release)
+        job.status = "failed"
+        job.error = error[-2000:]
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        return None
+
+    # Audio
+
+    def _audio(self, db: Session, session: PitchSession) -> Tuple[str, np.ndarray, bool]:
+        """(audio URL, samples, whether it was extracted now). A session that
+        already has its audio track is not extracted again."""
+        existing = self._resolve(session.audio_url)
+        # Blob files have no extension; the URL names the format.
+        if existing is not None and Path(session.audio_url).suffix == ".wav":
+            return session.audio_url, _read_wav(existing), False
+
+        video = self._resolve(session.video_url)
+        if video is None:
+            raise RuntimeError("pitch video file not found")
+        output = blob_store.staging_path(".wav")
+        try:
+            _extract_audio(video, output, self.preexec_fn())
+            samples = _read_wav(output)
+            stored = blob_store.adopt(db, output, extension=".wav", content_type="audio/wav")
+        finally:
+            output.unlink(missing_ok=True)
+        return upload_url(stored.name), samples, True
+
+    @staticmethod
+    def _resolve(url: Optional[str]) -> Optional[Path]:
+        if not url or not url.startswith(UPLOAD_URL_PREFIX):
+            return None
+        found = media_resolver.resolve(url[len(UPLOAD_URL_PREFIX):])
+        return found[0] if found is not None else None
+
+    # Transcript
+
+    def _transcribe_bounded(self, samples: np.ndarray) -> Tuple[List[str], np.ndarray, Optional[str], Optional[str]]:
+        """`_transcribe` with PITCH_ANALYSIS_TIMEOUT_SECONDS, like ffmpeg.
+
+        Whisper cannot be interrupted, so a transcription that times out
+        keeps running in its daemon thread and the job fails; later jobs wait
+        for the whisper lock within their own timeout."""
+        outcome: Dict[str, Any] = {}
+
+        def work() -> None:
+            try:
+                outcome["result"] = self._transcribe(samples)
+            except BaseException as exc:
+                outcome["error"] = exc
+
+        worker = threading.Thread(target=work, name="pitch-whisper", daemon=True)
+        worker.start()
+        worker.join(settings.PITCH_ANALYSIS_TIMEOUT_SECONDS)
+        if worker.is_alive():
+            raise TimeoutError(f"transcription took longer than {settings.PITCH_ANALYSIS_TIMEOUT_SECONDS}s")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    def _transcribe(self, samples: np.ndarray) -> Tuple[List[str], np.ndarray, Optional[str], Optional[str]]:
+        """(words, word start times, transcript, transcriber); no words and a
+        None transcript when openai-whisper is unavailable."""
+        model = self._whisper()
+        if model is None or len(samples) == 0:
+            return [], np.empty(0), None, None
+        with self._whisper_lock:
+            result = model.transcribe(samples, word_timestamps=True, fp16=False)
+        words: List[str] = []
+        starts: List[float] = []
+        for segment in result.get("segments") or []:
+            segment_words = segment.get("words") or []
+            if segment_words:
+                for word in segment_words:
+                    words.append(str(word.get("word", "")).strip())
+                    starts.append(float(word.get("start", segment.get("start", 0.0))))
+            else:
+                # No word timings: spread the segment's words evenly.
+                text_words = str(segment.get("text", "")).split()
+                words.extend(text_words)
+                starts.extend(
+                    np.linspace(float(segment.get("start", 0.0)), float(segment.get("end", 0.0)),
+                                len(text_words), endpoint=False).tolist()
+                )
+        transcript = " ".join(str(result.get("text", "")).split())
+        return words, np.asarray(starts, dtype=np.float64), transcript, f"openai-whisper:{settings.PITCH_ANALYSIS_WHISPER_MODEL}"
+
+    def _whisper(self) -> Any | None:
+        with self._whisper_lock:
+            if self._whisper_model is None and self._whisper_error is None:
+                try:
+                    import whisper  # type: ignore
+
+                    self._whisper_model = whisper.load_model(settings.PITCH_ANALYSIS_WHISPER_MODEL, device="cpu")
+                except Exception as exc:
+                    self._whisper_error = str(exc)
+                    logger.warning("pitch analysis runs without transcripts: %s", exc)
+            return self._whisper_model
+
+    # Timeline
+
+    @staticmethod
+    def _timeline(
+        session: PitchSession, samples: np.ndarray, words: List[str], word_starts: np.ndarray
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        window_seconds = max(float(settings.PITCH_ANALYSIS_WINDOW_SECONDS), 0.5)
+        duration = len(samples) / SAMPLE_RATE
+        feedback = session.ai_feedback if isinstance(session.ai_feedback, dict) else {}
+        target = float(feedback.get("target_duration") or 0) or duration
+
+        ends = window_ends(duration, window_seconds)
+        states = window_states(ends, word_starts, words, target)
+        loudness, speech_ratio = audio_levels(samples, ends, window_seconds)
+        wpm = local_speaking_rate(ends, word_starts, window_seconds)
+
+        timeline = np.full((len(ends), len(TIMELINE_COLUMNS)), np.nan, dtype=np.float32)
+        timeline[:, 0] = ends
+        timeline[:, 3] = wpm
+        timeline[:, 4] = loudness
+        timeline[:, 5] = speech_ratio
+
+        summary: Dict[str, Any] = {
+            "window_seconds": window_seconds,
+            "columns": list(TIMELINE_COLUMNS),
+            "windows": len(ends),
+            "duration_seconds": round(duration, 2),
+            "word_count": len(words),
+        }
+        try:
+            # One batched pass each over all windows.
+            timeline[:, 1] = pitch_coach_engine.score_frames(states[:, :9])
+            actions = pitch_coach_engine.coach_frames(states)
+            timeline[:, 2] = [action["action_code"] for action in actions]
+            summary["scorer"] = pitch_coach_engine.status().get("backend")
+            summary["score"] = {
+                "mean": round(float(timeline[:, 1].mean()), 3),
+                "min": round(float(timeline[:, 1].min()), 3),
+                "max": round(float(timeline[:, 1].max()), 3),
+            }
+            summary["actions"] = [
+                {"action_code": code, "feedback": feedback_text, "windows": count}
+                for (code, feedback_text), count in Counter(
+                    (action["action_code"], action["feedback"]) for action in actions
+                ).most_common()
+            ]
+        except Exception as exc:
+            summary["scorer"] = None
+            summary["scorer_error"] = str(exc)
+
+        speaking = (speech_ratio >= 0.3) & (wpm > 0)
+        if words and speaking.any():
+            low, high = _PACED_WPM
+            paced = float(((wpm[speaking] >= low) & (wpm[speaking] <= high)).mean())
+            summary["words_per_minute"] = round(float(np.median(wpm[speaking])), 1)
+            summary["pacing_score"] = round(60 + paced * 40, 2)
+        return timeline, summary
+
+
+def _extract_audio(source: Path, output: Path, preexec_fn: Optional[Callable[[], None]] = None) -> None:
+    command = [
+        "ffmpeg",
+        "-y",
+        "-nostdin",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        str(source),
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(SAMPLE_RATE),
+        "-c:a",
+        "pcm_s16le",
+        "-f",
+        "wav",
+        str(output),
+    ]
+    try:
+        completed = subprocess.run(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            timeout=settings.PITCH_ANALYSIS_TIMEOUT_SECONDS,
+            preexec_fn=preexec_fn,
+        )
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"audio extraction timed out after {settings.PITCH_ANALYSIS_TIMEOUT_SECONDS:g}s")
+    if completed.returncode != 0 or not output.exists():
+        detail = completed.stderr.decode("utf-8", "replace").strip()
+        raise RuntimeError(detail or f"ffmpeg exited with {completed.returncode}")
+
+
+def _read_wav(path: Path) -> np.ndarray:
+    """Mono 16-bit WAV as float32 samples in [-1, 1]."""
+    with wave.open(str(path), "rb") as wav:
+        if wav.getsampwidth() != 2 or wav.getnchannels() != 1 or wav.getframerate() != SAMPLE_RATE:
+            raise RuntimeError("unexpected audio format")
+        pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+    return pcm.astype(np.float32) / 32768.0
+
+
+pitch_session_analyzer = PitchSessionAnalyzer()
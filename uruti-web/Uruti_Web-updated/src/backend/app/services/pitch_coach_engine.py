@@ -19,12 +19,18 @@ class PitchCoachEngine:
         self._pipe: Any | None = None
         self._reward_model: Any | None = None
         self._rl_agent: Any | None = None
+        # Numpy reward runtime (exported path) or the loaded inference module
+        # (torch path) used for batched scoring.
+        self._reward_runtime: Any | None = None
+        self._local_module: Any | None = None
         self._load_error: str | None = None
         self._last_load_attempt: float | None = None
         self._retry_after_seconds = 20
         self._backend = "fallback"
         self._startup_init_started = False
         self._startup_init_completed = False
+        # Timings of the last local model load (import + load_models()).
+        self._local_load_info: dict[str, Any] | None = None
         self.model_id = settings.PITCH_COACH_MODEL_ID or os.getenv("PITCH_COACH_MODEL_ID", "")
         self.enable_local_rl = settings.PITCH_COACH_ENABLE_LOCAL_RL
         self.local_model_dir = self._resolve_local_model_dir(
@@ -176,21 +182,114 @@ class PitchCoachEngine:
         if inference_path is None:
             raise RuntimeError("local pitch model inference.py not found")
 
+        if self._load_exported_policy(inference_path):
+            return
+
         spec = importlib.util.spec_from_file_location("uruti_pitch_local_inference", str(inference_path))
         if spec is None or spec.loader is None:
             raise RuntimeError("failed to load local pitch model module spec")
 
+        started = time.perf_counter()
         module = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(module)
+        import_seconds = time.perf_counter() - started
 
         load_models = getattr(module, "load_models", None)
         if not callable(load_models):
             raise RuntimeError("local pitch model module missing load_models()")
 
         reward_model, rl_agent = load_models()
+        self._local_load_info = {
+            "runtime": "stable-baselines3",
+            "import_seconds": round(import_seconds, 4),
+            "load_seconds": round(time.perf_counter() - started - import_seconds, 4),
+            # Per-step timings and SB3 archive cache outcome, if the module reports them.
+            **dict(getattr(module, "LAST_LOAD_INFO", None) or {}),
+        }
         self._reward_model = reward_model
         self._rl_agent = rl_agent
+        self._local_module = module
+        self._backend = "local-rl"
+
+    def _load_exported_policy(self, inference_path: Path) -> bool:
+        """Use the numpy policy and reward exports (written by load_models()
+        on an earlier run) instead of importing torch and stable-baselines3,
+        if both match the current artifacts."""
+        runtime_path = inference_path.with_name("policy_runtime.py")
+        if not runtime_path.exists():
+            return False
+
+        started = time.perf_counter()
+        spec = importlib.util.spec_from_file_location("uruti_pitch_policy_runtime", str(runtime_path))
+        if spec is None or spec.loader is None:
+            return False
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        models_dir = inference_path.parent / "models"
+        runtime = module.load_exported(str(models_dir / "best_model"))
+        reward_runtime = module.load_exported_reward(str(models_dir / "reward_model.pt"))
+        if runtime is None or reward_runtime is None:
+            return False
+        # Same predict() contract as an SB3 model.
+        self._rl_agent = runtime
+        self._reward_runtime = reward_runtime
         self._backend = "local-rl"
+        self._local_load_info = {
+            "runtime": "numpy_policy",
+            "algorithm": runtime.meta.get("algorithm"),
+            "parity": runtime.meta.get("parity"),
+            "reward_parity": reward_runtime.meta.get("parity"),
+            "load_seconds": round(time.perf_counter() - started, 4),
+        }
+        return True
+
+    def _ensure_local_agent(self) -> None:
+        if self._rl_agent is None:
+            self._ensure_pipeline()
+        if self._rl_agent is None:
+            raise RuntimeError(self._load_error or "local pitch model is not loaded")
+
+    @staticmethod
+    def _as_batch(rows: Any, width: int) -> Any:
+        import numpy as np  # type: ignore
+
+        batch = np.asarray(rows, dtype=np.float32)
+        if batch.size == 0:
+            return batch.reshape(0, width)
+        if batch.ndim != 2 or batch.shape[1] != width:
+            raise ValueError(f"expected an (N, {width}) array, got shape {batch.shape}")
+        return batch
+
+    def score_frames(self, features: Any) -> list[float]:
+        """Reward-model scores for an (N, 9) array of frame features, in one
+        forward pass."""
+        batch = self._as_batch(features, 9)
+        self._ensure_local_agent()
+        if len(batch) == 0:
+            return []
+        if self._reward_runtime is not None:
+            return [round(float(score), 2) for score in self._reward_runtime.scores(batch)]
+        return self._local_module.compute_scores(self._reward_model, batch)
+
+    def coach_frames(self, states: Any) -> list[dict[str, Any]]:
+        """Deterministic coaching actions for an (N, 12) array of state vectors."""
+        batch = self._as_batch(states, 12)
+        self._ensure_local_agent()
+        if len(batch) == 0:
+            return []
+        if self._local_module is not None:
+            actions = self._local_module.predict_actions(self._rl_agent, batch)
+        else:
+            predicted, _ = self._rl_agent.predict(batch, deterministic=True)
+            actions = [int(action) for action in predicted]
+        return [
+            {
+                "action_code": action,
+                "feedback": self._action_map.get(action, "Keep going with clear and concise delivery."),
+            }
+            for action in actions
+        ]
 
     def _ensure_pipeline(self) -> None:
         now = time.time()
@@ -408,6 +507,7 @@ class PitchCoachEngine:
             "gemini_available": self._gemini_available(),
             "startup_init_started": self._startup_init_started,
             "startup_init_completed": self._startup_init_completed,
+            "local_model_load": self._local_load_info,
         }
 
 
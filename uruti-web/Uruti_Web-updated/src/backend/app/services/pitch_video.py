@@ -0,0 +1,273 @@
+"""Background transcoding of uploaded pitch videos to MP4.
+
+`upload_pitch_video` saves the upload, creates the `PitchSession` with
+video_status="processing" (the original file plays in the meantime) and
+queues a `PitchVideoJob`. Jobs run ffmpeg in a small dedicated thread pool,
+at lower CPU priority (`nice`) and with a capped ffmpeg thread count, and
+record progress from ffmpeg's `-progress` output.
+
+The MP4 is written to a staging file and moved into the upload store (see
+`app.services.blob_store`). Only then are the session's video URL and the
+venture's demo video (if it pointed at the original upload) switched in one
+commit, so clients never see a partial file; the original's references are
+released and the sweep deletes it once nothing else uses the same content.
+The founder gets a notification when the job finishes.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import NotificationType, PitchSession, PitchVideoJob, Venture
+from .blob_store import blob_sha256, blob_store
+from .job_runner import BackgroundJobRunner
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_URL_PREFIX = "/api/v1/profile/uploads/"
+
+# Progress is written to the database at most this often.
+_PROGRESS_WRITE_SECONDS = 2.0
+
+
+def upload_url(filename: str) -> str:
+    return f"{UPLOAD_URL_PREFIX}{filename}"
+
+
+class PitchVideoTranscoder(BackgroundJobRunner):
+    """Runs pitch video transcode jobs in a bounded thread pool."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            PitchVideoJob,
+            name="pitch-transcode",
+            workers=settings.PITCH_VIDEO_TRANSCODE_WORKERS,
+            stale_seconds=settings.PITCH_VIDEO_TRANSCODE_TIMEOUT_SECONDS + 60,
+            niceness=settings.PITCH_VIDEO_TRANSCODE_NICE,
+        )
+
+    def enqueue(self, db: Session, session: PitchSession, source_path: Path) -> PitchVideoJob:
+        return super().enqueue(db, session, source_path=str(source_path.resolve()))
+
+    def _run_in_pool(self, job_id: int) -> Any:
+        """`run`, then store the founder's notification; both in the pool thread."""
+        outcome = self.run(job_id)
+        return _create_notification(outcome) if outcome is not None else None
+
+    async def _after_run(self, notification: Any) -> None:
+        if notification is not None:
+            await _publish(notification)
+
+    def run(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Transcode and swap URLs. Runs in a pool thread; returns what to notify."""
+        db = SessionLocal()
+        try:
+            job = self._claim(db, job_id)
+            if job is None:
+                return None
+            session = db.get(PitchSession, job.session_id)
+            if session is None:
+                return self._fail(db, job, None, "pitch session was deleted")
+
+            source = Path(job.source_path)
+            source_url = session.video_url
+            output = blob_store.staging_path(".mp4")
+            duration = float(session.duration_seconds or 0)
+            last_write = [0.0]
+
+            def on_progress(seconds: float) -> None:
+                now = time.monotonic()
+                if duration <= 0 or now - last_write[0] < _PROGRESS_WRITE_SECONDS:
+                    return
+                last_write[0] = now
+                job.progress = round(min(seconds / duration, 0.99), 4)
+                db.commit()
+
+            try:
+                self._transcode(source, output, on_progress)
+            except Exception as exc:
+                return self._fail(db, job, session, str(exc))
+
+            db.refresh(job)
+            session = db.get(PitchSession, job.session_id)
+            if session is None:
+                output.unlink(missing_ok=True)
+                return self._fail(db, job, None, "pitch session was deleted")
+
+            mp4 = blob_store.adopt(db, output, extension=".mp4", content_type="video/mp4")
+            new_url = upload_url(mp4.name)
+            swapped = 0
+            if source_url:
+                if session.video_url == source_url:
+                    session.video_url = new_url
+                    swapped += 1
+                swapped += db.query(Venture).filter(
+                    Venture.id == session.venture_id, Venture.demo_video_url == source_url
+                ).update({Venture.demo_video_url: new_url}, synchronize_session=False)
+            blob_store.release(db, source_url, swapped)
+            session.video_status = "ready"
+            job.status = "completed"
+            job.progress = 1.0
+            job.output_filename = mp4.name
+            job.finished_at = datetime.now(timezone.utc)
+            db.commit()
+
+            # Uploads from before the content-addressed store have their own
+            # file, and nothing points at it any more.
+            if blob_sha256(source.name) is None:
+                source.unlink(missing_ok=True)
+            return self._outcome(db, job, session)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _fail(
+        self, db: Session, job: PitchVideoJob, session: Optional[PitchSession], error: str
+    ) -> Optional[Dict[str, Any]]:
+        logger.warning("pitch video job %s failed: %s", job.id, error)
+        job.status = "failed"
+        job.error = error[-2000:]
+        job.finished_at = datetime.now(timezone.utc)
+        if session is not None:
+            # The original upload is still in place and keeps playing.
+            session.video_status = "ready"
+        db.commit()
+        return self._outcome(db, job, session) if session is not None else None
+
+    @staticmethod
+    def _outcome(db: Session, job: PitchVideoJob, session: PitchSession) -> Optional[Dict[str, Any]]:
+        venture = db.get(Venture, session.venture_id)
+        if venture is None:
+            return None
+        return {
+            "user_id": venture.founder_id,
+            "job_id": job.id,
+            "status": job.status,
+            "session_id": session.id,
+            "venture_id": venture.id,
+            "title": session.title,
+            "video_url": session.video_url,
+        }
+
+    def _transcode(self, source: Path, output: Path, on_progress: Callable[[float], None]) -> None:
+        tmp_output = output.with_name(f".{output.stem}.{uuid.uuid4().hex}.part")
+        command = [
+            "ffmpeg",
+            "-y",
+            "-nostdin",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-i",
+            str(source),
+            "-threads",
+            str(max(1, settings.PITCH_VIDEO_TRANSCODE_THREADS)),
+            "-c:v",
+            "libx264",
+            "-preset",
+            settings.PITCH_VIDEO_TRANSCODE_PRESET,
+            "-movflags",
+            "+faststart",
+            "-c:a",
+            "aac",
+            "-progress",
+            "pipe:1",
+            "-nostats",
+            "-f",
+            "mp4",
+            str(tmp_output),
+        ]
+
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                text=True,
+                preexec_fn=self.preexec_fn(),
+            )
+            timed_out = threading.Event()
+
+            def kill() -> None:
+                timed_out.set()
+                process.kill()
+
+            watchdog = threading.Timer(settings.PITCH_VIDEO_TRANSCODE_TIMEOUT_SECONDS, kill)
+            watchdog.start()
+            try:
+                for line in process.stdout:
+                    key, _, value = line.strip().partition("=")
+                    # out_time_ms is in microseconds too (historical ffmpeg naming).
+                    if key in ("out_time_us", "out_time_ms") and value.isdigit():
+                        on_progress(int(value) / 1_000_000)
+                returncode = process.wait()
+            finally:
+                watchdog.cancel()
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+
+            if returncode != 0 or not tmp_output.exists():
+                tmp_output.unlink(missing_ok=True)
+                if timed_out.is_set():
+                    raise RuntimeError(
+                        f"transcode timed out after {settings.PITCH_VIDEO_TRANSCODE_TIMEOUT_SECONDS:g}s"
+                    )
+                stderr.seek(0)
+                detail = stderr.read().decode("utf-8", "replace").strip()
+                raise RuntimeError(detail or f"ffmpeg exited with {returncode}")
+
+        os.replace(tmp_output, output)
+
+
+def _create_notification(outcome: Dict[str, Any]) -> Any:
+    # The notification helpers live in the router module.
+    from ..routers.notifications import create_notification
+
+    if outcome["status"] == "completed":
+        title = "Pitch video ready"
+        message = f"Your recording \"{outcome['title']}\" has been processed and is ready to play."
+    else:
+        title = "Pitch video processing failed"
+        message = f"We could not convert \"{outcome['title']}\"; the original recording is kept."
+
+    db = SessionLocal()
+    try:
+        return create_notification(
+            db,
+            user_id=outcome["user_id"],
+            title=title,
+            message=message,
+            notification_type=NotificationType.SYSTEM,
+            data={"kind": "pitch_video_processed", **{k: v for k, v in outcome.items() if k != "user_id"}},
+        )
+    finally:
+        db.close()
+
+
+async def _publish(notification: Any) -> None:
+    from ..routers.notifications import publish_notification
+
+    db = SessionLocal()
+    try:
+        await publish_notification(notification, db)
+    finally:
+        db.close()
+
+
+pitch_video_transcoder = PitchVideoTranscoder()
@@ -0,0 +1,134 @@
+"""Background-refreshed cache for runtime status probes.
+
+Health probes (HTTP round-trips to sibling services) and model info lookups
+are registered here once and refreshed on an interval by a background task.
+Request handlers read the last snapshot together with its age instead of
+probing inline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Probe:
+    fn: Callable[[], Any]
+    interval: float
+    value: Any = None
+    error: str | None = None
+    refreshed_at: float | None = None
+    refresh_ms: float | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class RuntimeStatusCollector:
+    """Keeps the latest result of each registered probe."""
+
+    def __init__(self, default_interval: float) -> None:
+        self._default_interval = max(1.0, float(default_interval))
+        self._probes: dict[str, _Probe] = {}
+        self._task: asyncio.Task | None = None
+
+    def register(self, name: str, fn: Callable[[], Any], *, interval: float | None = None) -> None:
+        """Register (or replace) a probe. `fn` runs in a worker thread."""
+        self._probes[name] = _Probe(fn=fn, interval=max(1.0, float(interval or self._default_interval)))
+
+    def refresh(self, name: str) -> None:
+        probe = self._probes[name]
+        first_read = probe.refreshed_at is None
+        # Skip if another thread is already refreshing this probe; a first read
+        # waits for that refresh instead of running its own.
+        if not probe.lock.acquire(blocking=first_read):
+            return
+        try:
+            if first_read and probe.refreshed_at is not None:
+                return
+            start = time.perf_counter()
+            try:
+                probe.value = probe.fn()
+                probe.error = None
+            except Exception as exc:
+                probe.error = str(exc)
+                logger.warning("runtime status probe %s failed: %s", name, exc)
+            probe.refresh_ms = round((time.perf_counter() - start) * 1000, 2)
+            probe.refreshed_at = time.time()
+        finally:
+            probe.lock.release()
+
+    def get(self, name: str) -> Any:
+        """Return the cached value; only the very first read probes inline."""
+        probe = self._probes[name]
+        if probe.refreshed_at is None:
+            self.refresh(name)
+        return probe.value
+
+    def peek(self, name: str) -> Any:
+        """Return the cached value without ever probing (None before the first refresh)."""
+        return self._probes[name].value
+
+    async def get_async(self, name: str) -> Any:
+        probe = self._probes[name]
+        if probe.refreshed_at is None:
+            await asyncio.to_thread(self.refresh, name)
+        return probe.value
+
+    def age_seconds(self, name: str) -> float | None:
+        refreshed_at = self._probes[name].refreshed_at
+        return None if refreshed_at is None else round(time.time() - refreshed_at, 2)
+
+    def snapshot_meta(self) -> dict[str, Any]:
+        """Age and timing of every probe, for diagnostics payloads."""
+        meta: dict[str, Any] = {}
+        for name, probe in self._probes.items():
+            meta[name] = {
+                "refreshed_at": (
+                    datetime.fromtimestamp(probe.refreshed_at, tz=timezone.utc).isoformat()
+                    if probe.refreshed_at is not None
+                    else None
+                ),
+                "age_seconds": self.age_seconds(name),
+                "refresh_interval_seconds": probe.interval,
+                "refresh_ms": probe.refresh_ms,
+                "error": probe.error,
+            }
+        return meta
+
+    async def _run(self) -> None:
+        while True:
+            now = time.time()
+            due = [
+                name
+                for name, probe in self._probes.items()
+                if probe.refreshed_at is None or now - probe.refreshed_at >= probe.interval
+            ]
+            if due:
+                await asyncio.gather(*(asyncio.to_thread(self.refresh, name) for name in due))
+            await asyncio.sleep(1.0)
+
+    def start(self) -> None:
+        """Start the refresh loop on the running event loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+runtime_status = RuntimeStatusCollector(settings.RUNTIME_STATUS_REFRESH_SECONDS)
@@ -0,0 +1,331 @@
+"""Out-of-process venture scoring workers.
+
+The scoring bundle is unpickled and run inside child processes so a native
+crash in numpy/sklearn/xgboost takes down a worker, never the API. The API
+process only extracts features (see `VentureScorer`) and sends them over a
+pipe; concurrent requests that arrive within a short window are stacked into
+one batch per round trip. Dead or hung workers are restarted on the next
+batch, and repeated crashes disable the pool for a cool-down period so a bad
+bundle cannot turn into a restart loop.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Crashes within this window count towards disabling the pool.
+_CRASH_WINDOW_SECONDS = 60.0
+_MAX_CRASHES_IN_WINDOW = 3
+_COOL_DOWN_SECONDS = 120.0
+
+
+class ScoringWorkerError(RuntimeError):
+    """The worker could not produce a result (crash, timeout, pool disabled)."""
+
+
+def _worker_main(conn: Any, bundle_path: str, meta_path: Optional[str]) -> None:
+    """Child process: load the bundle, report its feature plan, serve batches."""
+    from pathlib import Path
+
+    from .venture_scorer import venture_scorer
+
+    try:
+        bundle = venture_scorer._read_bundle(Path(bundle_path), Path(meta_path) if meta_path else None, {})
+        # Export a numpy evaluator here, where unpickling is already isolated;
+        # the API process switches to it and shuts this worker down.
+        warmup: Dict[str, Any] = {}
+        ensemble = venture_scorer._export_ensemble(
+            bundle, venture_scorer._bundle_digest(Path(bundle_path), warmup), warmup
+        )
+        info = {
+            "class_names": bundle.class_names,
+            "model_name": bundle.model_name,
+            "estimator_class": bundle.estimator_class,
+            "feature_names": [str(name) for name in getattr(bundle.estimator, "feature_names_in_", [])],
+            "plan": bundle.plan.spec(),
+            "export": warmup.get("export"),
+            "export_path": warmup["export"]["path"] if ensemble is not None else None,
+        }
+    except Exception as exc:
+        conn.send(("failed", f"failed to load model bundle: {exc}"))
+        return
+    conn.send(("ready", info))
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        if message is None:
+            return
+        _, kind, data = message
+        try:
+            predicted, probabilities = venture_scorer._run_model(bundle, kind, data)
+            conn.send(("ok", np.asarray(predicted), None if probabilities is None else np.asarray(probabilities)))
+        except Exception as exc:
+            conn.send(("error", str(exc)))
+
+
+@dataclass
+class _Request:
+    kind: str
+    data: Any
+    size: int
+    future: Future = field(default_factory=Future)
+
+
+@dataclass
+class _Slot:
+    index: int
+    process: Any = None
+    conn: Any = None
+    started_at: Optional[float] = None
+    restarts: int = 0
+
+
+class ScoringWorkerPool:
+    """A small pool of scoring processes fed by a shared batching queue."""
+
+    def __init__(
+        self,
+        bundle_path: str,
+        meta_path: Optional[str],
+        *,
+        workers: int = 1,
+        batch_window_ms: float = 5.0,
+        max_batch: int = 256,
+        timeout_seconds: float = 30.0,
+    ) -> None:
+        self.bundle_path = bundle_path
+        self.meta_path = meta_path
+        self.batch_window = max(0.0, float(batch_window_ms)) / 1000.0
+        self.max_batch = max(1, int(max_batch))
+        self.timeout = max(1.0, float(timeout_seconds))
+        self.info: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+        self._ctx = multiprocessing.get_context("spawn")
+        self._slots = [_Slot(index=idx) for idx in range(max(1, int(workers)))]
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._crashes: List[float] = []
+        self._disabled_until = 0.0
+        self._stats = {"batches": 0, "requests": 0, "rows": 0, "crashes": 0, "timeouts": 0}
+
+    # -- process management -------------------------------------------------
+
+    def _spawn(self, slot: _Slot) -> Dict[str, Any]:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.bundle_path, self.meta_path),
+            name=f"uruti-scoring-{slot.index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        slot.process, slot.conn, slot.started_at = process, parent_conn, time.time()
+
+        if not parent_conn.poll(self.timeout):
+            self._kill(slot)
+            raise ScoringWorkerError("scoring worker did not finish loading the bundle in time")
+        try:
+            status, payload = parent_conn.recv()
+        except (EOFError, OSError):
+            exitcode = process.exitcode
+            self._kill(slot)
+            raise ScoringWorkerError(f"scoring worker crashed while loading the bundle (exit code {exitcode})")
+        if status != "ready":
+            self._kill(slot)
+            raise ScoringWorkerError(str(payload))
+        return payload
+
+    def _kill(self, slot: _Slot) -> None:
+        if slot.conn is not None:
+            try:
+                slot.conn.close()
+            except OSError:
+                pass
+        if slot.process is not None:
+            if slot.process.is_alive():
+                slot.process.kill()
+            slot.process.join(timeout=5)
+        slot.process = slot.conn = None
+
+    def _record_crash(self, reason: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._stats["crashes"] += 1
+            self.last_error = reason
+            self._crashes = [ts for ts in self._crashes if now - ts < _CRASH_WINDOW_SECONDS] + [now]
+            if len(self._crashes) >= _MAX_CRASHES_IN_WINDOW:
+                self._disabled_until = now + _COOL_DOWN_SECONDS
+                self._crashes = []
+                logger.error("scoring workers crashed repeatedly; disabled for %.0fs", _COOL_DOWN_SECONDS)
+
+    def disabled(self) -> bool:
+        return time.time() < self._disabled_until
+
+    def start(self) -> Dict[str, Any]:
+        """Start the first worker (raising if the bundle cannot be served),
+        then the remaining workers and dispatcher threads."""
+        if self.info is not None:
+            return self.info
+        self.info = self._spawn(self._slots[0])
+        for slot in self._slots[1:]:
+            try:
+                self._spawn(slot)
+            except ScoringWorkerError as exc:
+                # The dispatcher retries on the first batch.
+                self.last_error = str(exc)
+        for slot in self._slots:
+            thread = threading.Thread(target=self._dispatch, args=(slot,), name=f"uruti-scoring-dispatch-{slot.index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self.info
+
+    def close(self) -> None:
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+        for slot in self._slots:
+            if slot.conn is not None:
+                try:
+                    slot.conn.send(None)
+                except OSError:
+                    pass
+            self._kill(slot)
+        self.info = None
+
+    # -- batching -----------------------------------------------------------
+
+    def predict(self, kind: str, data: Any, size: int) -> Tuple[Any, Any]:
+        """Score one request; blocks until its batch comes back."""
+        if self.disabled():
+            raise ScoringWorkerError(f"scoring workers disabled after repeated crashes: {self.last_error}")
+        request = _Request(kind=kind, data=data, size=size)
+        self._queue.put(request)
+        try:
+            return request.future.result(timeout=self.timeout * 2 + self.batch_window)
+        except FutureTimeoutError as exc:
+            raise ScoringWorkerError("timed out waiting for a scoring worker") from exc
+
+    def _collect(self, first: _Request) -> List[_Request]:
+        batch = [first]
+        rows = first.size
+        deadline = time.monotonic() + self.batch_window
+        while rows < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None or request.kind != first.kind:
+                # Shutdown marker or a different payload type: leave it for
+                # the next round.
+                self._queue.put(request)
+                break
+            batch.append(request)
+            rows += request.size
+        return batch
+
+    def _dispatch(self, slot: _Slot) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            if first.kind == "matrix":
+                data: Any = np.vstack([request.data for request in batch])
+            else:
+                data = [row for request in batch for row in request.data]
+            try:
+                predicted, probabilities = self._call(slot, first.kind, data)
+            except Exception as exc:
+                for request in batch:
+                    request.future.set_exception(exc)
+                continue
+
+            with self._lock:
+                self._stats["batches"] += 1
+                self._stats["requests"] += len(batch)
+                self._stats["rows"] += sum(request.size for request in batch)
+            offset = 0
+            for request in batch:
+                end = offset + request.size
+                request.future.set_result(
+                    (predicted[offset:end], None if probabilities is None else probabilities[offset:end])
+                )
+                offset = end
+
+    def _call(self, slot: _Slot, kind: str, data: Any) -> Tuple[Any, Any]:
+        if self.disabled():
+            raise ScoringWorkerError(f"scoring workers disabled after repeated crashes: {self.last_error}")
+        if slot.process is None or not slot.process.is_alive():
+            if slot.process is not None:
+                self._record_crash(f"scoring worker exited between batches (exit code {slot.process.exitcode})")
+            self._kill(slot)
+            try:
+                self._spawn(slot)
+            except ScoringWorkerError as exc:
+                self._record_crash(str(exc))
+                raise
+            slot.restarts += 1
+
+        try:
+            slot.conn.send(("predict", kind, data))
+            if not slot.conn.poll(self.timeout):
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                self._kill(slot)
+                self._record_crash("scoring worker timed out")
+                raise ScoringWorkerError("scoring worker timed out")
+            status, *payload = slot.conn.recv()
+        except (EOFError, OSError) as exc:
+            exitcode = slot.process.exitcode if slot.process is not None else None
+            self._kill(slot)
+            reason = f"scoring worker crashed (exit code {exitcode})"
+            self._record_crash(reason)
+            raise ScoringWorkerError(reason) from exc
+
+        if status == "error":
+            raise ValueError(payload[0])
+        return payload[0], payload[1]
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        batches = stats["batches"]
+        return {
+            "workers": [
+                {
+                    "index": slot.index,
+                    "pid": slot.process.pid if slot.process is not None else None,
+                    "alive": bool(slot.process is not None and slot.process.is_alive()),
+                    "restarts": slot.restarts,
+                }
+                for slot in self._slots
+            ],
+            "batch_window_ms": round(self.batch_window * 1000, 2),
+            "max_batch": self.max_batch,
+            "queued": self._queue.qsize(),
+            "disabled": self.disabled(),
+            "last_error": self.last_error,
+            "avg_requests_per_batch": round(stats["requests"] / batches, 2) if batches else None,
+            **stats,
+        }
@@ -0,0 +1,278 @@
+"""Numpy-only evaluator for exported XGBoost tree ensembles.
+
+`export_xgboost` flattens a fitted booster into a handful of arrays (split
+feature, threshold, children, default direction, leaf value per node) and
+`TreeEnsemble` evaluates them for a whole feature matrix at once. It follows
+XGBoost's float32 semantics: inputs and thresholds are float32, NaN takes the
+default branch and leaf values are accumulated per class in tree order, so
+margins match XGBoost bit for bit. Softmax and sigmoid follow XGBoost's
+float32/double mix; probabilities can differ by a few ulps where the
+platform `expf` rounds differently (see `parity_check`).
+
+Exported ensembles are saved as `.npz` files and loaded without importing
+xgboost or scikit-learn.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+EXPORT_FORMAT_VERSION = 1
+# Largest accepted probability difference once margins match exactly.
+_PROBA_TOLERANCE = 1e-6
+
+
+@dataclass
+class TreeEnsemble:
+    # Per node, all trees concatenated; children are absolute node indices
+    # and leaves point to themselves.
+    split_feature: np.ndarray  # int32
+    threshold: np.ndarray  # float32
+    left: np.ndarray  # int32
+    right: np.ndarray  # int32
+    default_left: np.ndarray  # bool
+    value: np.ndarray  # float32, leaf value (unused for splits)
+    # Per tree
+    roots: np.ndarray  # int32
+    tree_class: np.ndarray  # int32
+    base_margin: np.ndarray  # float32, one per class
+    depth: int
+    objective: str
+    num_feature: int
+
+    @property
+    def num_class(self) -> int:
+        return int(self.base_margin.shape[0])
+
+    def predict_margin(self, matrix: np.ndarray) -> np.ndarray:
+        data = np.ascontiguousarray(matrix, dtype=np.float32)
+        flat = data.ravel()
+        # Row offsets into the flattened matrix; flat np.take gathers are
+        # much cheaper than 2-D fancy indexing.
+        offsets = (np.arange(data.shape[0], dtype=np.int64) * data.shape[1])[:, None]
+        node = np.broadcast_to(self.roots, (data.shape[0], self.roots.shape[0])).copy()
+        for _ in range(self.depth):
+            values = np.take(flat, offsets + np.take(self.split_feature, node))
+            go_left = np.where(np.isnan(values), np.take(self.default_left, node), values < np.take(self.threshold, node))
+            node = np.where(go_left, np.take(self.left, node), np.take(self.right, node))
+        leaves = np.take(self.value, node)
+
+        margin = np.empty((data.shape[0], self.num_class), dtype=np.float32)
+        for cls in range(self.num_class):
+            # cumsum accumulates sequentially in float32, like XGBoost's
+            # tree-by-tree prediction loop (np.sum would use pairwise sums).
+            columns = np.concatenate(
+                [np.full((data.shape[0], 1), self.base_margin[cls], dtype=np.float32), leaves[:, self.tree_class == cls]],
+                axis=1,
+            )
+            margin[:, cls] = np.cumsum(columns, axis=1, dtype=np.float32)[:, -1]
+        return margin
+
+    def predict_proba(self, matrix: np.ndarray) -> np.ndarray:
+        margin = self.predict_margin(matrix)
+        if self.objective == "multi:softprob":
+            shifted = margin - margin.max(axis=1, keepdims=True)
+            # expf in double then rounded matches glibc's correctly rounded expf.
+            exps = np.exp(shifted.astype(np.float64)).astype(np.float32)
+            # XGBoost sums the float32 exps in double, then divides in float32.
+            total = np.cumsum(exps.astype(np.float64), axis=1)[:, -1:].astype(np.float32)
+            return exps / total
+        if self.objective == "binary:logistic":
+            # XGBoost's float32 sigmoid: 1 / (expf(min(-x, 88.7)) + 1 + 1e-16).
+            exps = np.exp(np.minimum(-margin[:, 0], np.float32(88.7)).astype(np.float64)).astype(np.float32)
+            positive = np.float32(1.0) / (exps + np.float32(1.0) + np.float32(1e-16))
+            return np.stack([np.float32(1.0) - positive, positive], axis=1)
+        raise ValueError(f"unsupported objective: {self.objective}")
+
+    def predict(self, matrix: np.ndarray) -> np.ndarray:
+        return np.argmax(self.predict_proba(matrix), axis=1)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "split_feature": self.split_feature,
+            "threshold": self.threshold,
+            "left": self.left,
+            "right": self.right,
+            "default_left": self.default_left,
+            "value": self.value,
+            "roots": self.roots,
+            "tree_class": self.tree_class,
+            "base_margin": self.base_margin,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> "TreeEnsemble":
+        return cls(
+            split_feature=arrays["split_feature"],
+            threshold=arrays["threshold"],
+            left=arrays["left"],
+            right=arrays["right"],
+            default_left=arrays["default_left"],
+            value=arrays["value"],
+            roots=arrays["roots"],
+            tree_class=arrays["tree_class"],
+            base_margin=arrays["base_margin"],
+            depth=int(meta["depth"]),
+            objective=str(meta["objective"]),
+            num_feature=int(meta["num_feature"]),
+        )
+
+
+def export_xgboost(model: Any) -> TreeEnsemble:
+    """Flatten a fitted XGBClassifier/Booster (gbtree, numerical splits only)."""
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    learner = json.loads(booster.save_raw("json"))["learner"]
+    objective = learner["objective"]["name"]
+    if objective not in {"multi:softprob", "binary:logistic"}:
+        raise ValueError(f"unsupported objective: {objective}")
+    gradient_booster = learner["gradient_booster"]
+    if gradient_booster.get("name") != "gbtree":
+        raise ValueError(f"unsupported booster: {gradient_booster.get('name')}")
+
+    params = learner["learner_model_param"]
+    num_class = max(1, int(params.get("num_class") or 0))
+    base_score = float(params["base_score"])
+    if objective == "binary:logistic":
+        # XGBoost stores base_score as a probability for logistic objectives
+        # and converts it in float32: -logf(1.0f / p - 1.0f).
+        odds = np.float32(1.0) / np.float32(base_score) - np.float32(1.0)
+        base_score = float(-np.float32(np.log(np.float64(odds))))
+
+    model_dump = gradient_booster["model"]
+    trees: List[Dict[str, Any]] = model_dump["trees"]
+    tree_info = model_dump["tree_info"]
+    best_iteration = _best_iteration(model)
+    if best_iteration is not None:
+        trees = trees[: (best_iteration + 1) * num_class]
+        tree_info = tree_info[: len(trees)]
+
+    split_feature: List[np.ndarray] = []
+    threshold: List[np.ndarray] = []
+    left: List[np.ndarray] = []
+    right: List[np.ndarray] = []
+    default_left: List[np.ndarray] = []
+    value: List[np.ndarray] = []
+    roots: List[int] = []
+    depth = 0
+    offset = 0
+    for tree in trees:
+        if any(int(kind) != 0 for kind in tree.get("split_type", [])):
+            raise ValueError("categorical splits are not supported")
+        tree_left = np.asarray(tree["left_children"], dtype=np.int64)
+        tree_right = np.asarray(tree["right_children"], dtype=np.int64)
+        conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+        size = tree_left.shape[0]
+        is_leaf = tree_left == -1
+        local = np.arange(size)
+
+        split_feature.append(np.where(is_leaf, 0, np.asarray(tree["split_indices"], dtype=np.int64)))
+        threshold.append(np.where(is_leaf, np.float32(0), conditions).astype(np.float32))
+        left.append(np.where(is_leaf, local, tree_left) + offset)
+        right.append(np.where(is_leaf, local, tree_right) + offset)
+        default_left.append(np.asarray(tree["default_left"], dtype=bool))
+        # Leaves keep their value in split_conditions.
+        value.append(np.where(is_leaf, conditions, np.float32(0)).astype(np.float32))
+        roots.append(offset)
+        depth = max(depth, _tree_depth(tree_left, tree_right))
+        offset += size
+
+    return TreeEnsemble(
+        split_feature=np.concatenate(split_feature).astype(np.int32),
+        threshold=np.concatenate(threshold),
+        left=np.concatenate(left).astype(np.int32),
+        right=np.concatenate(right).astype(np.int32),
+        default_left=np.concatenate(default_left),
+        value=np.concatenate(value),
+        roots=np.asarray(roots, dtype=np.int32),
+        tree_class=np.asarray(tree_info, dtype=np.int32),
+        base_margin=np.full(num_class if objective == "multi:softprob" else 1, base_score, dtype=np.float32),
+        depth=depth,
+        objective=objective,
+        num_feature=int(params["num_feature"]),
+    )
+
+
+def _best_iteration(model: Any) -> Optional[int]:
+    """The early-stopping iteration, None if the model was not early stopped."""
+    try:
+        best = getattr(model, "best_iteration", None)
+    except Exception:
+        return None
+    return int(best) if best is not None else None
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth = 0
+    frontier = [0]
+    while frontier:
+        children = [child for node in frontier for child in (left[node], right[node]) if child != -1]
+        if not children:
+            break
+        depth += 1
+        frontier = children
+    return depth
+
+
+def save(path: Path, ensemble: TreeEnsemble, meta: Dict[str, Any]) -> None:
+    """Write arrays and JSON metadata (plan spec, parity report, ...) to `.npz`."""
+    meta = {
+        **meta,
+        "format_version": EXPORT_FORMAT_VERSION,
+        "depth": ensemble.depth,
+        "objective": ensemble.objective,
+        "num_feature": ensemble.num_feature,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+    np.savez_compressed(tmp_path, meta=np.array(json.dumps(meta)), **ensemble.arrays())
+    tmp_path.replace(path)
+
+
+def load(path: Path) -> tuple[TreeEnsemble, Dict[str, Any]]:
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data["meta"]))
+        if meta.get("format_version") != EXPORT_FORMAT_VERSION:
+            raise ValueError(f"unsupported export format: {meta.get('format_version')}")
+        arrays = {key: data[key] for key in data.files if key != "meta"}
+    return TreeEnsemble.from_arrays(arrays, meta), meta
+
+
+def parity_check(model: Any, ensemble: TreeEnsemble, matrix: np.ndarray) -> Dict[str, Any]:
+    """Compare the ensemble with the original XGBoost model on `matrix`.
+
+    Margins (summed leaf values) must match bit for bit. Probabilities may
+    differ by a few float32 ulps (at most _PROBA_TOLERANCE), which comes
+    from the platform's `expf` rounding inside XGBoost's softmax/sigmoid.
+    """
+    import xgboost
+
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    # The export keeps the trees up to best_iteration, as predict_proba does.
+    best_iteration = _best_iteration(model)
+    expected_margin = np.asarray(
+        booster.predict(
+            xgboost.DMatrix(matrix, missing=np.nan),
+            output_margin=True,
+            iteration_range=(0, best_iteration + 1) if best_iteration is not None else (0, 0),
+        ),
+        dtype=np.float32,
+    ).reshape(matrix.shape[0], -1)
+    expected = np.asarray(model.predict_proba(matrix), dtype=np.float32)
+    margin = ensemble.predict_margin(matrix)
+    actual = ensemble.predict_proba(matrix)
+    ulps = np.abs(expected.view(np.int32).astype(np.int64) - actual.view(np.int32).astype(np.int64))
+    report = {
+        "rows": int(matrix.shape[0]),
+        "margin_bit_exact": bool(np.array_equal(expected_margin.view(np.uint32), margin.view(np.uint32))),
+        "proba_bit_exact": bool(np.array_equal(expected.view(np.uint32), actual.view(np.uint32))),
+        "proba_max_ulp": int(ulps.max()) if ulps.size else 0,
+        "proba_max_abs_diff": float(np.max(np.abs(expected.astype(np.float64) - actual))) if expected.size else 0.0,
+    }
+    report["accepted"] = report["margin_bit_exact"] and report["proba_max_abs_diff"] <= _PROBA_TOLERANCE
+    return report
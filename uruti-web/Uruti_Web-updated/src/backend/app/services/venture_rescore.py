@@ -0,0 +1,202 @@
+"""Admin-triggered bulk rescore of every venture after a model update.
+
+Ventures are streamed in ascending id order in chunks. Each chunk is scored
+with a single `VentureScorer.score_many` pass and written back with one bulk
+UPDATE. Progress (`last_venture_id`, `processed`) is committed after every
+chunk, so a failed, cancelled or interrupted job resumes where it stopped.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import desc, func, update
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import Venture, VentureRescoreJob
+from .venture_scorer import venture_scorer
+
+logger = logging.getLogger(__name__)
+
+# A "pending" or "running" job not updated for this long is treated as
+# abandoned (e.g. its worker process restarted before or while running it)
+# and may be resumed.
+_STALE_AFTER_SECONDS = 120
+_ACTIVE_STATUSES = {"pending", "running"}
+_RESUMABLE_STATUSES = _ACTIVE_STATUSES | {"failed", "cancelled"}
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+class VentureRescoreRunner:
+    """Runs at most one rescore job per process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._active_job_id: Optional[int] = None
+        self._cancel = threading.Event()
+
+    def is_running(self) -> bool:
+        return self._active_job_id is not None
+
+    def latest(self, db: Session) -> Optional[VentureRescoreJob]:
+        return db.query(VentureRescoreJob).order_by(desc(VentureRescoreJob.id)).first()
+
+    def start(
+        self,
+        db: Session,
+        *,
+        user_id: Optional[int],
+        chunk_size: int,
+        restart: bool = False,
+    ) -> VentureRescoreJob:
+        """Create a job, or resume the latest unfinished one unless `restart`.
+
+        Raises RuntimeError if a job is running here or, judging by its
+        heartbeat, is pending or running in any worker.
+        """
+        with self._lock:
+            if self.is_running():
+                raise RuntimeError("A rescore job is already running")
+
+            latest = self.latest(db)
+            if latest is not None and latest.status in _ACTIVE_STATUSES:
+                heartbeat = _as_utc(latest.updated_at or latest.created_at)
+                age = (datetime.now(timezone.utc) - heartbeat).total_seconds() if heartbeat else None
+                if age is not None and age < _STALE_AFTER_SECONDS:
+                    raise RuntimeError("A rescore job is already pending or running")
+
+            if latest is not None and latest.status in _RESUMABLE_STATUSES and not restart:
+                job = latest
+                job.chunk_size = chunk_size
+                job.error = None
+            else:
+                job = VentureRescoreJob(chunk_size=chunk_size, started_by=user_id)
+                db.add(job)
+                db.flush()
+
+            remaining = (
+                db.query(func.count(Venture.id))
+                .filter(Venture.id > (job.last_venture_id or 0))
+                .scalar()
+            )
+            job.total = int(job.processed or 0) + int(remaining or 0)
+            job.status = "pending"
+            job.finished_at = None
+            db.commit()
+            db.refresh(job)
+
+            self._cancel.clear()
+            return job
+
+    def cancel(self) -> bool:
+        if not self.is_running():
+            return False
+        self._cancel.set()
+        return True
+
+    def run(self, job_id: int) -> None:
+        """Process the job chunk by chunk. Meant to run in a worker thread.
+
+        The job only counts as running in this process from here on, so a
+        job whose run never starts goes stale and can be resumed."""
+        with self._lock:
+            if self._active_job_id is not None:
+                return
+            self._active_job_id = job_id
+        db = SessionLocal()
+        job: Optional[VentureRescoreJob] = None
+        try:
+            claimed = db.execute(
+                update(VentureRescoreJob)
+                .where(VentureRescoreJob.id == job_id, VentureRescoreJob.status == "pending")
+                .values(status="running")
+            ).rowcount
+            db.commit()
+            if not claimed:
+                return
+            job = db.get(VentureRescoreJob, job_id)
+
+            while True:
+                if self._cancel.is_set():
+                    job.status = "cancelled"
+                    break
+
+                ventures = (
+                    db.query(Venture)
+                    .filter(Venture.id > (job.last_venture_id or 0))
+                    .order_by(Venture.id)
+                    .limit(job.chunk_size)
+                    .all()
+                )
+                if not ventures:
+                    job.status = "completed"
+                    break
+
+                results = venture_scorer.score_many(ventures)
+                db.execute(
+                    update(Venture),
+                    [
+                        {
+                            "id": venture.id,
+                            "uruti_score": float(result.get("uruti_score") or 0.0),
+                            "score_breakdown": result,
+                        }
+                        for venture, result in zip(ventures, results)
+                    ],
+                )
+                job.processed = int(job.processed or 0) + len(ventures)
+                job.last_venture_id = ventures[-1].id
+                job.model_name = str(results[-1].get("model_name") or "")
+                db.commit()
+                # Keep the identity map from growing with every chunk.
+                db.expunge_all()
+                job = db.get(VentureRescoreJob, job_id)
+
+            if job.status == "completed":
+                job.finished_at = datetime.now(timezone.utc)
+            db.commit()
+        except Exception as exc:
+            logger.exception("venture rescore job %s failed", job_id)
+            db.rollback()
+            job = db.get(VentureRescoreJob, job_id)
+            if job is not None:
+                job.status = "failed"
+                job.error = str(exc)
+                db.commit()
+        finally:
+            db.close()
+            with self._lock:
+                self._active_job_id = None
+
+    @staticmethod
+    def describe(job: Optional[VentureRescoreJob]) -> Dict[str, Any]:
+        if job is None:
+            return {"status": "idle"}
+        total = int(job.total or 0)
+        processed = int(job.processed or 0)
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "chunk_size": job.chunk_size,
+            "total": total,
+            "processed": processed,
+            "progress": round(processed / total, 4) if total else (1.0 if job.status == "completed" else 0.0),
+            "last_venture_id": job.last_venture_id,
+            "model_name": job.model_name,
+            "error": job.error,
+            "created_at": job.created_at,
+            "updated_at": job.updated_at,
+            "finished_at": job.finished_at,
+        }
+
+
+venture_rescore = VentureRescoreRunner()
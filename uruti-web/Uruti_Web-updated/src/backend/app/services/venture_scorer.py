@@ -1,16 +1,266 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import copy
+import hashlib
 import json
+import math
+import os
 import subprocess
 import sys
 import tempfile
+import threading
+import time
+from importlib import metadata
 
-import joblib
-import pandas as pd
+import numpy as np
+
+from ..config import settings
+from . import tree_ensemble
+from .scoring_worker import ScoringWorkerError, ScoringWorkerPool
+from .tree_ensemble import TreeEnsemble
+
+# Packages whose versions decide whether the bundle unpickles safely.
+_PROBE_CACHE_PACKAGES = ("numpy", "scikit-learn", "xgboost", "joblib")
+_PROBE_CACHE_MAX_ENTRIES = 16
+# After a scoring worker fails to start, wait this long before trying again.
+_WORKER_RETRY_SECONDS = 60.0
+# Version tag for scores produced by the rule-based fallback.
+_HEURISTIC_MODEL_VERSION = "heuristic_fallback@1"
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+def _attr_float(attr: str, default: float = 0.0, scale: float = 1.0) -> Callable[[Any], float]:
+    if scale == 1.0:
+        return lambda venture: float(getattr(venture, attr, default) or default)
+    return lambda venture: float(getattr(venture, attr, default) or default) * scale
+
+
+def _enum_text(attr: str, default: str) -> Callable[[Any], str]:
+    def extract(venture: Any) -> str:
+        value = getattr(venture, attr, None)
+        return str(value.value if hasattr(value, "value") else value or default)
+
+    return extract
+
+
+def _constant(value: Any) -> Callable[[Any], Any]:
+    return lambda venture: value
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class _FeaturePlan:
+    """Feature extraction compiled once per loaded bundle.
+
+    `extractors[i]` computes input column `names[i]` for a venture. When the
+    estimator is a Pipeline of a ColumnTransformer (imputers, StandardScaler,
+    OneHotEncoder) followed by the model, that preprocessing is folded into
+    the plan: numeric features are written into a preallocated float matrix
+    and imputed/scaled in one vectorized step, categoricals are looked up in
+    precomputed one-hot column maps, and the model is called on the matrix
+    directly. Other estimators get a DataFrame of raw features instead.
+    """
+
+    def __init__(self, names: List[str]) -> None:
+        self.names = names
+        # Bound by VentureScorer; scoring worker processes never need them.
+        self.extractors: List[Callable[[Any], Any]] = []
+        self.compiled = False
+        self.predictor: Any = None
+        self.width = 0
+        # (feature index, output column)
+        self.numeric_slots: List[Tuple[int, int]] = []
+        # (feature index, imputer fill value, category -> output column)
+        self.categorical_slots: List[Tuple[int, Any, Dict[Any, int]]] = []
+        self.numeric_columns = np.empty(0, dtype=np.intp)
+        self.numeric_fill = np.empty(0)
+        self.numeric_mean = np.empty(0)
+        self.numeric_scale = np.empty(0)
+        # XGBoost treats entries absent from a sparse matrix as missing, not 0.
+        self.zeros_are_missing = False
+
+    @classmethod
+    def compile(cls, estimator: Any, names: List[str]) -> "_FeaturePlan":
+        plan = cls(names)
+        try:
+            plan.compiled = plan._compile_pipeline(estimator)
+        except Exception:
+            plan.compiled = False
+        return plan
+
+    def _compile_pipeline(self, estimator: Any) -> bool:
+        from sklearn.compose import ColumnTransformer
+        from sklearn.impute import SimpleImputer
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+        steps = list(getattr(estimator, "steps", None) or [])
+        if len(steps) != 2 or not isinstance(steps[0][1], ColumnTransformer):
+            return False
+        preprocessor, predictor = steps[0][1], steps[1][1]
+        index = {name: idx for idx, name in enumerate(self.names)}
+
+        numeric: List[Tuple[int, int, float, float, float]] = []
+        column = 0
+        for _, transformer, columns in preprocessor.transformers_:
+            if transformer == "drop":
+                continue
+            if isinstance(transformer, str):
+                return False
+            chain = [step for _, step in transformer.steps] if isinstance(transformer, Pipeline) else [transformer]
+            imputer = chain.pop(0) if chain and isinstance(chain[0], SimpleImputer) else None
+            if imputer is not None and (imputer.add_indicator or not _is_missing(imputer.missing_values)):
+                return False
+            feature_ids = [index[str(name)] if not isinstance(name, int) else name for name in columns]
+
+            if len(chain) == 1 and isinstance(chain[0], OneHotEncoder):
+                encoder = chain[0]
+                if (
+                    encoder.handle_unknown != "ignore"
+                    or encoder.drop_idx_ is not None
+                    or getattr(encoder, "_infrequent_enabled", False)
+                ):
+                    return False
+                for pos, feature_id in enumerate(feature_ids):
+                    categories = list(encoder.categories_[pos])
+                    lookup = {category: column + offset for offset, category in enumerate(categories)}
+                    fill = imputer.statistics_[pos] if imputer is not None else None
+                    self.categorical_slots.append((feature_id, fill, lookup))
+                    column += len(categories)
+            elif len(chain) <= 1 and all(isinstance(step, StandardScaler) for step in chain):
+                scaler = chain[0] if chain else None
+                for pos, feature_id in enumerate(feature_ids):
+                    fill = float(imputer.statistics_[pos]) if imputer is not None else math.nan
+                    mean = float(scaler.mean_[pos]) if scaler is not None and scaler.with_mean else 0.0
+                    scale = float(scaler.scale_[pos]) if scaler is not None and scaler.with_std else 1.0
+                    numeric.append((feature_id, column, fill, mean, scale))
+                    column += 1
+            else:
+                return False
+
+        expected = getattr(predictor, "n_features_in_", column)
+        if column != expected:
+            return False
+
+        if getattr(preprocessor, "sparse_output_", False) and type(predictor).__module__.startswith("xgboost"):
+            if not _is_missing(getattr(predictor, "missing", math.nan)):
+                return False
+            self.zeros_are_missing = True
+
+        self.predictor = predictor
+        self.width = column
+        self.numeric_slots = [(feature_id, col) for feature_id, col, _, _, _ in numeric]
+        self.numeric_columns = np.array([item[1] for item in numeric], dtype=np.intp)
+        self.numeric_fill = np.array([item[2] for item in numeric], dtype=np.float64)
+        self.numeric_mean = np.array([item[3] for item in numeric], dtype=np.float64)
+        self.numeric_scale = np.array([item[4] for item in numeric], dtype=np.float64)
+        return True
+
+    def matrix(self, rows: Sequence[Sequence[Any]]) -> np.ndarray:
+        """Model-ready feature matrix from raw feature rows (see `rows`)."""
+        out = np.zeros((len(rows), self.width), dtype=np.float64)
+        for row, raw in enumerate(rows):
+            values = out[row]
+            for feature_id, col in self.numeric_slots:
+                values[col] = float(raw[feature_id])
+            for feature_id, fill, lookup in self.categorical_slots:
+                value = raw[feature_id]
+                if _is_missing(value):
+                    value = fill
+                col = lookup.get(value)
+                if col is not None:
+                    values[col] = 1.0
+
+        if self.numeric_columns.size:
+            block = out[:, self.numeric_columns]
+            block = np.where(np.isnan(block), self.numeric_fill, block)
+            out[:, self.numeric_columns] = (block - self.numeric_mean) / self.numeric_scale
+        if self.zeros_are_missing:
+            out[out == 0.0] = np.nan
+        return out
+
+    def rows(self, ventures: Sequence[Any]) -> List[List[Any]]:
+        """Raw feature values per venture, in `names` order."""
+        return [[extract(venture) for extract in self.extractors] for venture in ventures]
+
+    def spec(self) -> Dict[str, Any]:
+        """Picklable form of the plan (everything except the extractors)."""
+        return {
+            "names": self.names,
+            "compiled": self.compiled,
+            "width": self.width,
+            "numeric_slots": self.numeric_slots,
+            "categorical_slots": self.categorical_slots,
+            "numeric_columns": self.numeric_columns,
+            "numeric_fill": self.numeric_fill,
+            "numeric_mean": self.numeric_mean,
+            "numeric_scale": self.numeric_scale,
+            "zeros_are_missing": self.zeros_are_missing,
+        }
+
+    def json_spec(self) -> Dict[str, Any]:
+        """`spec()` with arrays and numpy scalars turned into JSON types."""
+
+        def plain(value: Any) -> Any:
+            return value.item() if isinstance(value, np.generic) else value
+
+        spec = self.spec()
+        for key in ("numeric_columns", "numeric_fill", "numeric_mean", "numeric_scale"):
+            spec[key] = spec[key].tolist()
+        spec["categorical_slots"] = [
+            [feature_id, plain(fill), [[plain(category), col] for category, col in lookup.items()]]
+            for feature_id, fill, lookup in self.categorical_slots
+        ]
+        return spec
+
+    @classmethod
+    def from_spec(cls, spec: Dict[str, Any]) -> "_FeaturePlan":
+        """Rebuild a plan from `spec()` or `json_spec()` output."""
+        plan = cls(list(spec["names"]))
+        plan.compiled = bool(spec["compiled"])
+        plan.width = int(spec["width"])
+        plan.zeros_are_missing = bool(spec["zeros_are_missing"])
+        plan.numeric_slots = [(int(feature_id), int(col)) for feature_id, col in spec["numeric_slots"]]
+        plan.categorical_slots = [
+            (
+                int(feature_id),
+                fill,
+                dict(lookup) if isinstance(lookup, dict) else {category: int(col) for category, col in lookup},
+            )
+            for feature_id, fill, lookup in spec["categorical_slots"]
+        ]
+        plan.numeric_columns = np.asarray(spec["numeric_columns"], dtype=np.intp)
+        plan.numeric_fill = np.asarray(spec["numeric_fill"], dtype=np.float64)
+        plan.numeric_mean = np.asarray(spec["numeric_mean"], dtype=np.float64)
+        plan.numeric_scale = np.asarray(spec["numeric_scale"], dtype=np.float64)
+        return plan
+
+    def sample_matrix(self, count: int, seed: int = 0) -> np.ndarray:
+        """Random model-ready rows (plus an all-missing row) for parity checks."""
+        rng = np.random.default_rng(seed)
+        out = np.zeros((count + 1, self.width), dtype=np.float64)
+        if self.numeric_columns.size:
+            out[:count, self.numeric_columns] = rng.normal(0.0, 3.0, size=(count, self.numeric_columns.size))
+        for _, _, lookup in self.categorical_slots:
+            columns = np.fromiter(lookup.values(), dtype=np.intp, count=len(lookup))
+            if columns.size:
+                out[np.arange(count), rng.choice(columns, size=count)] = 1.0
+        if self.zeros_are_missing:
+            out[out == 0.0] = np.nan
+        else:
+            out[count] = np.nan
+        return out
 
 
 @dataclass
@@ -19,18 +269,25 @@ class _LoadedBundle:
     class_names: List[str]
     model_name: str
     bundle_path: str
+    plan: Optional[_FeaturePlan] = None
+    # Set when the estimator lives in scoring worker processes (estimator is None).
+    pool: Optional[ScoringWorkerPool] = None
+    estimator_class: str = ""
+    # Changes whenever the bundle file does; stored with every score.
+    model_version: str = ""
+    # Numpy evaluator exported from an XGBoost predictor (see tree_ensemble).
+    ensemble: Optional[TreeEnsemble] = None
+    # Input columns, when there is no in-process estimator to ask.
+    feature_names: Optional[List[str]] = None
 
 
-def _clamp(value: float, low: float, high: float) -> float:
-    return max(low, min(high, value))
-
-
-def _probe_bundle(bundle_path: Path) -> bool:
+def _probe_bundle(bundle_path: Path) -> Optional[bool]:
     """Return True if joblib.load() succeeds in an isolated subprocess.
 
     Running the load in a child process ensures that a native crash (segfault)
     due to numpy/sklearn ABI incompatibilities cannot kill the main server
     process.  The child exits with code 0 on success and non-zero on failure.
+    Returns None when no verdict could be reached (timeout, spawn failure).
     """
     probe_script = (
         "import sys, joblib; "
@@ -48,7 +305,68 @@ def _probe_bundle(bundle_path: Path) -> bool:
         )
         return result.returncode == 0
     except Exception:
-        return False
+        return None
+
+
+def _package_version(name: str) -> Optional[str]:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _probe_cache_key(bundle_digest: str) -> str:
+    """Bundle content hash plus the versions of everything that unpickles it."""
+    versions = ",".join(f"{name}={_package_version(name)}" for name in _PROBE_CACHE_PACKAGES)
+    python = f"python={sys.version_info.major}.{sys.version_info.minor}"
+    return f"{bundle_digest}|{versions},{python}"
+
+
+def _feature_fingerprint(values: Sequence[Any]) -> str:
+    """Stable hash of the exact model input values for one venture."""
+    payload = json.dumps([value if isinstance(value, (int, float, str, bool)) or value is None else str(value) for value in values])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _probe_cache_path() -> Path:
+    if settings.VENTURE_SCORER_PROBE_CACHE_PATH:
+        return Path(settings.VENTURE_SCORER_PROBE_CACHE_PATH)
+    return Path(tempfile.gettempdir()) / "uruti_bundle_probe_cache.json"
+
+
+def _read_probe_cache(path: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_probe_cache(path: Path, key: str, ok: bool, probe_seconds: float) -> None:
+    """Record a verdict, keeping the newest entries. Written atomically since
+    several workers may start at once."""
+    entries = _read_probe_cache(path)
+    entries[key] = {
+        "ok": ok,
+        "probe_seconds": round(probe_seconds, 3),
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+    }
+    newest = sorted(entries.items(), key=lambda item: str(item[1].get("checked_at", "")), reverse=True)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(dict(newest[:_PROBE_CACHE_MAX_ENTRIES]), indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
 
 
 class VentureScorer:
@@ -56,8 +374,25 @@ class VentureScorer:
         self._loaded: Optional[_LoadedBundle] = None
         self._load_error: Optional[str] = None
         self._model_folder_name = "Uruti-Investor_Intelligence_and_Ranker"
+        self._paths: Optional[Tuple[Path, Optional[Path]]] = None
+        # Startup warmup and the runtime status collector may load concurrently.
+        self._load_lock = threading.Lock()
+        # Timing of the last load attempt, reported by get_model_info().
+        self._warmup: Dict[str, Any] = {}
+        # Probe verdicts for this process, keyed by bundle (path, size, mtime),
+        # so a failed load does not rehash or reprobe on every score call.
+        self._probe_verdicts: Dict[Tuple[str, int, int], bool] = {}
+        self._bundle_digests: Dict[Tuple[str, int, int], str] = {}
+        self._pool: Optional[ScoringWorkerPool] = None
+        self._worker_retry_at = 0.0
+        # Model results keyed by (model version, feature fingerprint), LRU-bounded.
+        self._score_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._score_cache_lock = threading.Lock()
+        self._score_cache_stats = {"stored_hits": 0, "memo_hits": 0, "misses": 0}
 
     def _resolve_paths(self) -> Tuple[Optional[Path], Optional[Path]]:
+        if self._paths is not None:
+            return self._paths
         rel_bundle = Path("Models/Uruti-Investor_Intelligence_and_Ranker/uruti_bundle.joblib")
         rel_meta = Path("Models/Uruti-Investor_Intelligence_and_Ranker/uruti_bundle_meta.json")
 
@@ -66,10 +401,58 @@ class VentureScorer:
             bundle_path = parent / rel_bundle
             meta_path = parent / rel_meta
             if bundle_path.exists():
-                return bundle_path, meta_path if meta_path.exists() else None
+                self._paths = (bundle_path, meta_path if meta_path.exists() else None)
+                return self._paths
         return None, None
 
+    def _bundle_digest(self, bundle_path: Path, warmup: Dict[str, Any]) -> str:
+        """SHA-256 of the bundle file, memoized per (path, size, mtime)."""
+        stat = bundle_path.stat()
+        memo_key = (str(bundle_path), stat.st_size, stat.st_mtime_ns)
+        if memo_key not in self._bundle_digests:
+            hash_started = time.perf_counter()
+            self._bundle_digests[memo_key] = _file_sha256(bundle_path)
+            warmup["hash_seconds"] = round(time.perf_counter() - hash_started, 4)
+        return self._bundle_digests[memo_key]
+
+    def _probe_verdict(self, bundle_path: Path, warmup: Dict[str, Any]) -> bool:
+        """Probe verdict for the bundle, from memory, the on-disk cache, or a
+        fresh probe. Only crash/success verdicts are cached, not timeouts."""
+        stat = bundle_path.stat()
+        memo_key = (str(bundle_path), stat.st_size, stat.st_mtime_ns)
+        if memo_key in self._probe_verdicts:
+            warmup["probe"] = "memory"
+            return self._probe_verdicts[memo_key]
+
+        key = _probe_cache_key(self._bundle_digest(bundle_path, warmup))
+        cache_path = _probe_cache_path()
+        warmup["probe_cache_path"] = str(cache_path)
+
+        cached = _read_probe_cache(cache_path).get(key)
+        if isinstance(cached, dict) and isinstance(cached.get("ok"), bool):
+            warmup["probe"] = "cached"
+            verdict = cached["ok"]
+        else:
+            probe_started = time.perf_counter()
+            result = _probe_bundle(bundle_path)
+            probe_seconds = time.perf_counter() - probe_started
+            warmup["probe"] = "ran" if result is not None else "timeout"
+            warmup["probe_seconds"] = round(probe_seconds, 4)
+            if result is None:
+                return False
+            verdict = result
+            _write_probe_cache(cache_path, key, verdict, probe_seconds)
+
+        self._probe_verdicts[memo_key] = verdict
+        return verdict
+
     def _load(self) -> Optional[_LoadedBundle]:
+        if self._loaded is not None:
+            return self._loaded
+        with self._load_lock:
+            return self._load_locked()
+
+    def _load_locked(self) -> Optional[_LoadedBundle]:
         if self._loaded is not None:
             return self._loaded
 
@@ -77,6 +460,201 @@ class VentureScorer:
         if bundle_path is None:
             return None
 
+        started = time.perf_counter()
+        exported = self._load_exported(bundle_path, started, {"started_at": datetime.now(timezone.utc).isoformat()})
+        if exported is not None:
+            return exported
+
+        if settings.VENTURE_SCORER_OUT_OF_PROCESS:
+            return self._load_worker(bundle_path, meta_path)
+
+        warmup: Dict[str, Any] = {"started_at": datetime.now(timezone.utc).isoformat(), "mode": "in_process"}
+
+        # Probe the bundle in a child process first. If the subprocess crashes
+        # (segfault due to numpy/sklearn ABI mismatch) the main server process
+        # stays alive and we fall back to the heuristic scorer.
+        verdict = self._probe_verdict(bundle_path, warmup)
+        if warmup.get("probe") != "memory":
+            # Keep reporting the original warmup when a failed load is retried.
+            self._warmup = warmup
+        if not verdict:
+            self._load_error = (
+                "bundle probe subprocess crashed or timed out — "
+                "likely numpy/sklearn ABI incompatibility on this host; "
+                "using heuristic fallback"
+            )
+            warmup["total_seconds"] = round(time.perf_counter() - started, 4)
+            return None
+
+        try:
+            loaded = self._read_bundle(bundle_path, meta_path, warmup)
+        except Exception as exc:
+            self._load_error = f"failed to load model bundle: {exc}"
+            warmup["total_seconds"] = round(time.perf_counter() - started, 4)
+            return None
+        self._bind_extractors(loaded.plan)
+        digest = self._bundle_digest(bundle_path, warmup)
+        loaded.model_version = f"{loaded.model_name}@{digest[:12]}"
+        loaded.ensemble = self._export_ensemble(loaded, digest, warmup)
+        if loaded.ensemble is not None:
+            loaded.estimator_class = f"TreeEnsemble ({loaded.estimator_class})"
+        warmup["total_seconds"] = round(time.perf_counter() - started, 4)
+        self._loaded = loaded
+        self._load_error = None
+        return self._loaded
+
+    def _load_worker(self, bundle_path: Path, meta_path: Optional[Path]) -> Optional[_LoadedBundle]:
+        """Serve the bundle from scoring worker processes. The worker itself
+        isolates load crashes, so no probe runs in this mode."""
+        if time.time() < self._worker_retry_at:
+            return None
+
+        started = time.perf_counter()
+        self._warmup = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "mode": "worker",
+            "probe": "skipped",
+        }
+        pool = ScoringWorkerPool(
+            str(bundle_path),
+            str(meta_path) if meta_path else None,
+            workers=settings.VENTURE_SCORER_WORKERS,
+            batch_window_ms=settings.VENTURE_SCORER_BATCH_WINDOW_MS,
+            max_batch=settings.VENTURE_SCORER_MAX_BATCH,
+            timeout_seconds=settings.VENTURE_SCORER_WORKER_TIMEOUT_SECONDS,
+        )
+        try:
+            info = pool.start()
+        except ScoringWorkerError as exc:
+            pool.close()
+            self._load_error = f"{exc}; using heuristic fallback"
+            self._worker_retry_at = time.time() + _WORKER_RETRY_SECONDS
+            self._warmup["total_seconds"] = round(time.perf_counter() - started, 4)
+            return None
+
+        if info.get("export") is not None:
+            self._warmup["export"] = info["export"]
+        if info.get("export_path"):
+            # The worker exported a numpy evaluator; serve from it in this
+            # process and let the worker go.
+            exported = self._load_exported(bundle_path, started, self._warmup)
+            if exported is not None:
+                pool.close()
+                return exported
+
+        plan = _FeaturePlan.from_spec(info["plan"])
+        self._bind_extractors(plan)
+        self._pool = pool
+        self._loaded = _LoadedBundle(
+            estimator=None,
+            class_names=list(info["class_names"]),
+            model_name=str(info["model_name"]),
+            bundle_path=str(bundle_path),
+            plan=plan,
+            pool=pool,
+            estimator_class=str(info["estimator_class"]),
+            model_version=f"{info['model_name']}@{self._bundle_digest(bundle_path, self._warmup)[:12]}",
+        )
+        self._warmup["compiled_plan"] = plan.compiled
+        self._warmup["total_seconds"] = round(time.perf_counter() - started, 4)
+        self._load_error = None
+        return self._loaded
+
+    def _export_path(self, bundle_digest: str) -> Path:
+        base = settings.VENTURE_SCORER_EXPORT_DIR
+        return (Path(base) if base else Path(tempfile.gettempdir())) / f"uruti_ranker_{bundle_digest[:16]}.npz"
+
+    def _export_ensemble(self, loaded: _LoadedBundle, bundle_digest: str, warmup: Dict[str, Any]) -> Optional[TreeEnsemble]:
+        """Flatten an XGBoost predictor into a numpy `TreeEnsemble`, check it
+        against the original and save it so later loads need neither xgboost
+        nor scikit-learn. Returns None (keep using the estimator) on failure."""
+        plan = loaded.plan
+        predictor = plan.predictor if plan is not None and plan.compiled else None
+        if (
+            not settings.VENTURE_SCORER_NUMPY_EVALUATOR
+            or predictor is None
+            or not type(predictor).__module__.startswith("xgboost")
+        ):
+            return None
+
+        path = self._export_path(bundle_digest)
+        export: Dict[str, Any] = {"path": str(path)}
+        warmup["export"] = export
+        try:
+            export_started = time.perf_counter()
+            ensemble = tree_ensemble.export_xgboost(predictor)
+            parity = tree_ensemble.parity_check(predictor, ensemble, plan.sample_matrix(2048))
+            export["parity"] = parity
+            if not parity["accepted"]:
+                export["error"] = "exported ensemble does not match the model"
+                return None
+            tree_ensemble.save(
+                path,
+                ensemble,
+                {
+                    "bundle_sha256": bundle_digest,
+                    "model_name": loaded.model_name,
+                    "class_names": loaded.class_names,
+                    "estimator_class": loaded.estimator_class,
+                    "feature_names": [str(name) for name in getattr(loaded.estimator, "feature_names_in_", [])],
+                    "plan": plan.json_spec(),
+                    "parity": parity,
+                },
+            )
+            export["seconds"] = round(time.perf_counter() - export_started, 4)
+            return ensemble
+        except Exception as exc:
+            export["error"] = str(exc)
+            return None
+
+    def _load_exported(self, bundle_path: Path, started: float, warmup: Dict[str, Any]) -> Optional[_LoadedBundle]:
+        """Serve from a numpy export of this exact bundle, if one was saved.
+
+        Nothing is unpickled, so neither the probe nor a scoring worker is
+        needed for crash isolation."""
+        if not settings.VENTURE_SCORER_NUMPY_EVALUATOR:
+            return None
+        bundle_digest = self._bundle_digest(bundle_path, warmup)
+        path = self._export_path(bundle_digest)
+        if not path.exists():
+            return None
+        try:
+            ensemble, meta = tree_ensemble.load(path)
+            if meta.get("bundle_sha256") != bundle_digest:
+                return None
+            plan = _FeaturePlan.from_spec(meta["plan"])
+        except Exception as exc:
+            warmup["export"] = {"path": str(path), "error": f"unreadable export: {exc}"}
+            return None
+
+        self._bind_extractors(plan)
+        model_name = str(meta.get("model_name") or self._model_folder_name)
+        warmup.update(
+            {
+                "mode": "numpy_evaluator",
+                "probe": "skipped",
+                "compiled_plan": plan.compiled,
+                "export": {**warmup.get("export", {}), "path": str(path), "parity": meta.get("parity")},
+                "total_seconds": round(time.perf_counter() - started, 4),
+            }
+        )
+        self._warmup = warmup
+        self._loaded = _LoadedBundle(
+            estimator=None,
+            class_names=[str(name) for name in meta.get("class_names", [])],
+            model_name=model_name,
+            bundle_path=str(bundle_path),
+            plan=plan,
+            estimator_class=f"TreeEnsemble ({meta.get('estimator_class')})",
+            model_version=f"{model_name}@{bundle_digest[:12]}",
+            ensemble=ensemble,
+            feature_names=[str(name) for name in meta.get("feature_names", [])],
+        )
+        self._load_error = None
+        return self._loaded
+
+    def _read_bundle(self, bundle_path: Path, meta_path: Optional[Path], warmup: Dict[str, Any]) -> _LoadedBundle:
+        """Unpickle the bundle and compile its feature plan (extractors unbound)."""
         class_names: List[str] = []
         model_name = self._model_folder_name
 
@@ -101,22 +679,11 @@ class VentureScorer:
         except Exception:
             pass
 
-        # Probe the bundle in a child process first. If the subprocess crashes
-        # (segfault due to numpy/sklearn ABI mismatch) the main server process
-        # stays alive and we fall back to the heuristic scorer.
-        if not _probe_bundle(bundle_path):
-            self._load_error = (
-                "bundle probe subprocess crashed or timed out — "
-                "likely numpy/sklearn ABI incompatibility on this host; "
-                "using heuristic fallback"
-            )
-            return None
+        import joblib
 
-        try:
-            loaded_obj = joblib.load(bundle_path)
-        except Exception as exc:
-            self._load_error = f"failed to load model bundle: {exc}"
-            return None
+        load_started = time.perf_counter()
+        loaded_obj = joblib.load(bundle_path)
+        warmup["load_seconds"] = round(time.perf_counter() - load_started, 4)
         estimator = loaded_obj
 
         if isinstance(loaded_obj, dict):
@@ -148,14 +715,26 @@ class VentureScorer:
 
         folder_name = bundle_path.parent.name if bundle_path.parent else self._model_folder_name
 
-        self._loaded = _LoadedBundle(
+        loaded = _LoadedBundle(
             estimator=estimator,
             class_names=class_names,
             model_name=folder_name,
             bundle_path=str(bundle_path),
+            estimator_class=estimator.__class__.__name__,
         )
-        self._load_error = None
-        return self._loaded
+        compile_started = time.perf_counter()
+        loaded.plan = _FeaturePlan.compile(estimator, self._feature_names(loaded))
+        warmup["plan_compile_seconds"] = round(time.perf_counter() - compile_started, 4)
+        warmup["compiled_plan"] = loaded.plan.compiled
+        return loaded
+
+    def close(self) -> None:
+        """Stop scoring workers (if any); the next score starts them again."""
+        with self._load_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+                self._loaded = None
 
     def get_model_info(self) -> Dict[str, Any]:
         bundle_path, meta_path = self._resolve_paths()
@@ -182,12 +761,18 @@ class VentureScorer:
                 "class_names": ["not_ready", "mentorship_needed", "investment_ready"],
                 "expected_feature_count": int(meta.get("expected_feature_count") or 10),
                 "score_definition": str(meta.get("score") or "Uruti score is 0-100"),
+                "warmup": dict(self._warmup),
+                "scoring_worker": None,
             }
 
         estimator = loaded.estimator
         expected_feature_count = int(meta.get("expected_feature_count") or 0)
         if expected_feature_count <= 0 and hasattr(estimator, "feature_names_in_"):
             expected_feature_count = len(list(estimator.feature_names_in_))
+        elif expected_feature_count <= 0 and loaded.feature_names is not None:
+            expected_feature_count = len(loaded.feature_names)
+        elif expected_feature_count <= 0 and loaded.pool is not None and loaded.pool.info:
+            expected_feature_count = len(loaded.pool.info.get("feature_names") or [])
 
         class_names = loaded.class_names or [
             str(c) for c in meta.get("class_names", []) if c is not None
@@ -197,13 +782,17 @@ class VentureScorer:
             "status": "ready",
             "model_source": "root_models_bundle",
             "model_name": loaded.model_name,
+            "model_version": loaded.model_version,
             "model_folder": loaded.model_name,
             "bundle_path": loaded.bundle_path,
             "meta_path": str(meta_path) if meta_path else None,
-            "inference_backend": estimator.__class__.__name__,
+            "inference_backend": loaded.estimator_class,
             "class_names": class_names,
             "expected_feature_count": expected_feature_count,
             "score_definition": str(meta.get("score") or "Uruti score is 0-100"),
+            "warmup": dict(self._warmup),
+            "scoring_worker": loaded.pool.status() if loaded.pool is not None else None,
+            "score_cache": self.score_cache_info(),
         }
 
     def _venture_age_years(self, venture: Any) -> float:
@@ -237,52 +826,54 @@ class VentureScorer:
                 filled += 1
         return round(filled / len(fields), 4)
 
-    def _feature_value(self, name: str, venture: Any) -> Any:
-        n = name.strip().lower()
-
-        numeric_defaults: Dict[str, float] = {
-            "revenue": float(getattr(venture, "revenue", 0.0) or 0.0),
-            "funding": float(getattr(venture, "funding_raised", 0.0) or 0.0),
-            "funding_raised": float(getattr(venture, "funding_raised", 0.0) or 0.0),
-            "funding_goal": float(getattr(venture, "funding_goal", 0.0) or 0.0),
-            "valuation": float(getattr(venture, "funding_goal", 0.0) or 0.0),
-            "employees": float(getattr(venture, "team_size", 1) or 1),
-            "team_size": float(getattr(venture, "team_size", 1) or 1),
-            "customers": float(getattr(venture, "customers", 0) or 0),
-            "mrr": float(getattr(venture, "mrr", 0.0) or 0.0),
-            "monthly_burn_rate": float(getattr(venture, "monthly_burn_rate", 0.0) or 0.0),
-            "age": self._venture_age_years(venture),
-            "startup_age": self._venture_age_years(venture),
-            "startup_age_years": self._venture_age_years(venture),
-            "profile_completeness": self._profile_completeness(venture),
-            "is_seeking_funding": 1.0 if bool(getattr(venture, "is_seeking_funding", False)) else 0.0,
-            "r&d spend": float(getattr(venture, "monthly_burn_rate", 0.0) or 0.0) * 0.35,
-            "administration": float(getattr(venture, "monthly_burn_rate", 0.0) or 0.0) * 0.25,
-            "marketing spend": float(getattr(venture, "monthly_burn_rate", 0.0) or 0.0) * 0.40,
-            "new york": 0.0,
-            "california": 0.0,
-            "florida": 0.0,
+    def _numeric_extractors(self) -> Dict[str, Callable[[Any], float]]:
+        age = self._venture_age_years
+        return {
+            "revenue": _attr_float("revenue"),
+            "funding": _attr_float("funding_raised"),
+            "funding_raised": _attr_float("funding_raised"),
+            "funding_goal": _attr_float("funding_goal"),
+            "valuation": _attr_float("funding_goal"),
+            "employees": _attr_float("team_size", 1),
+            "team_size": _attr_float("team_size", 1),
+            "customers": _attr_float("customers", 0),
+            "mrr": _attr_float("mrr"),
+            "monthly_burn_rate": _attr_float("monthly_burn_rate"),
+            "age": age,
+            "startup_age": age,
+            "startup_age_years": age,
+            "profile_completeness": self._profile_completeness,
+            "is_seeking_funding": lambda venture: 1.0 if bool(getattr(venture, "is_seeking_funding", False)) else 0.0,
+            "r&d spend": _attr_float("monthly_burn_rate", scale=0.35),
+            "administration": _attr_float("monthly_burn_rate", scale=0.25),
+            "marketing spend": _attr_float("monthly_burn_rate", scale=0.40),
+            "new york": _constant(0.0),
+            "california": _constant(0.0),
+            "florida": _constant(0.0),
         }
 
-        if n in numeric_defaults:
-            return numeric_defaults[n]
+    def _feature_extractor(self, name: str) -> Callable[[Any], Any]:
+        """Return the callable that computes feature `name` for a venture."""
+        n = name.strip().lower()
+
+        numeric = self._numeric_extractors()
+        if n in numeric:
+            return numeric[n]
 
         if n in {"sector", "industry"}:
-            value = getattr(venture, "industry", None)
-            return str(value.value if hasattr(value, "value") else value or "other")
+            return _enum_text("industry", "other")
 
         if n in {"status", "stage"}:
-            value = getattr(venture, "stage", None)
-            return str(value.value if hasattr(value, "value") else value or "ideation")
+            return _enum_text("stage", "ideation")
 
-        return 0.0
+        return _constant(0.0)
 
-    def _build_feature_row(self, venture: Any, bundle: _LoadedBundle) -> Dict[str, Any]:
+    def _feature_names(self, bundle: _LoadedBundle) -> List[str]:
         estimator = bundle.estimator
         if hasattr(estimator, "feature_names_in_"):
-            names = [str(name) for name in list(estimator.feature_names_in_)]
-        elif bundle.class_names and len(bundle.class_names) == 10:
-            names = [
+            return [str(name) for name in list(estimator.feature_names_in_)]
+        if bundle.class_names and len(bundle.class_names) == 10:
+            return [
                 "revenue",
                 "funding_raised",
                 "monthly_burn_rate",
@@ -294,21 +885,21 @@ class VentureScorer:
                 "industry",
                 "stage",
             ]
-        else:
-            names = [
-                "revenue",
-                "funding",
-                "employees",
-                "age",
-                "sector",
-                "status",
-                "monthly_burn_rate",
-                "customers",
-                "mrr",
-                "profile_completeness",
-            ]
+        return [
+            "revenue",
+            "funding",
+            "employees",
+            "age",
+            "sector",
+            "status",
+            "monthly_burn_rate",
+            "customers",
+            "mrr",
+            "profile_completeness",
+        ]
 
-        return {name: self._feature_value(name, venture) for name in names}
+    def _bind_extractors(self, plan: _FeaturePlan) -> None:
+        plan.extractors = [self._feature_extractor(name) for name in plan.names]
 
     def _heuristic_score(self, venture: Any) -> Dict[str, Any]:
         revenue = float(getattr(venture, "revenue", 0.0) or 0.0)
@@ -346,97 +937,251 @@ class VentureScorer:
             "model_source": "heuristic_fallback",
             "model_name": self._model_folder_name,
             "used_bundle_path": None,
+            "model_version": _HEURISTIC_MODEL_VERSION,
+            "feature_fingerprint": _feature_fingerprint([revenue, funding, team, customers, mrr, completeness]),
         }
 
-    def score_venture(self, venture: Any) -> Dict[str, Any]:
-        bundle = self._load()
-        if bundle is None:
-            return self._heuristic_score(venture)
+    def _model_inputs(self, bundle: _LoadedBundle, rows: List[List[Any]]) -> Tuple[str, Any]:
+        """A model-ready matrix from raw feature rows, or the rows themselves
+        if the plan could not be compiled."""
+        if bundle.plan.compiled:
+            return "matrix", bundle.plan.matrix(rows)
+        return "rows", rows
+
+    def _execute(self, bundle: _LoadedBundle, kind: str, data: Any, size: int) -> Tuple[Any, Any]:
+        if bundle.pool is not None:
+            return bundle.pool.predict(kind, data, size)
+        return self._run_model(bundle, kind, data)
+
+    def _run_model(self, bundle: _LoadedBundle, kind: str, data: Any) -> Tuple[Any, Any]:
+        """Run one predict/predict_proba pass over prepared inputs in this process."""
+        if kind == "matrix" and bundle.ensemble is not None:
+            probabilities = bundle.ensemble.predict_proba(data)
+            return np.argmax(probabilities, axis=1), probabilities
 
+        if kind == "matrix":
+            predictor = bundle.plan.predictor
+            predicted = predictor.predict(data)
+            probabilities = predictor.predict_proba(data) if hasattr(predictor, "predict_proba") else None
+            return predicted, probabilities
+
+        import pandas as pd
+
+        frame = pd.DataFrame(data, columns=bundle.plan.names)
+        estimator = bundle.estimator
         try:
-            row = self._build_feature_row(venture, bundle)
-            frame = pd.DataFrame([row])
+            predicted = estimator.predict(frame)
+            probabilities = estimator.predict_proba(frame) if hasattr(estimator, "predict_proba") else None
+        except AttributeError as exc:
+            # Compatibility path for older xgboost estimators under newer
+            # sklearn versions where Pipeline.predict can fail on tag checks.
+            if "__sklearn_tags__" not in str(exc) or not hasattr(estimator, "steps"):
+                raise
 
-            estimator = bundle.estimator
-            try:
-                predicted_raw = estimator.predict(frame)[0]
-                probabilities = estimator.predict_proba(frame)[0] if hasattr(estimator, "predict_proba") else None
-            except AttributeError as exc:
-                # Compatibility path for older xgboost estimators under newer
-                # sklearn versions where Pipeline.predict can fail on tag checks.
-                if "__sklearn_tags__" not in str(exc) or not hasattr(estimator, "steps"):
-                    raise
-
-                transformed = frame
-                steps = list(getattr(estimator, "steps", []))
-                for _, step in steps[:-1]:
-                    transformed = step.transform(transformed)
-
-                last_step = steps[-1][1] if steps else estimator
-                predicted_raw = last_step.predict(transformed)[0]
-                probabilities = (
-                    last_step.predict_proba(transformed)[0]
-                    if hasattr(last_step, "predict_proba")
-                    else None
-                )
+            transformed = frame
+            steps = list(getattr(estimator, "steps", []))
+            for _, step in steps[:-1]:
+                transformed = step.transform(transformed)
 
-            classes = bundle.class_names
-            if not classes and hasattr(estimator, "classes_"):
-                classes = [str(c) for c in list(estimator.classes_)]
-
-            predicted_class = str(predicted_raw)
-            if str(predicted_raw).isdigit() and classes:
-                idx = int(predicted_raw)
-                if 0 <= idx < len(classes):
-                    predicted_class = classes[idx]
-
-            class_probabilities: Dict[str, float] = {}
-            if probabilities is not None:
-                if classes and len(classes) == len(probabilities):
-                    class_probabilities = {
-                        str(classes[idx]): float(round(prob, 6))
-                        for idx, prob in enumerate(probabilities)
-                    }
-                else:
-                    class_probabilities = {
-                        f"class_{idx}": float(round(prob, 6))
-                        for idx, prob in enumerate(probabilities)
-                    }
-
-            score_weights = {
-                "not_ready": 25,
-                "mentorship_needed": 60,
-                "investment_ready": 90,
-            }
+            last_step = steps[-1][1] if steps else estimator
+            predicted = last_step.predict(transformed)
+            probabilities = (
+                last_step.predict_proba(transformed)
+                if hasattr(last_step, "predict_proba")
+                else None
+            )
+        return predicted, probabilities
 
-            if class_probabilities:
-                weighted_score = 0.0
-                total_prob = 0.0
-                for label, prob in class_probabilities.items():
-                    weight = score_weights.get(label.lower(), 50)
-                    weighted_score += float(prob) * float(weight)
-                    total_prob += float(prob)
-                if total_prob > 0:
-                    weighted_score /= total_prob
-                uruti_score = float(round(_clamp(weighted_score, 0, 100), 2))
-                confidence = float(round(max(class_probabilities.values()), 6))
+    def _model_fallback(self, venture: Any, exc: Exception) -> Dict[str, Any]:
+        fallback = self._heuristic_score(venture)
+        fallback["model_error"] = str(exc)
+        return fallback
+
+    def _model_result(self, bundle: _LoadedBundle, predicted_raw: Any, probabilities: Any) -> Dict[str, Any]:
+        estimator = bundle.estimator
+        classes = bundle.class_names
+        if not classes and hasattr(estimator, "classes_"):
+            classes = [str(c) for c in list(estimator.classes_)]
+
+        predicted_class = str(predicted_raw)
+        if str(predicted_raw).isdigit() and classes:
+            idx = int(predicted_raw)
+            if 0 <= idx < len(classes):
+                predicted_class = classes[idx]
+
+        class_probabilities: Dict[str, float] = {}
+        if probabilities is not None:
+            if classes and len(classes) == len(probabilities):
+                class_probabilities = {
+                    str(classes[idx]): float(round(prob, 6))
+                    for idx, prob in enumerate(probabilities)
+                }
             else:
-                uruti_score = float(score_weights.get(predicted_class.lower(), 50))
-                confidence = 0.5
+                class_probabilities = {
+                    f"class_{idx}": float(round(prob, 6))
+                    for idx, prob in enumerate(probabilities)
+                }
+
+        score_weights = {
+            "not_ready": 25,
+            "mentorship_needed": 60,
+            "investment_ready": 90,
+        }
+
+        if class_probabilities:
+            weighted_score = 0.0
+            total_prob = 0.0
+            for label, prob in class_probabilities.items():
+                weight = score_weights.get(label.lower(), 50)
+                weighted_score += float(prob) * float(weight)
+                total_prob += float(prob)
+            if total_prob > 0:
+                weighted_score /= total_prob
+            uruti_score = float(round(_clamp(weighted_score, 0, 100), 2))
+            confidence = float(round(max(class_probabilities.values()), 6))
+        else:
+            uruti_score = float(score_weights.get(predicted_class.lower(), 50))
+            confidence = 0.5
+
+        return {
+            "uruti_score": uruti_score,
+            "predicted_class": predicted_class,
+            "confidence": confidence,
+            "class_probabilities": class_probabilities,
+            "model_source": "root_models_bundle",
+            "model_name": bundle.model_name,
+            "used_bundle_path": bundle.bundle_path,
+        }
 
+    def _reusable_score(self, venture: Any, model_version: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """A previous model result for these exact inputs, if any: first the
+        venture's stored breakdown, then the in-memory cache."""
+        stored = getattr(venture, "score_breakdown", None)
+        if (
+            isinstance(stored, dict)
+            and stored.get("feature_fingerprint") == fingerprint
+            and stored.get("model_version") == model_version
+            and "model_error" not in stored
+        ):
+            with self._score_cache_lock:
+                self._score_cache_stats["stored_hits"] += 1
+            return copy.deepcopy(stored)
+
+        key = (model_version, fingerprint)
+        with self._score_cache_lock:
+            cached = self._score_cache.get(key)
+            if cached is None:
+                self._score_cache_stats["misses"] += 1
+                return None
+            self._score_cache.move_to_end(key)
+            self._score_cache_stats["memo_hits"] += 1
+        return copy.deepcopy(cached)
+
+    def _remember_score(self, bundle: _LoadedBundle, fingerprint: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        result["model_version"] = bundle.model_version
+        result["feature_fingerprint"] = fingerprint
+        limit = max(0, int(settings.VENTURE_SCORER_CACHE_SIZE))
+        if limit and "model_error" not in result:
+            with self._score_cache_lock:
+                self._score_cache[(bundle.model_version, fingerprint)] = copy.deepcopy(result)
+                self._score_cache.move_to_end((bundle.model_version, fingerprint))
+                while len(self._score_cache) > limit:
+                    self._score_cache.popitem(last=False)
+        return result
+
+    def score_cache_info(self) -> Dict[str, Any]:
+        with self._score_cache_lock:
             return {
-                "uruti_score": uruti_score,
-                "predicted_class": predicted_class,
-                "confidence": confidence,
-                "class_probabilities": class_probabilities,
-                "model_source": "root_models_bundle",
-                "model_name": bundle.model_name,
-                "used_bundle_path": bundle.bundle_path,
+                "entries": len(self._score_cache),
+                "max_entries": int(settings.VENTURE_SCORER_CACHE_SIZE),
+                **self._score_cache_stats,
             }
+
+    def score_venture(self, venture: Any) -> Dict[str, Any]:
+        return self.score_many([venture])[0]
+
+    async def score_venture_async(self, venture: Any) -> Dict[str, Any]:
+        """`score_venture` for async handlers.
+
+        Features are read from the venture on the calling thread; only the
+        model call is awaited in a worker thread, so concurrent requests can
+        be batched together by the scoring workers.
+        """
+        bundle = self._loaded or await asyncio.to_thread(self._load)
+        if bundle is None:
+            return self._heuristic_score(venture)
+
+        try:
+            rows = bundle.plan.rows([venture])
+            fingerprint = _feature_fingerprint(rows[0])
+            reused = self._reusable_score(venture, bundle.model_version, fingerprint)
+            if reused is not None:
+                return reused
+            kind, data = self._model_inputs(bundle, rows)
+            predicted, probabilities = await asyncio.to_thread(self._execute, bundle, kind, data, 1)
+            result = self._model_result(
+                bundle,
+                predicted[0],
+                probabilities[0] if probabilities is not None else None,
+            )
+            return self._remember_score(bundle, fingerprint, result)
         except Exception as exc:
-            fallback = self._heuristic_score(venture)
-            fallback["model_error"] = str(exc)
-            return fallback
+            return self._model_fallback(venture, exc)
+
+    def score_many(self, ventures: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Score ventures with a single feature matrix and one model pass.
+
+        Results are in input order. Ventures whose model inputs and model
+        version match a previous result (stored on the venture or memoized)
+        skip inference. If the batched pass fails, each venture is retried on
+        its own so one bad row only downgrades itself to the heuristic
+        fallback. A scoring worker failure downgrades the whole batch without
+        retrying.
+        """
+        ventures = list(ventures)
+        if not ventures:
+            return []
+
+        bundle = self._load()
+        if bundle is None:
+            return [self._heuristic_score(venture) for venture in ventures]
+
+        try:
+            rows = bundle.plan.rows(ventures)
+        except Exception as exc:
+            if len(ventures) > 1:
+                return [self.score_many([venture])[0] for venture in ventures]
+            return [self._model_fallback(ventures[0], exc)]
+
+        fingerprints = [_feature_fingerprint(row) for row in rows]
+        results: List[Optional[Dict[str, Any]]] = [
+            self._reusable_score(venture, bundle.model_version, fingerprint)
+            for venture, fingerprint in zip(ventures, fingerprints)
+        ]
+        pending = [idx for idx, result in enumerate(results) if result is None]
+        if not pending:
+            return results  # type: ignore[return-value]
+
+        try:
+            kind, data = self._model_inputs(bundle, [rows[idx] for idx in pending])
+            predicted, probabilities = self._execute(bundle, kind, data, len(pending))
+            for pos, idx in enumerate(pending):
+                result = self._model_result(
+                    bundle,
+                    predicted[pos],
+                    probabilities[pos] if probabilities is not None else None,
+                )
+                results[idx] = self._remember_score(bundle, fingerprints[idx], result)
+        except ScoringWorkerError as exc:
+            for idx in pending:
+                results[idx] = self._model_fallback(ventures[idx], exc)
+        except Exception as exc:
+            if len(pending) > 1:
+                for idx in pending:
+                    results[idx] = self.score_many([ventures[idx]])[0]
+            else:
+                results[pending[0]] = self._model_fallback(ventures[pending[0]], exc)
+        return results  # type: ignore[return-value]
 
 
 venture_scorer = VentureScorer()
@@ -29,6 +29,7 @@ interface User {
   role: string;
   avatar?: string;  // For backward compatibility
   avatar_url?: string;  // Backend field
+  avatar_thumbnail_url?: string;  // Resized variant for lists
   bio?: string;
   company?: string;
   location?: string;
@@ -373,8 +374,10 @@ export function BuildConnectionsModule({ onModuleChange, userType = 'founder' }:
       ...request,
       name: resolvedName,
       avatar:
+        counterpart?.avatar_thumbnail_url ||
         counterpart?.avatar_url ||
         request.avatar ||
+        matchedUser?.avatar_thumbnail_url ||
         matchedUser?.avatar_url ||
         matchedUser?.avatar,
       counterpartUserId: Number(counterpart?.id || otherUserId),
@@ -589,7 +592,7 @@ export function BuildConnectionsModule({ onModuleChange, userType = 'founder' }:
                         {/* Avatar overlapping banner */}
                         <div className="flex justify-center -mt-12 mb-3 relative z-10">
                           <Avatar className="h-24 w-24 border-4 border-white dark:border-slate-900 shadow-lg">
-                            <AvatarImage src={person.avatar_url || person.avatar} alt={person.full_name} />
+                            <AvatarImage src={person.avatar_thumbnail_url || person.avatar_url || person.avatar} alt={person.full_name} />
                             <AvatarFallback className="bg-[#76B947] text-white text-lg font-semibold">
                               {person.full_name.split(' ').map(n => n[0]).join('')}
                             </AvatarFallback>
@@ -733,7 +736,7 @@ export function BuildConnectionsModule({ onModuleChange, userType = 'founder' }:
                   <div className="flex items-start justify-between">
                     <div className="flex items-start space-x-4 flex-1">
                       <Avatar className="h-14 w-14">
-                        <AvatarImage src={conn.avatar_url || conn.avatar} />
+                        <AvatarImage src={conn.avatar_thumbnail_url || conn.avatar_url || conn.avatar} />
                         <AvatarFallback className="bg-[#76B947]/20 text-[#76B947]">
                           {conn.full_name.split(' ').map(n => n[0]).join('')}
                         </AvatarFallback>
@@ -312,7 +312,7 @@ export function DealFlowModule() {
               <div className="relative h-48 bg-gray-200 dark:bg-gray-800 overflow-hidden">
                 {venture.logo_url || venture.banner_url ? (
                   <img 
-                    src={venture.banner_url || venture.logo_url} 
+                    src={venture.banner_thumbnail_url || venture.banner_url || venture.logo_thumbnail_url || venture.logo_url} 
                     alt={venture.name}
                     className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-300"
                   />
@@ -378,7 +378,7 @@ export function MessagesModule({ userType = 'founder' }: MessagesModuleProps) {
           id: String(otherUser.id),
           userId: Number(otherUser.id),
           name: otherUser.display_name || otherUser.full_name || 'Connection',
-          avatar: resolveMediaUrl(otherUser.avatar_url || otherUser.avatar),
+          avatar: resolveMediaUrl(otherUser.avatar_thumbnail_url || otherUser.avatar_url || otherUser.avatar),
           role: otherUser.role || 'Connection',
           lastMessage: conversation.last_message || 'Start a conversation...',
           timestamp: conversation.last_message_time || new Date().toISOString(),
@@ -93,6 +93,8 @@ export function PitchCoachModule() {
   const recordingTimeRef = useRef(0);
   const slideTransitionsRef = useRef<SlideTransition[]>([]);
   const lastTipRef = useRef('');
+  const liveSocketRef = useRef<WebSocket | null>(null);
+  const [liveSocketReady, setLiveSocketReady] = useState(false);
 
   // Real-time AI feedback metrics
   const [pitchMetrics, setPitchMetrics] = useState({
@@ -674,9 +676,99 @@ export function PitchCoachModule() {
     ].slice(0, 5));
   }, []);
 
-  // Fetch live coaching feedback from backend while recording.
+  // Live coaching socket: the server keeps the session state, so only
+  // changes are sent and metrics/tips arrive when they change.
   useEffect(() => {
-    if (!isRecording || isPaused || !selectedVenture?.id) {
+    const token = sessionStorage.getItem('uruti_token');
+    if (!isRecording || !selectedVenture?.id || !token) {
+      return;
+    }
+
+    const socket = apiClient.createPitchLiveWebSocket(token, Number(selectedVenture.id));
+    liveSocketRef.current = socket;
+
+    socket.onopen = () => setLiveSocketReady(true);
+    socket.onclose = () => {
+      if (liveSocketRef.current === socket) {
+        liveSocketRef.current = null;
+      }
+      setLiveSocketReady(false);
+    };
+    socket.onerror = () => { /* falls back to polling once the socket closes */ };
+
+    socket.onmessage = (event: MessageEvent) => {
+      let msg: any;
+      try {
+        msg = JSON.parse(event.data as string);
+      } catch {
+        return;
+      }
+
+      if (msg?.event === 'metrics' && msg.metrics) {
+        setPitchMetrics({
+          pacing: Number(msg.metrics.pacing || 0),
+          clarity: Number(msg.metrics.clarity || 0),
+          confidence: Number(msg.metrics.confidence || 0),
+          engagement: Number(msg.metrics.engagement || 0),
+          structure: Number(msg.metrics.structure || 0),
+        });
+      }
+
+      if (msg?.event === 'tips') {
+        setLiveModelStatus({
+          backend: String(msg.model_backend || 'unknown'),
+          loaded: Boolean(msg.model_loaded),
+          error: msg.model_error || null,
+        });
+        const tips = Array.isArray(msg.tips) ? msg.tips.filter(Boolean) : [];
+        if (tips.length > 0) {
+          setLiveModelTips(tips);
+          pushLiveTip(tips[0]);
+        }
+      }
+    };
+
+    return () => {
+      socket.close();
+      if (liveSocketRef.current === socket) {
+        liveSocketRef.current = null;
+      }
+      setLiveSocketReady(false);
+    };
+  }, [isRecording, selectedVenture?.id, pushLiveTip]);
+
+  useEffect(() => {
+    const socket = liveSocketRef.current;
+    if (!liveSocketReady || !socket || socket.readyState !== WebSocket.OPEN) {
+      return;
+    }
+
+    socket.send(JSON.stringify({
+      type: 'update',
+      pitch_type: pitchType,
+      duration_seconds: recordingTimeRef.current,
+      target_duration_seconds: targetDuration * 60,
+      current_slide: currentSlide,
+      total_slides: Math.max(totalSlides, 1),
+    }));
+
+    if (isPaused) {
+      return;
+    }
+
+    const interval = window.setInterval(() => {
+      if (socket.readyState === WebSocket.OPEN) {
+        socket.send(JSON.stringify({ type: 'update', duration_seconds: recordingTimeRef.current }));
+      }
+    }, 1000);
+
+    return () => window.clearInterval(interval);
+  }, [liveSocketReady, isPaused, pitchType, targetDuration, currentSlide, totalSlides]);
+
+  // Fetch live coaching feedback from backend while recording when the live
+  // socket is unavailable.
+  useEffect(() => {
+    if (!isRecording || isPaused || !selectedVenture?.id || liveSocketReady) {
       return;
     }
 
@@ -751,6 +843,7 @@ export function PitchCoachModule() {
     currentSlide,
     totalSlides,
     pushLiveTip,
+    liveSocketReady,
   ]);
 
   const handleSaveRecording = async (notes: string, ventureId: string | number) => {
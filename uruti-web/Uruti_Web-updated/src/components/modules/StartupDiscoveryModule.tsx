@@ -482,7 +482,7 @@ export function StartupDiscoveryModule() {
                         <TableCell>
                           <div className="flex items-center space-x-3">
                             <Avatar className="h-10 w-10">
-                              <AvatarImage src={venture.logo_url} alt={venture.name} />
+                              <AvatarImage src={venture.logo_thumbnail_url || venture.logo_url} alt={venture.name} />
                               <AvatarFallback className="bg-[#76B947]/20 text-[#76B947]" style={{ fontFamily: 'var(--font-heading)' }}>
                                 {(venture.name || '??').substring(0, 2).toUpperCase()}
                               </AvatarFallback>
@@ -578,7 +578,7 @@ export function StartupDiscoveryModule() {
                   {venture.logo_url ? (
                     <div className="w-full h-full p-4 flex items-center justify-center bg-white/70 dark:bg-slate-900/70">
                       <img 
-                        src={venture.logo_url} 
+                        src={venture.logo_thumbnail_url || venture.logo_url} 
                         alt={venture.name}
                         className="max-w-full max-h-full object-contain"
                       />
@@ -69,6 +69,9 @@ class ApiClient {
       ...payload,
       avatar_url: this.toAbsoluteMediaUrl(payload.avatar_url) || payload.avatar_url,
       cover_image_url: this.toAbsoluteMediaUrl(payload.cover_image_url) || payload.cover_image_url,
+      avatar_thumbnail_url: this.toAbsoluteMediaUrl(payload.avatar_thumbnail_url) || payload.avatar_thumbnail_url,
+      cover_image_thumbnail_url:
+        this.toAbsoluteMediaUrl(payload.cover_image_thumbnail_url) || payload.cover_image_thumbnail_url,
     };
   }
 
@@ -81,6 +84,8 @@ class ApiClient {
       ...payload,
       logo_url: this.toAbsoluteMediaUrl(payload.logo_url) || payload.logo_url,
       banner_url: this.toAbsoluteMediaUrl(payload.banner_url) || payload.banner_url,
+      logo_thumbnail_url: this.toAbsoluteMediaUrl(payload.logo_thumbnail_url) || payload.logo_thumbnail_url,
+      banner_thumbnail_url: this.toAbsoluteMediaUrl(payload.banner_thumbnail_url) || payload.banner_thumbnail_url,
       pitch_deck_url: this.toAbsoluteMediaUrl(payload.pitch_deck_url) || payload.pitch_deck_url,
       demo_video_url: this.toAbsoluteMediaUrl(payload.demo_video_url) || payload.demo_video_url,
     };
@@ -593,19 +598,82 @@ class ApiClient {
   }
 
   async uploadMessageAttachment(file: File) {
-    const formData = new FormData();
-    formData.append('file', file);
+    return this.uploadResumable<{ file_name: string; url: string; content_type: string; size: number }>(
+      'message_attachment',
+      file,
+    );
+  }
 
-    const token = this.getAuthToken();
-    const response = await fetch(`${this.baseUrl}/api/v1/messages/attachments/upload`, {
+  // Resumable upload: POST /uploads, PUT each chunk at its offset, then
+  // POST /uploads/{id}/complete. After a dropped connection the client asks
+  // the server how much it already has and continues from there.
+  private async uploadResumable<T>(
+    purpose: 'pitch_video' | 'message_attachment',
+    file: File,
+    metadata: Record<string, unknown> = {},
+  ): Promise<T> {
+    const authHeaders = { 'Authorization': `Bearer ${this.getAuthToken()}` };
+    const init = await this.handleResponse<{ upload_id: string; chunk_size: number; offset: number }>(
+      await fetch(`${this.baseUrl}/api/v1/uploads`, {
+        method: 'POST',
+        headers: { ...authHeaders, 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          purpose,
+          file_name: file.name || 'upload',
+          content_type: file.type || null,
+          size: file.size,
+          metadata,
+        }),
+      }),
+    );
+
+    const uploadUrl = `${this.baseUrl}/api/v1/uploads/${init.upload_id}`;
+    let offset = init.offset;
+    let failures = 0;
+    while (offset < file.size) {
+      let response: Response | null = null;
+      try {
+        response = await fetch(`${uploadUrl}?offset=${offset}`, {
+          method: 'PUT',
+          headers: { ...authHeaders, 'Content-Type': 'application/octet-stream' },
+          body: file.slice(offset, offset + init.chunk_size),
+        });
+      } catch {
+        response = null;
+      }
+
+      if (response && (response.ok || response.status === 409)) {
+        const body = await response.json().catch(() => ({}));
+        if (typeof body.offset === 'number') {
+          offset = body.offset;
+          failures = 0;
+          continue;
+        }
+      }
+      if (response && response.status < 500 && response.status !== 409) {
+        await this.handleResponse<unknown>(response);
+      }
+
+      // Network drop or server error: back off, then resume from the server's offset.
+      failures += 1;
+      if (failures > 6) {
+        throw new Error('Upload interrupted. Please check your connection and try again.');
+      }
+      await new Promise((resolve) => setTimeout(resolve, Math.min(1000 * 2 ** (failures - 1), 15000)));
+      const status = await fetch(uploadUrl, { headers: authHeaders })
+        .then((res) => (res.ok ? res.json() : null))
+        .catch(() => null);
+      if (status && typeof status.offset === 'number') {
+        offset = status.offset;
+      }
+    }
+
+    const response = await fetch(`${uploadUrl}/complete`, {
       method: 'POST',
-      headers: {
-        'Authorization': `Bearer ${token}`,
-      },
-      body: formData,
+      headers: { ...authHeaders, 'Content-Type': 'application/json' },
+      body: JSON.stringify({}),
     });
-
-    return this.handleResponse<{ file_name: string; url: string; content_type: string; size: number }>(response);
+    return this.handleResponse<T>(response);
   }
 
   async markAsRead(messageId: number) {
@@ -1015,25 +1083,13 @@ class ApiClient {
       notes?: string;
     },
   ) {
-    const formData = new FormData();
-    formData.append('file', file);
-    formData.append('pitch_type', metadata.pitch_type);
-    formData.append('duration', metadata.duration.toString());
-    formData.append('target_duration', metadata.target_duration.toString());
-    if (metadata.notes && metadata.notes.trim().length > 0) {
-      formData.append('notes', metadata.notes.trim());
-    }
-
-    const token = this.getAuthToken();
-    const response = await fetch(`${this.baseUrl}/api/v1/ventures/${ventureId}/pitch-video`, {
-      method: 'POST',
-      headers: {
-        'Authorization': `Bearer ${token}`,
-      },
-      body: formData,
+    return this.uploadResumable<any>('pitch_video', file, {
+      venture_id: ventureId,
+      pitch_type: metadata.pitch_type,
+      duration: metadata.duration,
+      target_duration: metadata.target_duration,
+      notes: metadata.notes?.trim() || '',
     });
-
-    return this.handleResponse<any>(response);
   }
 
   async uploadVentureLogo(ventureId: number, file: File) {
@@ -1283,6 +1339,26 @@ class ApiClient {
     return new WebSocket(`${wsBaseUrl}/api/v1/notifications/ws?token=${token}`);
   }
 
+  createPitchLiveWebSocket(token: string, ventureId: number): WebSocket {
+    const path = `/api/v1/pitch/live/ws?token=${token}&venture_id=${ventureId}`;
+    const explicitWsBase = String((import.meta as any).env?.VITE_WS_URL || '').trim().replace(/\/$/, '');
+    if (explicitWsBase) {
+      const wsBaseUrl = explicitWsBase
+        .replace(/^http:\/\//, 'ws://')
+        .replace(/^https:\/\//, 'wss://');
+      return new WebSocket(`${wsBaseUrl}${path}`);
+    }
+
+    if (!this.baseUrl || this.baseUrl.trim() === '') {
+      return this.createDisabledSocket();
+    }
+
+    const wsBaseUrl = this.baseUrl
+      .replace(/^http:\/\//, 'ws://')
+      .replace(/^https:\/\//, 'wss://');
+    return new WebSocket(`${wsBaseUrl}${path}`);
+  }
+
   // AI Chat endpoints
   async getChatConversations() {
     return this.request<any[]>('/api/v1/ai-chat/conversations', {